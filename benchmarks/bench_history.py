@@ -0,0 +1,158 @@
+"""Benchmark: scan-history inserts/sec on a large synthetic history.
+
+Fills a scratch scan_history.db with --rows synthetic results, then times
+--inserts more through each write path: the old connect-per-result
+save, save_result on the long-lived connection, HistoryWriter batches,
+and batched writers spread over threads and over processes. Then times
+trend lookups against the same history: get_trend per ticker and one
+get_trends call for a whole watchlist.
+
+    python benchmarks/bench_history.py [--rows 200000] [--inserts 5000] [--workers 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sec_scanner import history  # noqa: E402
+
+VERDICTS = ["Genuine AI Adopter", "Mixed Signals", "AI Washing", "Strong AI Washing"]
+
+
+def synthetic_result(n: int, tickers: int) -> dict:
+    rng = random.Random(n)
+    score = rng.randint(0, 100)
+    return {
+        "ticker": f"T{n % tickers:05d}",
+        "company": f"Company {n % tickers}",
+        "score": score,
+        "verdict": VERDICTS[min(3, (100 - score) // 25)],
+        "disclosure_style": rng.choice(["standard", "conservative"]),
+        "date": f"20{10 + n % 15}-0{1 + n % 9}-15",
+        "scores": {d: rng.randint(0, 20) for d in ("SPECIFICITY", "FINANCIAL_IMPACT", "INTEGRATION_DEPTH",
+                                                   "COMPETITIVE_MOAT", "EXECUTION_EVIDENCE")},
+        "takeaway": "Synthetic result for benchmarking history writes. " * 3,
+    }
+
+
+def old_save_result(result: dict):
+    """save_result as it was: schema check and a fresh connection for every row."""
+    with sqlite3.connect(history.DB_PATH) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS scan_history (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "ticker TEXT NOT NULL, score INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_ticker_scanned ON scan_history(ticker, scanned_at, id)")
+    with sqlite3.connect(history.DB_PATH) as conn:
+        conn.execute(history._INSERT_SQL, history._row(result))
+        conn.commit()
+
+
+def _writer_process(args):
+    db_path, start, count, tickers = args
+    history.DB_PATH = Path(db_path)
+    with history.HistoryWriter() as writer:
+        for n in range(start, start + count):
+            writer.add(synthetic_result(n, tickers))
+
+
+def timed(label: str, inserts: int, fn) -> dict:
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    rate = inserts / seconds
+    print(f"  {label:<34} {inserts:>7} rows  {seconds:>7.2f}s  {rate:>10,.0f} inserts/sec")
+    return {"path": label, "inserts": inserts, "seconds": seconds, "inserts_per_sec": rate}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic history to start from")
+    parser.add_argument("--inserts", type=int, default=5000, help="Rows timed per write path")
+    parser.add_argument("--tickers", type=int, default=5000, help="Distinct tickers in the history")
+    parser.add_argument("--workers", type=int, default=4, help="Threads / processes for the concurrent runs")
+    parser.add_argument("--json", metavar="PATH", help="Append results as JSON lines")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="sec-scanner-history-") as workdir:
+        history.DB_PATH = Path(workdir) / "scan_history.db"
+        start = time.perf_counter()
+        with history.HistoryWriter(batch_size=10_000) as writer:
+            for n in range(args.rows):
+                writer.add(synthetic_result(n, args.tickers))
+        print(f"Seeded {args.rows:,} rows in {time.perf_counter() - start:.1f}s\n")
+
+        n = args.rows
+        per_worker = args.inserts // args.workers
+
+        def batch(size):
+            nonlocal n
+            base, n = n, n + size
+            return [synthetic_result(i, args.tickers) for i in range(base, base + size)]
+
+        rows = []
+        old = batch(args.inserts // 5)  # the slow path gets a smaller sample
+        rows.append(timed("connect per result (old)", len(old), lambda: [old_save_result(r) for r in old]))
+        one = batch(args.inserts)
+        rows.append(timed("save_result, long-lived connection", len(one), lambda: [history.save_result(r) for r in one]))
+        batched = batch(args.inserts)
+
+        def write_batched():
+            with history.HistoryWriter() as writer:
+                for r in batched:
+                    writer.add(r)
+        rows.append(timed("HistoryWriter", len(batched), write_batched))
+
+        shared = history.HistoryWriter()
+        chunks = [batch(per_worker) for _ in range(args.workers)]
+
+        def write_threads():
+            threads = [threading.Thread(target=lambda c=c: [shared.add(r) for r in c]) for c in chunks]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            shared.flush()
+        rows.append(timed(f"HistoryWriter, {args.workers} threads", per_worker * args.workers, write_threads))
+
+        jobs = [(str(history.DB_PATH), n + i * per_worker, per_worker, args.tickers) for i in range(args.workers)]
+        n += per_worker * args.workers
+
+        def write_processes():
+            with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+                pool.map(_writer_process, jobs)
+        rows.append(timed(f"HistoryWriter, {args.workers} processes", per_worker * args.workers,
+                          write_processes))
+
+        total = history.get_connection().execute("SELECT COUNT(*) FROM scan_history").fetchone()[0]
+        print(f"\n  {total:,} rows in history (expected {n:,})\n")
+
+        watchlist = [f"T{i:05d}" for i in range(min(1000, args.tickers))]
+        start = time.perf_counter()
+        for ticker in watchlist:
+            history.get_trend(ticker)
+        per_ticker = (time.perf_counter() - start) / len(watchlist)
+        start = time.perf_counter()
+        history.get_trends(watchlist)
+        bulk = time.perf_counter() - start
+        print(f"  get_trend                          {per_ticker * 1e6:>8.0f} µs per ticker")
+        print(f"  get_trends ({len(watchlist)} tickers)           {bulk * 1000:>8.1f} ms")
+        rows.append({"path": "trends", "get_trend_us": per_ticker * 1e6, "get_trends_ms": bulk * 1000,
+                     "watchlist": len(watchlist)})
+
+    if args.json:
+        with open(args.json, "a") as f:
+            for row in rows:
+                f.write(json.dumps({"at": time.strftime("%Y-%m-%dT%H:%M:%S"), "rows": args.rows, **row}) + "\n")
+        print(f"\nAppended {len(rows)} results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
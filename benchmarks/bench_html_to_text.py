@@ -0,0 +1,110 @@
+"""Benchmark: streaming HTML cleaner vs. the original BeautifulSoup cleaner.
+
+The cache only holds cleaned text, so this rebuilds an inline-XBRL-style
+10-K from the cached NVDA filing (div/span markup, ix:nonFraction facts, an
+ix:header block, script/style) and scales it up to a realistic size.
+
+    python benchmarks/bench_html_to_text.py [--mb 20]
+"""
+
+import argparse
+import html
+import re
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sec_scanner.htmltext import html_to_text  # noqa: E402
+
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+
+
+def soup_clean(raw: str, max_chars: int | None) -> str:
+    """The cleaner download_and_clean used before the streaming extractor."""
+    soup = BeautifulSoup(raw, "html.parser")
+    for tag in soup.find_all(["script", "style", "ix:nonfraction", "ix:nonnumeric",
+                              "ix:header", "ix:hidden", "ix:references"]):
+        tag.decompose()
+    text = soup.get_text(separator="\n")
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            lines.append(line)
+    text = "\n".join(lines)
+    text = re.sub(r"[_=\-]{10,}", "", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+    return text
+
+
+def build_document(text: str, target_bytes: int) -> str:
+    header = (
+        '<?xml version="1.0" encoding="utf-8"?>\n<html xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">'
+        "<head><title>nvda-10k</title><style>.x{color:red}</style>"
+        "<script>var facts = {};</script></head><body>"
+        '<div style="display:none"><ix:header><ix:hidden>'
+        + "".join(f'<ix:nonNumeric name="dei:Fact{i}">hidden fact {i}</ix:nonNumeric>' for i in range(200))
+        + "</ix:hidden><ix:references>ref</ix:references></ix:header></div>"
+    )
+    body = []
+    for i, line in enumerate(text.splitlines()):
+        cell = html.escape(line)
+        if i % 7 == 0:
+            cell += f' <ix:nonFraction name="us-gaap:Revenue" contextRef="c{i}" decimals="-6">{i * 1000:,}</ix:nonFraction>'
+        if i % 50 == 0:
+            body.append('<div><span>' + "_" * 40 + "</span></div>")
+        body.append(f'<div style="margin-top:6pt"><span style="font-family:Arial;font-size:10pt">{cell}</span></div>\n')
+    page = "".join(body)
+    pages = [header]
+    size = len(header)
+    n = 0
+    while size < target_bytes:
+        chunk = f'<!-- page {n} --><div class="page">{page}</div><hr/>'
+        pages.append(chunk)
+        size += len(chunk)
+        n += 1
+    pages.append("</body></html>")
+    return "".join(pages)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=20, help="Synthetic document size in MB (default: 20)")
+    args = parser.parse_args()
+
+    sources = sorted(CACHE_DIR.glob("NVDA_*.txt"))
+    if not sources:
+        sys.exit("No cached NVDA filing in .cache — run `sec-scanner NVDA` first")
+    doc = build_document(sources[0].read_text(encoding="utf-8"), int(args.mb * 1024 * 1024))
+    print(f"Document: {len(doc) / 1e6:.1f} MB synthetic inline-XBRL built from {sources[0].name}\n")
+
+    print(f"{'cleaner':<28}{'max_chars':>12}{'seconds':>10}{'peak MB':>10}  identical")
+    for max_chars in (None, 2_000_000, 80_000):
+        ref, t_ref, m_ref = measure(soup_clean, doc, max_chars)
+        new, t_new, m_new = measure(html_to_text, doc, max_chars)
+        label = str(max_chars) if max_chars else "none"
+        print(f"{'BeautifulSoup':<28}{label:>12}{t_ref:>10.2f}{m_ref / 1e6:>10.1f}")
+        print(f"{'TextExtractor (streaming)':<28}{label:>12}{t_new:>10.2f}{m_new / 1e6:>10.1f}  {new == ref}")
+
+
+if __name__ == "__main__":
+    main()
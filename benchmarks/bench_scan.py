@@ -0,0 +1,205 @@
+"""Benchmark: end-to-end scans against the fake EDGAR server and the stub Claude.
+
+Each watchlist size runs the real fetch → prescreen/analyze → history →
+report path in a fresh process with an empty cache, and reports
+throughput, p50/p95 latency per stage and peak RSS. --warm repeats every
+run against the now-populated cache. Nothing touches the network or the
+real .cache / scan_history.db.
+
+    python benchmarks/bench_scan.py [--sizes 10,100,1000] [--stub-latency 0.05] [--warm]
+    python benchmarks/bench_scan.py --json bench.jsonl   # append results to compare over time
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+STUB = Path(__file__).parent / "stub_claude.py"
+STAGES = ("fetch", "analyze", "save")
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+# ── Child: one scan ───────────────────────────────────────────────────────────
+
+def run_scan(config: dict) -> dict:
+    """Scan config["tickers"] the way the CLI does, timing every stage."""
+    import resource
+    from functools import partial
+
+    from sec_scanner import executor, fetcher, history, session
+    from sec_scanner.analyzer import analyze_filing
+    from sec_scanner.pipeline import run_pipeline
+    from sec_scanner.prescreen import DEFAULT_MIN_HITS, screened
+    from sec_scanner.ratelimit import TokenBucket
+    from sec_scanner.reporter import generate_report
+
+    workdir = Path(config["workdir"])
+    history.DB_PATH = workdir / "scan_history.db"
+    rate = config["edgar_rate"] or 1e9  # 0: the fake EDGAR needs no politeness
+    fetcher._limiter = TokenBucket(rate=rate, burst=max(2, int(min(rate, 1e6))), state_path=None)
+    session.configure(pool_size=config["fetch_workers"])
+    executor.configure(max_concurrency=config["analyze_workers"])
+
+    timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+
+    def timed(stage, fn):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timings[stage].append(time.perf_counter() - start)
+        return wrapper
+
+    results = []
+    save = timed("save", history.save_result)
+
+    def on_result(ticker, filing, result):
+        if result:
+            results.append(result)
+            save(result)
+
+    start = time.perf_counter()
+    run_pipeline(
+        config["tickers"],
+        timed("fetch", fetcher.fetch_filing),
+        timed("analyze", screened(partial(analyze_filing), DEFAULT_MIN_HITS)),
+        fetch_workers=config["fetch_workers"],
+        analyze_workers=config["analyze_workers"],
+        on_result=on_result,
+    )
+    report_start = time.perf_counter()
+    if results:
+        generate_report(results, str(workdir / "report.html"))
+    end = time.perf_counter()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024  # bytes vs KiB
+    return {
+        "tickers": len(config["tickers"]),
+        "analyzed": len(results),
+        "seconds": end - start,
+        "report_seconds": end - report_start,
+        "tickers_per_sec": len(config["tickers"]) / (end - start),
+        "stages": {stage: {"p50": percentile(v, 50), "p95": percentile(v, 95), "n": len(v)}
+                   for stage, v in timings.items()},
+        "peak_rss_mb": peak_mb,
+        "http": session.stats(),
+    }
+
+
+# ── Parent: fixture server + one process per run ──────────────────────────────
+
+def run_child(config: dict, env: dict, verbose: bool) -> dict:
+    out = Path(config["workdir"]) / "result.json"
+    subprocess.run(
+        [sys.executable, __file__, "--child", json.dumps({**config, "out": str(out)})],
+        env=env, check=True,
+        stdout=None if verbose else subprocess.DEVNULL,
+    )
+    return json.loads(out.read_text())
+
+
+def print_table(rows: list[dict]):
+    header = f"{'tickers':>7}  {'run':<4}  {'tick/s':>7}"
+    for stage in STAGES:
+        header += f"  {stage + ' p50/p95 ms':>19}"
+    header += f"  {'report s':>8}  {'peak RSS':>9}  {'requests':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        line = f"{r['tickers']:>7}  {r['run']:<4}  {r['tickers_per_sec']:>7.1f}"
+        for stage in STAGES:
+            s = r["stages"][stage]
+            line += f"  {s['p50'] * 1000:>9.1f}/{s['p95'] * 1000:<9.1f}"
+        line += f"  {r['report_seconds']:>8.2f}  {r['peak_rss_mb']:>6.0f} MB  {r['http']['requests']:>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--sizes", default="10,100,1000", help="Watchlist sizes (default: 10,100,1000)")
+    parser.add_argument("--fetch-workers", type=int, default=4)
+    parser.add_argument("--analyze-workers", type=int, default=4)
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Seconds per stub Claude call")
+    parser.add_argument("--stub-failure-rate", type=float, default=0.0)
+    parser.add_argument("--edgar-latency", type=float, default=0.0, help="Seconds added per fake EDGAR response")
+    parser.add_argument("--edgar-rate", type=float, default=0.0,
+                        help="EDGAR requests/sec limit (default: 0, unlimited)")
+    parser.add_argument("--warm", action="store_true", help="Also time a second run against the filled cache")
+    parser.add_argument("--json", metavar="PATH", help="Append results as JSON lines")
+    parser.add_argument("--verbose", action="store_true", help="Show scanner output")
+    args = parser.parse_args()
+
+    if args.child:
+        config = json.loads(args.child)
+        Path(config["out"]).write_text(json.dumps(run_scan(config)))
+        return
+
+    from edgar_fixture import EdgarFixture
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    fixture = EdgarFixture(max(sizes), latency=args.edgar_latency)
+    url = fixture.start()
+    STUB.chmod(STUB.stat().st_mode | 0o111)
+    print(f"Fake EDGAR at {url}; stub Claude {args.stub_latency * 1000:.0f} ms/call, "
+          f"{args.fetch_workers} fetch / {args.analyze_workers} analyze workers\n")
+
+    rows = []
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix="sec-scanner-bench-") as workdir:
+                env = {
+                    **os.environ,
+                    "SEC_SCANNER_EDGAR_URL": url,
+                    "SEC_SCANNER_CACHE_DIR": str(Path(workdir) / "cache"),
+                    "SEC_SCANNER_CLAUDE": str(STUB),
+                    "STUB_LATENCY": str(args.stub_latency),
+                    "STUB_FAILURE_RATE": str(args.stub_failure_rate),
+                }
+                config = {
+                    "tickers": fixture.tickers[:size],
+                    "workdir": workdir,
+                    "fetch_workers": args.fetch_workers,
+                    "analyze_workers": args.analyze_workers,
+                    "edgar_rate": args.edgar_rate,
+                }
+                for run in ("cold", "warm") if args.warm else ("cold",):
+                    result = run_child(config, env, args.verbose)
+                    rows.append({**result, "run": run})
+                    print(f"  {size} tickers ({run}): {result['seconds']:.1f}s, "
+                          f"{result['analyzed']} analyzed")
+    finally:
+        fixture.stop()
+
+    print()
+    print_table(rows)
+
+    if args.json:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip()
+        with open(args.json, "a") as f:
+            for row in rows:
+                f.write(json.dumps({"at": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit,
+                                    "stub_latency": args.stub_latency, **row}) + "\n")
+        print(f"\nAppended {len(rows)} results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
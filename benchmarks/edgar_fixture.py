@@ -0,0 +1,346 @@
+"""Local stand-in for SEC EDGAR, seeded from the filings in .cache.
+
+Serves the endpoints the scanner uses — company_tickers.json, submissions
+JSON (with paginated `filings.files` pages) and filing documents, -index.htm
+pages and submission .txt files under /Archives — for any number of
+synthetic companies. Each company's 10-Ks are rebuilt as HTML from real
+cached filing text, so download, cleaning and section extraction do
+realistic work. Supports ETag / If-None-Match, and can add latency,
+inject 503s and publish new filings while running.
+
+    python benchmarks/edgar_fixture.py --tickers 100 --port 8765
+    SEC_SCANNER_EDGAR_URL=http://127.0.0.1:8765 sec-scanner BENCH0001
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import re
+import socket
+import sqlite3
+import threading
+import time
+import zipfile
+import zlib
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+
+# Entries kept in filings.recent; older ones go to submissions-NNN.json pages
+RECENT_LIMIT = 40
+PAGE_SIZE = 40
+
+# Bodies are written in pieces through a small socket buffer, so a client
+# that hangs up early stops the transfer and bytes_served shows it
+SEND_CHUNK_BYTES = 16 * 1024
+
+FALLBACK_TEXT = "\n".join(
+    f"Item {item}. Section {item}\nWe use artificial intelligence and machine learning in our "
+    f"products. Revenue from AI services grew {n}% this year." for n, item in enumerate(["1", "1A", "7"], 10)
+)
+
+_NAME_RE = re.compile(r"^(?P<ticker>[A-Z0-9.\-]+)_(?P<date>\d{4}-\d{2}-\d{2})_[0-9a-f]{8}\.txt$")
+
+
+def load_seeds(cache_dir: Path = CACHE_DIR) -> list[tuple[str, str, str]]:
+    """(ticker, filing date, cleaned text) for every filing in the cache."""
+    seeds = {}
+    for path in sorted(cache_dir.glob("*.txt")):
+        m = _NAME_RE.match(path.name)
+        if m:
+            seeds[(m["ticker"], m["date"])] = path.read_text(encoding="utf-8")
+    db = cache_dir / "cache.db"
+    if db.exists():
+        conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+        try:
+            for ticker, filing_date, data in conn.execute(
+                    "SELECT f.ticker, f.filing_date, b.data FROM filings f JOIN blobs b ON b.hash = f.hash"):
+                seeds.setdefault((ticker, filing_date), zlib.decompress(data).decode("utf-8"))
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+    return [(t, d, text) for (t, d), text in sorted(seeds.items())]
+
+
+class EdgarFixture:
+    """In-process fake EDGAR. start() returns the base URL to use as SEC_SCANNER_EDGAR_URL."""
+
+    def __init__(self, n_tickers: int = 100, years: int = 1, cache_dir: Path = CACHE_DIR,
+                 latency: float = 0.0, error_rate: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests: Counter = Counter()
+        self.index_pages = True  # False: filings have no -index.htm, only their submission .txt
+        self.bytes_served = 0  # body bytes written, short of any the client hung up on
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+        seeds = load_seeds(cache_dir) or [("SEED", date.today().isoformat(), FALLBACK_TEXT)]
+        # Paragraphs escaped once; documents are assembled per request
+        self._seed_paragraphs = [
+            [f"<p>{html.escape(line)}</p>" for line in text.split("\n") if line.strip()]
+            for _, _, text in seeds
+        ]
+        known = _known_ciks(cache_dir)
+
+        self.companies: dict[str, dict] = {}
+        names = [t for t, _, _ in seeds if t != "SEED"]
+        names += [f"BENCH{i:04d}" for i in range(1, max(0, n_tickers - len(names)) + 1)]
+        for i, ticker in enumerate(names[:n_tickers]):
+            cik, title = known.get(ticker, (str(9_000_000 + i), f"{ticker} Holdings Inc"))
+            latest = date.fromisoformat(seeds[i % len(seeds)][1])
+            company = {"ticker": ticker, "cik": int(cik), "name": title, "seed": i % len(seeds), "filings": []}
+            for year in range(years - 1, -1, -1):
+                filed = latest - timedelta(days=365 * year)
+                for quarter in (3, 2, 1):  # 10-Qs between annual reports
+                    self._add_filing(company, "10-Q", filed - timedelta(days=91 * quarter))
+                self._add_filing(company, "10-K", filed)
+            self.companies[ticker] = company
+        self._by_cik = {c["cik"]: c for c in self.companies.values()}
+
+    @property
+    def tickers(self) -> list[str]:
+        return list(self.companies)
+
+    def _add_filing(self, company: dict, form: str, filed: date):
+        seq = len(company["filings"]) + 1
+        accession = f"{company['cik']:010d}-{filed:%y}-{seq:06d}"
+        doc = f"{company['ticker'].lower()}-{filed:%Y%m%d}{'' if form == '10-K' else 'q'}.htm"
+        company["filings"].append({"form": form, "accession": accession, "date": filed.isoformat(), "doc": doc})
+
+    def publish(self, ticker: str, form: str = "10-K", filed: str | None = None) -> dict:
+        """Add a new filing for ticker (today by default), as EDGAR would after a release."""
+        with self._lock:
+            company = self.companies[ticker]
+            self._add_filing(company, form, date.fromisoformat(filed) if filed else date.today())
+            return company["filings"][-1]
+
+    # ── Responses ─────────────────────────────────────────────────────────────
+
+    def company_tickers(self) -> dict:
+        return {str(n): {"cik_str": c["cik"], "ticker": c["ticker"], "title": c["name"]}
+                for n, c in enumerate(self.companies.values())}
+
+    def submissions(self, company: dict, page: int | None = None) -> dict:
+        filings = list(reversed(company["filings"]))  # newest first, like EDGAR
+        recent, older = filings[:RECENT_LIMIT], filings[RECENT_LIMIT:]
+        pages = [older[i:i + PAGE_SIZE] for i in range(0, len(older), PAGE_SIZE)]
+        if page is not None:
+            return _columns(pages[page - 1]) if 0 < page <= len(pages) else None
+        return {
+            "cik": str(company["cik"]),
+            "name": company["name"],
+            "tickers": [company["ticker"]],
+            "filings": {
+                "recent": _columns(recent),
+                "files": [{"name": f"CIK{company['cik']:010d}-submissions-{n:03d}.json",
+                           "filingCount": len(p), "filingFrom": p[-1]["date"], "filingTo": p[0]["date"]}
+                          for n, p in enumerate(pages, 1)],
+            },
+        }
+
+    def document(self, company: dict, filing: dict) -> str:
+        paragraphs = self._seed_paragraphs[company["seed"]]
+        # Older filings drop a few paragraphs so year-over-year diffs have something to find
+        age = sum(1 for f in company["filings"] if f["form"] == "10-K" and f["date"] > filing["date"])
+        if age:
+            paragraphs = [p for n, p in enumerate(paragraphs) if (n + age) % 11]
+        return ("<html><head><title>10-K</title><style>p{margin:0}</style></head><body>"
+                f"<p>{html.escape(company['name'])} Form {filing['form']} filed {filing['date']}</p>"
+                + "".join(paragraphs) + "</body></html>")
+
+    def index_page(self, company: dict, filing: dict) -> str:
+        """The filing's -index.htm: a Document / Type table, the main document linked through the iXBRL viewer."""
+        folder = f"/Archives/edgar/data/{company['cik']}/{filing['accession'].replace('-', '')}"
+        rows = [(f"/ix?doc={folder}/{filing['doc']}", filing["doc"], filing["form"]),
+                (f"{folder}/ex21.htm", "ex21.htm", "EX-21")]
+        return ("<html><body><table class=\"tableFile\" summary=\"Document Format Files\">"
+                "<tr><th>Seq</th><th>Description</th><th>Document</th><th>Type</th><th>Size</th></tr>"
+                + "".join(f'<tr><td scope="row">{n}</td><td scope="row">{form}</td>'
+                          f'<td scope="row"><a href="{href}">{name}</a></td><td scope="row">{form}</td>'
+                          f'<td scope="row">1000</td></tr>' for n, (href, name, form) in enumerate(rows, 1))
+                + "</table></body></html>")
+
+    def submission_text(self, company: dict, filing: dict) -> str:
+        """The complete submission .txt: an SGML header, then each document in turn."""
+        documents = [(filing["form"], filing["doc"], self.document(company, filing)),
+                     ("EX-21", "ex21.htm", "<html><body><p>Subsidiaries</p></body></html>")]
+        return (f"<SEC-DOCUMENT>{filing['accession']}.txt : {filing['date'].replace('-', '')}\n"
+                f"<SEC-HEADER>\nACCESSION NUMBER:\t\t{filing['accession']}\n"
+                f"CONFORMED SUBMISSION TYPE:\t{filing['form']}\n</SEC-HEADER>\n"
+                + "".join(f"<DOCUMENT>\n<TYPE>{form}\n<SEQUENCE>{n}\n<FILENAME>{name}\n<DESCRIPTION>{form}\n"
+                          f"<TEXT>\n{body}\n</TEXT>\n</DOCUMENT>\n"
+                          for n, (form, name, body) in enumerate(documents, 1))
+                + "</SEC-DOCUMENT>\n")
+
+    def route(self, path: str) -> tuple[int, str, str] | None:
+        """(status, content type, body) for a request path, or None for 404."""
+        path = path.split("?", 1)[0]
+        if path == "/files/company_tickers.json":
+            return 200, "application/json", json.dumps(self.company_tickers())
+        m = re.fullmatch(r"/submissions/CIK(\d{10})(?:-submissions-(\d{3}))?\.json", path)
+        if m:
+            company = self._by_cik.get(int(m[1]))
+            body = self.submissions(company, int(m[2]) if m[2] else None) if company else None
+            return (200, "application/json", json.dumps(body)) if body is not None else None
+        m = re.fullmatch(r"/Archives/edgar/data/(\d+)/(\d{18})/([^/]+)", path)
+        if m:
+            company = self._by_cik.get(int(m[1]))
+            for filing in company["filings"] if company else []:
+                if filing["accession"].replace("-", "") != m[2]:
+                    continue
+                if filing["doc"] == m[3]:
+                    return 200, "text/html; charset=utf-8", self.document(company, filing)
+                if self.index_pages and m[3] == f"{filing['accession']}-index.htm":
+                    return 200, "text/html; charset=utf-8", self.index_page(company, filing)
+            return None
+        m = re.fullmatch(r"/Archives/edgar/data/(\d+)/(\d{10}-\d{2}-\d{6})\.txt", path)
+        if m:
+            company = self._by_cik.get(int(m[1]))
+            for filing in company["filings"] if company else []:
+                if filing["accession"] == m[2]:
+                    return 200, "text/plain; charset=utf-8", self.submission_text(company, filing)
+            return None
+        if path == "/cgi-bin/browse-edgar":
+            return 200, "application/atom+xml", "<feed></feed>"
+        return None
+
+    # ── Bulk files ────────────────────────────────────────────────────────────
+
+    def write_submissions_zip(self, path: str):
+        """The companies' submissions JSON, pages included, laid out like EDGAR's submissions.zip."""
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for company in self.companies.values():
+                main = self.submissions(company)
+                zf.writestr(f"CIK{company['cik']:010d}.json", json.dumps(main))
+                for n, _ in enumerate(main["filings"]["files"], 1):
+                    zf.writestr(f"CIK{company['cik']:010d}-submissions-{n:03d}.json",
+                                json.dumps(self.submissions(company, n)))
+
+    def write_form_idx(self, path: str):
+        """A quarterly form.idx listing every filing (fixed-width columns, like EDGAR's)."""
+        with open(path, "w", encoding="latin-1") as f:
+            f.write("Form Type   Company Name                                                  CIK         "
+                    "Date Filed  File Name\n" + "-" * 140 + "\n")
+            for company in self.companies.values():
+                for filing in company["filings"]:
+                    f.write(f"{filing['form']:<12}{company['name']:<62}{company['cik']:<12}{filing['date']:<12}"
+                            f"edgar/data/{company['cik']}/{filing['accession']}.txt\n")
+
+    # ── Server ────────────────────────────────────────────────────────────────
+
+    def start(self, port: int = 0) -> str:
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is measurable
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_CHUNK_BYTES)
+                # Small writes must not wait on Nagle for the client's delayed ACK
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def handle(self):
+                try:
+                    super().handle()
+                except ConnectionResetError:
+                    pass  # the client closed mid-body, e.g. after stopping a download early
+
+            def do_GET(self):
+                kind = self.path.split("/")[1] if self.path.count("/") > 1 else self.path
+                with fixture._lock:
+                    fixture.requests[kind] += 1
+                    routed = fixture.route(self.path)
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                if fixture.error_rate and random.random() < fixture.error_rate:
+                    return self._send(503, "text/plain", b"busy", {"Retry-After": "0"})
+                if routed is None:
+                    return self._send(404, "text/plain", b"not found")
+                status, content_type, body = routed
+                etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with fixture._lock:
+                        fixture.requests["not_modified"] += 1
+                    return self._send(304, content_type, b"", {"ETag": etag})
+                self._send(status, content_type, body.encode("utf-8"), {"ETag": etag})
+
+            def _send(self, status, content_type, body, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                served = 0
+                try:
+                    for start in range(0, len(body), SEND_CHUNK_BYTES):
+                        self.wfile.write(body[start:start + SEND_CHUNK_BYTES])
+                        served += len(body[start:start + SEND_CHUNK_BYTES])
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                finally:
+                    with fixture._lock:
+                        fixture.bytes_served += served
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _columns(filings: list[dict]) -> dict:
+    return {
+        "accessionNumber": [f["accession"] for f in filings],
+        "filingDate": [f["date"] for f in filings],
+        "form": [f["form"] for f in filings],
+        "primaryDocument": [f["doc"] for f in filings],
+    }
+
+
+def _known_ciks(cache_dir: Path) -> dict[str, tuple[str, str]]:
+    """Real CIKs and names for seed tickers, from the cached ticker index if present."""
+    try:
+        stored = json.loads((cache_dir / "ticker_index.json").read_text(encoding="utf-8"))
+        return {t: tuple(v) for t, v in stored["tickers"].items()}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake EDGAR seeded from .cache")
+    parser.add_argument("--tickers", type=int, default=100, help="Number of companies (default: 100)")
+    parser.add_argument("--years", type=int, default=1, help="Annual filings per company (default: 1)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    args = parser.parse_args()
+
+    fixture = EdgarFixture(args.tickers, args.years, latency=args.latency, error_rate=args.error_rate)
+    url = fixture.start(args.port)
+    print(f"Fake EDGAR with {len(fixture.tickers)} companies at {url}")
+    print(f"  SEC_SCANNER_EDGAR_URL={url} sec-scanner {' '.join(fixture.tickers[:3])}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fixture.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Stand-in for the Claude wrapper: reads a prompt on stdin, answers in the expected JSON.
+
+Answers are derived from a hash of the filing they score (ticker and date,
+or the whole prompt if it names none), so the same filing always gets the
+same scores, and each takeaway says which filing it is for. It recognizes
+every prompt the scanner sends — single, batched (keyed by filing number),
+chunk evidence extraction and incremental updates. Latency and failures are
+injected from the environment:
+
+    STUB_LATENCY       mean seconds per call, --version included (default 0)
+    STUB_JITTER        ± fraction of the latency (default 0.2)
+    STUB_FAILURE_RATE  probability a call exits non-zero (default 0)
+    STUB_FAIL_ONCE     1: a prompt fails the first time it is seen (needs STUB_CALLS)
+    STUB_HANG          seconds to hang, with a grandchild in the same process group
+    STUB_CALLS         file to log prompts to, one JSON string per line; --version
+                       calls go to <file>.version and a hung grandchild's pid to <file>.child
+
+    SEC_SCANNER_CLAUDE=benchmarks/stub_claude.py sec-scanner NVDA
+    sec-scanner --claude-cmd benchmarks/stub_claude.py NVDA
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+
+DIMENSIONS = ("SPECIFICITY", "FINANCIAL_IMPACT", "INTEGRATION_DEPTH", "COMPETITIVE_MOAT", "EXECUTION_EVIDENCE")
+VERSION = "stub-claude 1.0"
+
+_AI_LINE_RE = re.compile(r"\b(?:AI|artificial intelligence|machine learning|GPUs?|inference)\b", re.IGNORECASE)
+_BATCH_FILING_RE = re.compile(r"^=== Filing (\d+): (\S+) — .* — filed (\S+) ===$", re.MULTILINE)
+_SINGLE_FILING_RE = re.compile(r"^Company: (\S+) — .*\nFiling date: (\S+)", re.MULTILINE)
+
+
+def _analysis(seed: str, filing: str | None = None) -> dict:
+    rng = random.Random(hashlib.sha256(seed.encode("utf-8")).digest())
+    scores = {d: rng.randint(1, 10) for d in DIMENSIONS}
+    total = sum(scores.values()) * 2
+    verdict = ("Genuine AI Adopter" if total >= 60 else
+               "Strong AI Washing" if total < 40 else "Mixed Signals")
+    return {
+        "scores": scores,
+        "findings": [f"Stub finding {i + 1}" for i in range(3)],
+        "flags": [f"Stub flag {i + 1}" for i in range(2)],
+        "takeaway": f"Deterministic stub analysis of {filing}." if filing else "Deterministic stub analysis.",
+        "verdict": verdict,
+        "disclosure_style": rng.choice(["verbose", "standard", "conservative"]),
+    }
+
+
+def respond(prompt: str) -> dict:
+    """Build the reply the scanner expects for this prompt."""
+    if "\nEXCERPT:\n" in prompt:
+        excerpt = prompt.split("\nEXCERPT:\n", 1)[1]
+        quotes = [line[:160] for line in excerpt.split("\n") if _AI_LINE_RE.search(line)][:3]
+        return {"evidence": [{"quote": q, "kind": "product", "note": "stub"} for q in quotes]}
+
+    batch = _BATCH_FILING_RE.findall(prompt)
+    if batch:
+        return {n: _analysis(f"{ticker} {date}", f"{ticker} {date}") for n, ticker, date in batch}
+
+    single = _SINGLE_FILING_RE.search(prompt)
+    filing = f"{single[1]} {single[2]}" if single else None
+    result = _analysis(filing or prompt, filing)
+    if "NEW OR CHANGED AI-RELATED PASSAGES" in prompt:
+        result["changes"] = ["Stub change summary"]
+    return result
+
+
+def _log(path: str, line: str):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def _sleep(latency: float):
+    jitter = float(os.environ.get("STUB_JITTER", "0.2"))
+    if latency > 0:
+        time.sleep(max(0.0, latency * random.uniform(1 - jitter, 1 + jitter)))
+
+
+def main():
+    calls = os.environ.get("STUB_CALLS")
+    latency = float(os.environ.get("STUB_LATENCY", "0"))
+    if "--version" in sys.argv[1:]:
+        if calls:
+            _log(calls + ".version", VERSION)
+        _sleep(latency)
+        print(VERSION)
+        return 0
+
+    prompt = sys.stdin.read()
+    seen = 0
+    if calls:
+        if os.path.exists(calls):
+            with open(calls, encoding="utf-8") as f:
+                seen = sum(1 for line in f if json.loads(line) == prompt)
+        _log(calls, json.dumps(prompt))
+
+    hang = float(os.environ.get("STUB_HANG", "0"))
+    if hang:
+        child = subprocess.Popen([sys.executable, "-c", f"import time; time.sleep({hang})"])
+        if calls:
+            with open(calls + ".child", "w") as f:
+                f.write(str(child.pid))
+        time.sleep(hang)
+
+    _sleep(latency)
+    if os.environ.get("STUB_FAIL_ONCE") == "1" and not seen:
+        print("stub-claude: first attempt fails", file=sys.stderr)
+        return 1
+    if random.random() < float(os.environ.get("STUB_FAILURE_RATE", "0")):
+        print("stub-claude: injected failure", file=sys.stderr)
+        return 1
+
+    print(json.dumps(respond(prompt)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
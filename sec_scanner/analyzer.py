@@ -1,21 +1,18 @@
 """Run Claude CLI to analyze filing text and parse scores + findings."""
 
+import hashlib
 import json
-import subprocess
-import sys
 from pathlib import Path
 
+from sec_scanner import metrics
+from sec_scanner.executor import get_executor
+
 # Load project context once at import time
 _CONTEXT_PATH = Path(__file__).parent.parent / "project_context.md"
 _PROJECT_CONTEXT = _CONTEXT_PATH.read_text() if _CONTEXT_PATH.exists() else ""
 
 
-PROMPT_TEMPLATE = """You are analyzing a SEC 10-K filing for evidence of genuine AI adoption vs. AI washing.
-
-Company: {ticker} — {company}
-Filing date: {date}
-
-Score this company on these 5 dimensions (0-10 each):
+RUBRIC = """Score this company on these 5 dimensions (0-10 each):
 1. SPECIFICITY: Are AI implementations specific (named products, use cases) or vague buzzwords?
 2. FINANCIAL_IMPACT: Is there quantified revenue/cost impact from AI?
 3. INTEGRATION_DEPTH: How deeply is AI woven into core business vs. bolt-on?
@@ -32,7 +29,7 @@ Also provide:
   - "conservative": company historically understates in filings vs. public reality (e.g. AAPL, JPM)
   - "standard": typical disclosure depth for their sector
 
-Output as JSON:
+Assessment format:
 {{
   "scores": {{"SPECIFICITY": X, "FINANCIAL_IMPACT": X, "INTEGRATION_DEPTH": X, "COMPETITIVE_MOAT": X, "EXECUTION_EVIDENCE": X}},
   "findings": ["...", "...", "..."],
@@ -40,57 +37,80 @@ Output as JSON:
   "takeaway": "...",
   "verdict": "...",
   "disclosure_style": "..."
-}}
+}}"""
+
+# Output instruction for prompts that ask for one assessment; batches state their own
+SINGLE_OUTPUT = """Output the assessment as that JSON object.
+
+IMPORTANT: Output ONLY the JSON object, no markdown code fences, no extra text."""
+
+PROMPT_TEMPLATE = """You are analyzing a SEC 10-K filing for evidence of genuine AI adoption vs. AI washing.
+
+Company: {ticker} — {company}
+Filing date: {date}
 
-IMPORTANT: Output ONLY the JSON object, no markdown code fences, no extra text.
+""" + RUBRIC + """
+
+""" + SINGLE_OUTPUT + """
 
 FILING TEXT:
 {filing_text}"""
 
 
-def analyze_filing(filing: dict) -> dict | None:
-    """Analyze a filing using Claude CLI subprocess.
+BATCH_PROMPT_TEMPLATE = """You are analyzing {count} SEC 10-K filings for evidence of genuine AI adoption vs. AI washing.
+The filings are numbered 1 to {count}; the same company may appear more than once, for different years.
+Analyze each filing independently — never let one filing influence another filing's scores.
 
-    Args:
-        filing: dict with keys ticker, company, date, text
+For EACH filing:
+""" + RUBRIC + """
 
-    Returns:
-        dict with keys: ticker, company, score, verdict, scores, findings, flags, takeaway, date
-        Or None on failure.
-    """
-    from sec_scanner.cache import get_analysis, save_analysis
+Output ONE JSON object keyed by filing number, whose values are the per-filing assessments in
+the format above, with an entry for every one of: {numbers}
+{{"1": {{"scores": {{...}}, "findings": [...], "flags": [...], "takeaway": "...", "verdict": "...", "disclosure_style": "..."}}, "2": {{...}}}}
 
-    # Check analysis cache — skip Claude call if same filing already scored
-    url = filing.get("url", "")
-    cached = get_analysis(filing["ticker"], filing["date"], url)
-    if cached:
-        print(f"  [{filing['ticker']}] Using cached analysis (score: {cached['score']})")
-        return cached
+IMPORTANT: Output ONLY that keyed JSON object, no markdown code fences, no extra text.
 
-    context_block = f"---\n{_PROJECT_CONTEXT}\n---\n\n" if _PROJECT_CONTEXT else ""
-    prompt = context_block + PROMPT_TEMPLATE.format(
-        ticker=filing["ticker"],
-        company=filing["company"],
-        date=filing["date"],
-        filing_text=filing["text"],
-    )
+{filings}"""
 
-    print(f"  [{filing['ticker']}] Running Claude analysis...")
+# Combined filing text per batched prompt — room for two full default-budget filings
+BATCH_CHARS = 160_000
+
+BATCH_FILING_TEMPLATE = """=== Filing {number}: {ticker} — {company} — filed {date} ===
+FILING TEXT:
+{filing_text}
+"""
+
+DIMENSIONS = ("SPECIFICITY", "FINANCIAL_IMPACT", "INTEGRATION_DEPTH", "COMPETITIVE_MOAT", "EXECUTION_EVIDENCE")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-    try:
-        result = subprocess.run(
-            ["/Users/justinadair/bin/claude-wrapper", "-p", "--output-format", "text"],
-            input=prompt,
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
 
-        if result.returncode != 0:
-            print(f"  [{filing['ticker']}] ERROR: Claude CLI failed: {result.stderr[:200]}")
-            return None
+def analysis_fingerprint(filing: dict, template: str = PROMPT_TEMPLATE) -> str:
+    """Hash of everything that determines an analysis.
 
-        output = result.stdout.strip()
+    Covers the filing text sent to Claude, the prompt template, project_context.md
+    and the wrapper/model version. Editing any of them yields a new
+    fingerprint, so stale cache entries can be told apart from fresh ones.
+    """
+    parts = [
+        _sha256(filing["text"]),
+        _sha256(template),
+        _sha256(_PROJECT_CONTEXT),
+        _sha256(get_executor().version()),
+    ]
+    return _sha256("|".join(parts))[:16]
+
+
+def _context_block() -> str:
+    return f"---\n{_PROJECT_CONTEXT}\n---\n\n" if _PROJECT_CONTEXT else ""
+
+
+def _parse_output(output: str, label: str):
+    """Parse Claude's JSON reply, tolerating markdown code fences. None if unparseable."""
+    try:
+        output = output.strip()
 
         # Strip markdown code fences if present
         if output.startswith("```"):
@@ -99,20 +119,29 @@ def analyze_filing(filing: dict) -> dict | None:
             lines = [l for l in lines if not l.strip().startswith("```")]
             output = "\n".join(lines)
 
-        parsed = json.loads(output)
+        return json.loads(output)
 
-    except subprocess.TimeoutExpired:
-        print(f"  [{filing['ticker']}] ERROR: Claude CLI timed out")
-        return None
     except json.JSONDecodeError as e:
-        print(f"  [{filing['ticker']}] ERROR: Could not parse Claude output as JSON: {e}")
-        print(f"  [{filing['ticker']}] Raw output (first 500 chars): {output[:500]}")
+        print(f"  [{label}] ERROR: Could not parse Claude output as JSON: {e}")
+        print(f"  [{label}] Raw output (first 500 chars): {output[:500]}")
         return None
 
+
+def _valid_analysis(parsed) -> bool:
+    """True if parsed has all five numeric 0-10 scores and a verdict."""
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("verdict"), str):
+        return False
+    scores = parsed.get("scores")
+    return isinstance(scores, dict) and all(
+        isinstance(scores.get(d), (int, float)) and 0 <= scores[d] <= 10 for d in DIMENSIONS
+    )
+
+
+def _build_result(filing: dict, parsed: dict) -> dict:
     scores = parsed.get("scores", {})
     total_score = sum(scores.values()) * 2  # Each dimension 0-10, 5 dims = max 50, * 2 = max 100
 
-    result = {
+    return {
         "ticker": filing["ticker"],
         "company": filing["company"],
         "score": total_score,
@@ -125,8 +154,151 @@ def analyze_filing(filing: dict) -> dict | None:
         "date": filing["date"],
     }
 
+
+def _latest_analysis(filing: dict, mode: str | None) -> dict | None:
+    """Newest cached analysis of a filing made in the given mode, whatever its inputs."""
+    from sec_scanner.cache import analysis_history, get_analysis
+
+    url = filing.get("url", "")
+    latest = get_analysis(filing["ticker"], filing["date"], url)
+    if latest is None or latest.get("mode") == mode:
+        return latest
+    for entry in analysis_history(filing["ticker"]):
+        if (entry["filing_date"] == filing["date"] and entry["url"] in (url, None)
+                and entry["result"].get("mode") == mode):
+            return entry["result"]
+    return None
+
+
+def _cached_analysis(filing: dict, reanalyze_if_stale: bool,
+                     fingerprints: list[str] | None = None, mode: str | None = None) -> dict | None:
+    """Cached result for a filing, preferring one made from the current inputs.
+
+    fingerprints lists the input hashes that count as fresh; by default
+    those of the single and batched prompts, which share the rubric.
+    Without reanalyze_if_stale an analysis from older inputs is reused,
+    but only one made in the same mode (result["mode"]: None for single
+    and batched prompts, "chunked", "incremental"), so switching modes
+    always re-analyzes.
+    """
+    from sec_scanner.cache import get_analysis
+
+    url = filing.get("url", "")
+    if fingerprints is None:
+        fingerprints = [analysis_fingerprint(filing, t) for t in (PROMPT_TEMPLATE, BATCH_PROMPT_TEMPLATE)]
+    for fingerprint in fingerprints:
+        cached = get_analysis(filing["ticker"], filing["date"], url, fingerprint=fingerprint)
+        if cached:
+            print(f"  [{filing['ticker']}] Using cached analysis (score: {cached['score']})")
+            metrics.incr("cache.analysis_hits")
+            return cached
+    if not reanalyze_if_stale:
+        cached = _latest_analysis(filing, mode)
+        if cached:
+            print(f"  [{filing['ticker']}] Using cached analysis (score: {cached['score']}) — "
+                  f"inputs changed since; --reanalyze-if-stale to refresh")
+            metrics.incr("cache.analysis_hits")
+            metrics.incr("cache.analysis_stale_hits")
+            return cached
+    metrics.incr("cache.analysis_misses")
+    return None
+
+
+def analyze_filing(filing: dict, reanalyze_if_stale: bool = False) -> dict | None:
+    """Analyze a filing using Claude CLI subprocess.
+
+    Args:
+        filing: dict with keys ticker, company, date, text
+        reanalyze_if_stale: only accept a cached analysis made from the same
+            inputs (see analysis_fingerprint); otherwise any cached single or
+            batched analysis of this filing is reused
+
+    Returns:
+        dict with keys: ticker, company, score, verdict, scores, findings, flags, takeaway, date
+        Or None on failure.
+    """
+    # Check analysis cache — skip Claude call if same filing already scored
+    cached = _cached_analysis(filing, reanalyze_if_stale)
+    if cached:
+        return cached
+    return _analyze_single(filing)
+
+
+def _analyze_single(filing: dict) -> dict | None:
+    from sec_scanner.cache import save_analysis
+
+    prompt = _context_block() + PROMPT_TEMPLATE.format(
+        ticker=filing["ticker"],
+        company=filing["company"],
+        date=filing["date"],
+        filing_text=filing["text"],
+    )
+
+    print(f"  [{filing['ticker']}] Running Claude analysis...")
+
+    output = get_executor().run(prompt, label=filing["ticker"])
+    if output is None:
+        return None
+
+    parsed = _parse_output(output, filing["ticker"])
+    if parsed is None:
+        return None
+
+    result = _build_result(filing, parsed)
+
     # Cache the result so we don't re-run Claude on the same filing
-    save_analysis(filing["ticker"], filing["date"], url, result)
+    save_analysis(filing["ticker"], filing["date"], filing.get("url", ""), result,
+                  fingerprint=analysis_fingerprint(filing))
     print(f"  [{filing['ticker']}] Analysis cached")
 
     return result
+
+
+def analyze_batch(filings: list[dict], reanalyze_if_stale: bool = False) -> list[dict | None]:
+    """Analyze several filings with one Claude call; results line up with filings.
+
+    Cached filings are answered from the cache. The rest share one prompt
+    in which they are numbered, and the reply is keyed by that number, so
+    several years of one company can share a batch. Each entry is
+    validated and cached on its own. Filings missing or malformed in the
+    reply fall back to a single-filing call, so a bad batch costs extra
+    calls but never a result.
+    """
+    from sec_scanner.cache import save_analysis
+
+    results: list[dict | None] = [_cached_analysis(f, reanalyze_if_stale) for f in filings]
+    pending = [i for i, r in enumerate(results) if r is None]
+    if len(pending) <= 1:
+        return [r if r is not None else _analyze_single(f) for f, r in zip(filings, results)]
+
+    numbers = [str(n) for n in range(1, len(pending) + 1)]
+    prompt = _context_block() + BATCH_PROMPT_TEMPLATE.format(
+        count=len(pending),
+        numbers=", ".join(numbers),
+        filings="\n".join(BATCH_FILING_TEMPLATE.format(
+            number=n, ticker=f["ticker"], company=f["company"], date=f["date"], filing_text=f["text"],
+        ) for n, f in zip(numbers, (filings[i] for i in pending))),
+    )
+    label = "+".join(filings[i]["ticker"] for i in pending)
+    print(f"  [{label}] Running batched Claude analysis ({len(pending)} filings)...")
+
+    claude = get_executor()
+    output = claude.run(prompt, label=label, timeout=claude.timeout * len(pending))
+    parsed = _parse_output(output, label) if output is not None else None
+    if isinstance(parsed, list):  # a bare array in filing order is as good as numbered keys
+        parsed = dict(zip(numbers, parsed))
+    by_number = {str(k).strip(): v for k, v in parsed.items()} if isinstance(parsed, dict) else {}
+
+    for n, i in zip(numbers, pending):
+        f = filings[i]
+        entry = by_number.get(n)
+        if _valid_analysis(entry):
+            results[i] = _build_result(f, entry)
+            save_analysis(f["ticker"], f["date"], f.get("url", ""), results[i],
+                          fingerprint=analysis_fingerprint(f, BATCH_PROMPT_TEMPLATE))
+            print(f"  [{f['ticker']}] Analysis cached (batched)")
+        else:
+            print(f"  [{f['ticker']}] Missing from batch response — analyzing on its own")
+            results[i] = _analyze_single(f)
+
+    return results
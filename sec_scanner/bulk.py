@@ -0,0 +1,219 @@
+"""Offline filing index from EDGAR bulk files — submissions.zip or quarterly form.idx.
+
+Building the index once lets a universe-wide scan skip the per-company
+submissions request: the fetch stage goes straight to the 10-K document.
+form.idx names no documents, so ingesting it looks each company's 10-K up
+in its filing index on EDGAR.
+
+    sec-scanner ingest submissions.zip        # https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip
+    sec-scanner ingest 2025-QTR1-form.idx 2025-QTR2-form.idx
+    sec-scanner --bulk-index --file universe.txt
+"""
+
+import gzip
+import json
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from sec_scanner.cache import CACHE_DIR
+
+BULK_INDEX_PATH = CACHE_DIR / "bulk_index.json"
+
+FORMS = ("10-K", "10-K/A")
+
+# Concurrent filing index lookups when ingesting form.idx (EDGAR's rate limit still applies)
+RESOLVE_WORKERS = 4
+
+_MAIN_RE = re.compile(r"CIK(\d{10})\.json$")
+_PAGE_RE = re.compile(r"CIK(\d{10})-submissions-\d+\.json$")
+_ROW_RE = re.compile(r"<tr[^>]*>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+_CELL_RE = re.compile(r"<td[^>]*>(.*?)</td>", re.IGNORECASE | re.DOTALL)
+_HREF_RE = re.compile(r'href="([^"]+)"', re.IGNORECASE)
+_DOCUMENT_RE = re.compile(r"<DOCUMENT>\s*<TYPE>([^\r\n<]+)\s*<SEQUENCE>[^\r\n<]*\s*<FILENAME>([^\r\n<]+)")
+
+
+def _document_url(cik: str, accession: str, doc: str) -> str:
+    from sec_scanner.fetcher import SEC_URL
+    return f"{SEC_URL}/Archives/edgar/data/{cik}/{accession.replace('-', '')}/{doc}"
+
+
+def _latest_in(columns: dict) -> tuple[str, str, str] | None:
+    """(filing_date, accession, primary document) of the newest 10-K in a filings column block."""
+    best = None
+    for form, filed, accession, doc in zip(columns.get("form", []), columns.get("filingDate", []),
+                                           columns.get("accessionNumber", []),
+                                           columns.get("primaryDocument", [])):
+        if form in FORMS and (best is None or filed > best[0]):
+            best = (filed, accession, doc)
+    return best
+
+
+def ingest_submissions_zip(path: str) -> dict:
+    """One streaming pass over submissions.zip; returns {TICKER: [cik, company, url, date]}.
+
+    Members are decompressed one at a time in memory, never extracted. A
+    company's older pages (CIK…-submissions-NNN.json) are only parsed when
+    its main file has no 10-K in filings.recent.
+    """
+    best: dict[str, tuple[str, str, str]] = {}     # cik -> newest 10-K seen
+    companies: dict[str, tuple[str, list]] = {}    # cik -> (name, tickers)
+    settled: set[str] = set()                      # recent already had a 10-K; pages are older
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            name = info.filename.rsplit("/", 1)[-1]
+            main, page = _MAIN_RE.match(name), _PAGE_RE.match(name)
+            if not (main or page):
+                continue
+            cik = str(int((main or page)[1]))
+            if page and cik in settled:
+                continue
+            with zf.open(info) as f:
+                data = json.load(f)
+            if main:
+                companies[cik] = (data.get("name") or "", data.get("tickers") or [])
+                columns = data.get("filings", {}).get("recent", {})
+            else:
+                columns = data
+            found = _latest_in(columns)
+            if found and (cik not in best or found[0] > best[cik][0]):
+                best[cik] = found
+            if main and found:
+                settled.add(cik)
+
+    index = {}
+    for cik, (filed, accession, doc) in best.items():
+        name, tickers = companies.get(cik, ("", []))
+        url = _document_url(cik, accession, doc)
+        for ticker in tickers:
+            index.setdefault(ticker.upper(), [cik, name or ticker.upper(), url, filed])
+    return index
+
+
+# ── Primary documents for form.idx entries ────────────────────────────────────
+
+def _document_from_index_page(cik: str, accession: str) -> str | None:
+    """The 10-K's file name from the filing's -index.htm (its Document / Type table)."""
+    from sec_scanner.fetcher import _get
+
+    page = _get(_document_url(cik, accession, f"{accession}-index.htm")).text
+    for row in _ROW_RE.findall(page):
+        cells = _CELL_RE.findall(row)
+        if len(cells) < 4 or re.sub(r"<[^>]+>|&nbsp;", "", cells[3]).strip() not in FORMS:
+            continue
+        href = _HREF_RE.search(cells[2])
+        if href:
+            # Inline XBRL documents are linked through the viewer: /ix?doc=/Archives/...
+            return href[1].rsplit("/", 1)[-1]
+    return None
+
+
+def _document_from_submission(url: str) -> str | None:
+    """The first 10-K <DOCUMENT>'s file name in a complete submission text file.
+
+    Only read as far as that document's header, which usually comes first.
+    """
+    from sec_scanner.fetcher import DOWNLOAD_CHUNK_BYTES, _get
+
+    resp = _get(url, timeout=60, stream=True)
+    try:
+        buffer = ""
+        for block in resp.iter_content(DOWNLOAD_CHUNK_BYTES):
+            buffer += block.decode("latin-1")
+            for m in _DOCUMENT_RE.finditer(buffer):
+                if m[1].strip() in FORMS:
+                    return m[2].strip()
+            buffer = buffer[-1024:]  # a header split across blocks
+        return None
+    finally:
+        resp.close()
+
+
+def _primary_document_url(cik: str, file_name: str) -> str:
+    """URL of a form.idx filing's 10-K document, or of its submission text file if none is found."""
+    from sec_scanner.fetcher import SEC_URL
+
+    submission = f"{SEC_URL}/Archives/{file_name}"
+    accession = file_name.rsplit("/", 1)[-1].removesuffix(".txt")
+    try:
+        doc = _document_from_index_page(cik, accession)
+    except requests.RequestException:
+        doc = None
+    if not doc:
+        try:
+            doc = _document_from_submission(submission)
+        except requests.RequestException:
+            doc = None
+    return _document_url(cik, accession, doc) if doc else submission
+
+
+def ingest_form_idx(paths: list[str]) -> dict:
+    """Newest 10-K per company from quarterly form.idx files (plain or .gz).
+
+    form.idx has no tickers or primary document names: CIKs are mapped to
+    tickers through the SEC ticker index, and each 10-K's document is looked
+    up in its filing index (or, failing that, the submission text file's
+    headers), giving the same URL ingest_submissions_zip would. A filing
+    whose document cannot be found keeps the complete submission text file.
+    """
+    from sec_scanner.fetcher import get_ticker_index
+
+    best: dict[str, tuple[str, str, str]] = {}  # cik -> (date, company, path)
+    for path in paths:
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rt", encoding="latin-1") as f:
+            for line in f:
+                # Form Type  Company Name  CIK  Date Filed  File Name — whitespace-aligned columns
+                if not line.startswith(FORMS):
+                    continue
+                parts = line.rstrip().rsplit(None, 3)
+                if len(parts) != 4:
+                    continue
+                head, cik, filed, file_name = parts
+                form, _, company = head.partition("  ")
+                if form.strip() not in FORMS or not cik.isdigit():
+                    continue
+                cik = str(int(cik))
+                if cik not in best or filed > best[cik][0]:
+                    best[cik] = (filed, company.strip(), file_name)
+
+    listed = get_ticker_index()
+    # Documents are only looked up for companies with a ticker
+    wanted = sorted({cik for cik, _ in listed.values() if cik in best})
+    with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as pool:
+        urls = dict(zip(wanted, pool.map(lambda cik: _primary_document_url(cik, best[cik][2]), wanted)))
+
+    index = {}
+    for ticker, (cik, title) in listed.items():
+        if cik in urls:
+            filed, company, _ = best[cik]
+            index.setdefault(ticker, [cik, title or company, urls[cik], filed])
+    return index
+
+
+def ingest(paths: list[str]) -> dict:
+    """Build and store the bulk index from a submissions.zip or form.idx files."""
+    start = time.time()
+    if len(paths) == 1 and zipfile.is_zipfile(paths[0]):
+        index = ingest_submissions_zip(paths[0])
+    else:
+        index = ingest_form_idx(paths)
+    BULK_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = BULK_INDEX_PATH.with_suffix(f".tmp{os.getpid()}")
+    tmp.write_text(json.dumps({"built_at": time.time(), "sources": [str(Path(p).resolve()) for p in paths],
+                               "filings": index}), encoding="utf-8")
+    os.replace(tmp, BULK_INDEX_PATH)
+    return {"tickers": len(index), "seconds": round(time.time() - start, 1)}
+
+
+def load_index() -> dict:
+    """{TICKER: [cik, company, url, date]} from the last ingest, or {} if there is none."""
+    try:
+        return json.loads(BULK_INDEX_PATH.read_text(encoding="utf-8"))["filings"]
+    except (OSError, ValueError, KeyError):
+        return {}
@@ -1,11 +1,43 @@
-"""Filing and analysis cache — skip re-fetching and re-analyzing unchanged filings."""
+"""Filing and analysis cache — skip re-fetching and re-analyzing unchanged filings.
 
+Entries live in a pluggable backend: a single SQLite database (default) or
+the original loose files in .cache. Pick one with SEC_SCANNER_CACHE=sqlite|files;
+SEC_SCANNER_CACHE_DIR moves the whole cache (and the other .cache state) elsewhere.
+"""
+
+import gzip
+import io
 import json
 import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
-CACHE_DIR = Path(__file__).parent.parent / ".cache"
-CACHE_DIR.mkdir(exist_ok=True)
+from sec_scanner import metrics
+
+try:
+    import zstandard
+except ImportError:  # optional — raw filings fall back to gzip
+    zstandard = None
+
+CACHE_DIR = Path(os.environ.get("SEC_SCANNER_CACHE_DIR") or Path(__file__).parent.parent / ".cache")
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+RAW_DIR = CACHE_DIR / "raw"
+CHUNKS_DIR = CACHE_DIR / "chunks"
+CACHE_DB = CACHE_DIR / "cache.db"
+
+CACHE_BACKEND = os.environ.get("SEC_SCANNER_CACHE", "sqlite")
+
+# Eviction defaults. Filing text and raw HTML can be re-downloaded; analyses
+# cost a Claude call to rebuild, so they are kept much longer.
+FILING_MAX_BYTES = 2 * 1024 ** 3
+FILING_MAX_AGE_DAYS = 400
+ANALYSIS_MAX_AGE_DAYS = 3 * 365
+
+# Limits given to `sec-scanner cache gc`, applied by the gc after each scan too
+GC_POLICY_PATH = CACHE_DIR / "gc_policy.json"
 
 
 def _filing_key(ticker: str, filing_date: str, filing_url: str) -> str:
@@ -18,56 +50,370 @@ def _analysis_key(ticker: str, filing_date: str, filing_url: str) -> str:
     return _filing_key(ticker, filing_date, filing_url) + "_analysis"
 
 
-# ── Filing text cache ─────────────────────────────────────────────────────────
+def _atomic_write(path: Path, content: str):
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}.{threading.get_ident()}")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
 
-def get_filing(ticker: str, filing_date: str, filing_url: str) -> str | None:
-    """Return cached filing text if available, else None."""
-    path = CACHE_DIR / f"{_filing_key(ticker, filing_date, filing_url)}.txt"
-    if path.exists():
-        return path.read_text(encoding="utf-8")
-    return None
 
+# ── File backend ──────────────────────────────────────────────────────────────
 
-def save_filing(ticker: str, filing_date: str, filing_url: str, text: str):
-    """Cache filing text to disk."""
-    path = CACHE_DIR / f"{_filing_key(ticker, filing_date, filing_url)}.txt"
-    path.write_text(text, encoding="utf-8")
+class FileCache:
+    """One .txt and one _analysis.json per filing in a flat directory."""
 
+    name = "files"
 
-# ── Analysis result cache ─────────────────────────────────────────────────────
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def get_filing(self, ticker: str, filing_date: str, filing_url: str,
+                   min_chars: int | None = None) -> str | None:
+        key = _filing_key(ticker, filing_date, filing_url)
+        for path in (self.directory / f"{key}.txt", self.directory / f"{key}.partial.txt"):
+            if not path.exists():
+                continue
+            text = path.read_text(encoding="utf-8")
+            if path.name.endswith(".partial.txt") and (min_chars is None or len(text) < min_chars):
+                return None
+            os.utime(path)  # mtime doubles as last access for gc
+            return text
+        return None
 
-def get_analysis(ticker: str, filing_date: str, filing_url: str) -> dict | None:
-    """Return cached analysis result if available, else None."""
-    path = CACHE_DIR / f"{_analysis_key(ticker, filing_date, filing_url)}.json"
-    if path.exists():
+    def save_filing(self, ticker: str, filing_date: str, filing_url: str, text: str,
+                    partial: bool = False):
+        key = _filing_key(ticker, filing_date, filing_url)
+        # The start of a filing goes beside the whole text, which replaces it
+        _atomic_write(self.directory / f"{key}{'.partial' if partial else ''}.txt", text)
+        if not partial:
+            (self.directory / f"{key}.partial.txt").unlink(missing_ok=True)
+
+    def previous_filing(self, ticker: str, before: str) -> dict | None:
+        from sec_scanner.cache_sqlite import _LEGACY_NAME_RE
+
+        candidates = []
+        for path in self.directory.glob(f"{ticker.upper()}_*.txt"):
+            m = _LEGACY_NAME_RE.match(path.name)
+            if m and m["ticker"] == ticker.upper() and m["date"] < before:
+                candidates.append((m["date"], path))
+        if not candidates:
+            return None
+        filing_date, path = max(candidates)
+        analysis_path = path.with_name(path.stem + "_analysis.json")
+        try:
+            analysis = json.loads(analysis_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            analysis = None
+        return {"date": filing_date, "text": path.read_text(encoding="utf-8"), "analysis": analysis}
+
+    def _analysis_path(self, ticker: str, filing_date: str, filing_url: str,
+                       fingerprint: str | None) -> Path:
+        suffix = f"_{fingerprint}" if fingerprint else ""
+        return self.directory / f"{_analysis_key(ticker, filing_date, filing_url)}{suffix}.json"
+
+    def get_analysis(self, ticker: str, filing_date: str, filing_url: str,
+                     fingerprint: str | None = None) -> dict | None:
+        path = self._analysis_path(ticker, filing_date, filing_url, fingerprint)
+        if path.exists():
+            try:
+                return json.loads(path.read_text(encoding="utf-8"))
+            except Exception:
+                return None
+        return None
+
+    def save_analysis(self, ticker: str, filing_date: str, filing_url: str, result: dict,
+                      fingerprint: str = ""):
+        content = json.dumps(result, indent=2)
+        # Unsuffixed file is always the latest; suffixed copies keep old inputs queryable
+        _atomic_write(self._analysis_path(ticker, filing_date, filing_url, None), content)
+        if fingerprint:
+            _atomic_write(self._analysis_path(ticker, filing_date, filing_url, fingerprint), content)
+
+    def analysis_history(self, ticker: str) -> list[dict]:
+        entries = []
+        for path in self.directory.glob(f"{ticker.upper()}_*_analysis_*.json"):
+            try:
+                result = json.loads(path.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            entries.append({"filing_date": result.get("date"), "url": None,
+                            "fingerprint": path.stem.rsplit("_", 1)[-1],
+                            "created_at": path.stat().st_mtime, "result": result})
+        return sorted(entries, key=lambda e: (e["filing_date"] or "", e["created_at"]), reverse=True)
+
+    def analyses_version(self) -> tuple:
+        mtimes = [p.stat().st_mtime_ns for p in self.directory.glob("*_analysis*.json")]
+        return len(mtimes), max(mtimes, default=0)
+
+    def get_chunk_evidence(self, key: str) -> list | None:
+        path = CHUNKS_DIR / f"{key}.json"
         try:
             return json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
+        except (OSError, ValueError):
             return None
+
+    def save_chunk_evidence(self, key: str, evidence: list):
+        CHUNKS_DIR.mkdir(exist_ok=True)
+        _atomic_write(CHUNKS_DIR / f"{key}.json", json.dumps(evidence))
+
+    def stats(self) -> dict:
+        files = list(self.directory.glob("*.txt"))
+        analyses = list(self.directory.glob("*_analysis.json"))
+        chunks = list(CHUNKS_DIR.glob("*.json")) if CHUNKS_DIR.exists() else []
+        return {
+            "cached_filings": len(files),
+            "cached_analyses": len(analyses),
+            "chunk_evidence": len(chunks),
+        }
+
+    def clear_ticker(self, ticker: str) -> int:
+        removed = 0
+        for directory in (self.directory, RAW_DIR):
+            for f in directory.glob(f"{ticker.upper()}_*"):
+                if f.is_file():
+                    f.unlink()
+                    removed += 1
+        return removed
+
+    def track_raw(self, ticker: str, filing_date: str, filing_url: str, path: Path):
+        pass  # the directory is the index
+
+    def touch_raw(self, ticker: str, filing_date: str, filing_url: str):
+        for path in _raw_paths(ticker, filing_date, filing_url):
+            if path.exists():
+                os.utime(path)
+
+    def gc(self, max_bytes: int | None, max_age_days: float | None,
+           analysis_max_age_days: float | None) -> dict:
+        """Same policy as the SQLite backend, using mtimes from a directory scan."""
+        evicted = {"filings": 0, "raw_files": 0, "analyses": 0, "chunks": 0, "bytes_freed": 0}
+        now = time.time()
+        analyses = list(self.directory.glob("*_analysis*.json"))
+        chunks = list(CHUNKS_DIR.glob("*.json")) if CHUNKS_DIR.exists() else []
+        filings = list(self.directory.glob("*.txt"))
+        raw = list(RAW_DIR.glob("*.html.*")) if RAW_DIR.exists() else []
+
+        def drop(path: Path, kind: str):
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            evicted[kind] += 1
+            evicted["bytes_freed"] += size if kind not in ("analyses", "chunks") else 0
+
+        if analysis_max_age_days is not None:
+            for p in analyses:
+                if now - p.stat().st_mtime > analysis_max_age_days * 86400:
+                    drop(p, "analyses")
+            for p in chunks:
+                if now - p.stat().st_mtime > analysis_max_age_days * 86400:
+                    drop(p, "chunks")
+        entries = [(p.stat().st_mtime, p, "filings") for p in filings]
+        entries += [(p.stat().st_mtime, p, "raw_files") for p in raw]
+        entries.sort(key=lambda e: e[0])
+        total = sum(p.stat().st_size for _, p, _ in entries)
+        for mtime, p, kind in entries:
+            too_old = max_age_days is not None and now - mtime > max_age_days * 86400
+            too_big = max_bytes is not None and total > max_bytes
+            if not (too_old or too_big):
+                continue
+            total -= p.stat().st_size
+            drop(p, kind)
+        return evicted
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the configured cache backend, opening it on first use.
+
+    A brand-new SQLite cache imports any loose files already in .cache.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if CACHE_BACKEND == "files":
+                _backend = FileCache(CACHE_DIR)
+            else:
+                from sec_scanner.cache_sqlite import SQLiteCache
+                _backend = SQLiteCache(CACHE_DB)
+                _backend.stats()  # opens the database and creates the schema
+                if _backend.created:
+                    imported = _backend.import_directory(CACHE_DIR)
+                    if imported["filings"] or imported["analyses"]:
+                        print(f"  Imported {imported['filings']} filings and "
+                              f"{imported['analyses']} analyses from loose .cache files")
+        return _backend
+
+
+def migrate(directory: Path = CACHE_DIR) -> dict:
+    """Import loose cache files from directory into the SQLite cache."""
+    from sec_scanner.cache_sqlite import SQLiteCache
+    backend = get_backend()
+    if not isinstance(backend, SQLiteCache):
+        raise RuntimeError("migrate needs the sqlite cache backend (SEC_SCANNER_CACHE=sqlite)")
+    return backend.import_directory(directory)
+
+
+# ── Filing text cache ─────────────────────────────────────────────────────────
+
+@metrics.timed("cache.get_filing")
+def get_filing(ticker: str, filing_date: str, filing_url: str,
+               min_chars: int | None = None) -> str | None:
+    """Return cached filing text if available, else None.
+
+    Text saved as partial (only the start of the filing was downloaded)
+    counts only if it holds at least min_chars; by default only whole
+    filings are returned.
+    """
+    text = get_backend().get_filing(ticker, filing_date, filing_url, min_chars)
+    metrics.incr("cache.filing_hits" if text is not None else "cache.filing_misses")
+    return text
+
+
+@metrics.timed("cache.save_filing")
+def save_filing(ticker: str, filing_date: str, filing_url: str, text: str, partial: bool = False):
+    """Cache filing text; partial marks text cut short at download."""
+    get_backend().save_filing(ticker, filing_date, filing_url, text, partial)
+
+
+# ── Raw filing store ──────────────────────────────────────────────────────────
+
+def _raw_paths(ticker: str, filing_date: str, filing_url: str) -> list[Path]:
+    key = _filing_key(ticker, filing_date, filing_url)
+    return [RAW_DIR / f"{key}.html.zst", RAW_DIR / f"{key}.html.gz"]
+
+
+@contextmanager
+def raw_filing_writer(ticker: str, filing_date: str, filing_url: str):
+    """Yield a text stream that stores the raw filing compressed (zstd, else gzip).
+
+    The file only appears once the block exits cleanly, so an interrupted
+    download never leaves a truncated raw filing behind.
+    """
+    RAW_DIR.mkdir(exist_ok=True)
+    zst_path, gz_path = _raw_paths(ticker, filing_date, filing_url)
+    path = zst_path if zstandard else gz_path
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    try:
+        if zstandard:
+            raw = zstandard.ZstdCompressor(level=10).stream_writer(open(tmp, "wb"))
+            writer = io.TextIOWrapper(raw, encoding="utf-8")
+        else:
+            writer = gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6)
+        with writer:
+            yield writer
+        os.replace(tmp, path)
+        get_backend().track_raw(ticker, filing_date, filing_url, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def open_raw_filing(ticker: str, filing_date: str, filing_url: str):
+    """Return a text stream over the stored raw filing, or None if not stored."""
+    for path in _raw_paths(ticker, filing_date, filing_url):
+        if not path.exists():
+            continue
+        get_backend().touch_raw(ticker, filing_date, filing_url)
+        if path.suffix == ".zst":
+            if zstandard is None:
+                continue
+            return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")),
+                                    encoding="utf-8")
+        return gzip.open(path, "rt", encoding="utf-8")
     return None
 
 
-def save_analysis(ticker: str, filing_date: str, filing_url: str, result: dict):
-    """Cache analysis result to disk."""
-    path = CACHE_DIR / f"{_analysis_key(ticker, filing_date, filing_url)}.json"
-    path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+# ── Analysis result cache ─────────────────────────────────────────────────────
+
+def get_analysis(ticker: str, filing_date: str, filing_url: str,
+                 fingerprint: str | None = None) -> dict | None:
+    """Return cached analysis result if available, else None.
+
+    With a fingerprint, only an analysis made from exactly those inputs
+    (filing text, prompt, context, model) counts as a hit.
+    """
+    return get_backend().get_analysis(ticker, filing_date, filing_url, fingerprint)
+
+
+def save_analysis(ticker: str, filing_date: str, filing_url: str, result: dict,
+                  fingerprint: str = ""):
+    """Cache analysis result under the fingerprint of its inputs."""
+    get_backend().save_analysis(ticker, filing_date, filing_url, result, fingerprint)
+
+
+def analysis_history(ticker: str) -> list[dict]:
+    """Every cached analysis for a ticker, including ones from older inputs."""
+    return get_backend().analysis_history(ticker)
+
+
+def analyses_version() -> tuple:
+    """Changes whenever an analysis is saved, replaced or evicted."""
+    return get_backend().analyses_version()
+
+
+def get_chunk_evidence(key: str) -> list | None:
+    """Evidence extracted from one filing chunk, keyed by chunk + prompt hash."""
+    return get_backend().get_chunk_evidence(key)
+
+
+def save_chunk_evidence(key: str, evidence: list):
+    get_backend().save_chunk_evidence(key, evidence)
+
+
+def previous_filing(ticker: str, before: str) -> dict | None:
+    """Latest cached filing for ticker dated before `before`.
+
+    Returns {"date", "text", "analysis"}; analysis is None when that filing
+    was never analyzed (or the analysis was evicted).
+    """
+    return get_backend().previous_filing(ticker, before)
 
 
 def cache_stats() -> dict:
     """Return basic cache stats."""
-    files = list(CACHE_DIR.glob("*.txt"))
-    analyses = list(CACHE_DIR.glob("*_analysis.json"))
+    backend = get_backend()
     return {
-        "cached_filings": len(files),
-        "cached_analyses": len(analyses),
+        **backend.stats(),
+        "backend": backend.name,
         "cache_dir": str(CACHE_DIR),
     }
 
 
 def clear_ticker(ticker: str):
     """Remove all cached data for a specific ticker (force re-fetch)."""
-    removed = 0
-    for f in CACHE_DIR.glob(f"{ticker.upper()}_*"):
-        f.unlink()
-        removed += 1
-    return removed
+    return get_backend().clear_ticker(ticker)
+
+
+def gc_policy() -> dict:
+    """Eviction limits: the defaults, overridden by any stored with save_gc_policy."""
+    policy = {
+        "max_bytes": FILING_MAX_BYTES,
+        "max_age_days": FILING_MAX_AGE_DAYS,
+        "analysis_max_age_days": ANALYSIS_MAX_AGE_DAYS,
+    }
+    try:
+        stored = json.loads(GC_POLICY_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        stored = {}
+    if isinstance(stored, dict):
+        policy.update({k: v for k, v in stored.items() if k in policy})
+    return policy
+
+
+def save_gc_policy(**limits) -> dict:
+    """Store eviction limits (max_bytes, max_age_days, analysis_max_age_days; None
+    disables one) on top of the current policy and return the result."""
+    policy = {**gc_policy(), **limits}
+    _atomic_write(GC_POLICY_PATH, json.dumps(policy, indent=2))
+    return policy
+
+
+def gc(**limits) -> dict:
+    """Evict filings older than max_age_days (by last access), then least
+    recently used filings until text + raw HTML fit in max_bytes, and
+    analyses / chunk evidence older than analysis_max_age_days.
+
+    Limits not passed come from gc_policy(); None disables a limit.
+    """
+    policy = {**gc_policy(), **limits}
+    return get_backend().gc(policy["max_bytes"], policy["max_age_days"], policy["analysis_max_age_days"])
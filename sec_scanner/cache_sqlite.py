@@ -0,0 +1,463 @@
+"""SQLite cache backend — one WAL-mode file, compressed content-addressed filing text."""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash         TEXT PRIMARY KEY,     -- sha256 of the uncompressed text
+    data         BLOB NOT NULL,        -- zlib-compressed UTF-8
+    size         INTEGER NOT NULL,     -- uncompressed bytes
+    stored_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS filings (
+    ticker      TEXT NOT NULL,
+    filing_date TEXT NOT NULL,
+    url_hash    TEXT NOT NULL,
+    url         TEXT,                  -- NULL for entries migrated from loose files
+    hash        TEXT NOT NULL REFERENCES blobs(hash),
+    created_at  REAL NOT NULL,
+    last_access REAL,
+    partial     INTEGER NOT NULL DEFAULT 0,  -- 1 if only the start of the filing was downloaded
+    PRIMARY KEY (ticker, filing_date, url_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_filings_hash ON filings(hash);
+
+-- Raw HTML lives in files under .cache/raw; this indexes them for eviction
+CREATE TABLE IF NOT EXISTS raw_files (
+    ticker      TEXT NOT NULL,
+    filing_date TEXT NOT NULL,
+    url_hash    TEXT NOT NULL,
+    path        TEXT NOT NULL,
+    bytes       INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (ticker, filing_date, url_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_raw_last_access ON raw_files(last_access);
+
+-- Counters kept by triggers so stats never scan a table
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats VALUES ('filings', 0), ('analyses', 0), ('blobs', 0), ('blob_bytes', 0),
+                                   ('raw_bytes', 0), ('chunks', 0);
+CREATE TRIGGER IF NOT EXISTS filings_ins AFTER INSERT ON filings
+    BEGIN UPDATE stats SET value = value + 1 WHERE name = 'filings'; END;
+CREATE TRIGGER IF NOT EXISTS filings_del AFTER DELETE ON filings
+    BEGIN UPDATE stats SET value = value - 1 WHERE name = 'filings'; END;
+CREATE TRIGGER IF NOT EXISTS blobs_ins AFTER INSERT ON blobs BEGIN
+    UPDATE stats SET value = value + 1 WHERE name = 'blobs';
+    UPDATE stats SET value = value + NEW.stored_bytes WHERE name = 'blob_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS blobs_del AFTER DELETE ON blobs BEGIN
+    UPDATE stats SET value = value - 1 WHERE name = 'blobs';
+    UPDATE stats SET value = value - OLD.stored_bytes WHERE name = 'blob_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS raw_ins AFTER INSERT ON raw_files
+    BEGIN UPDATE stats SET value = value + NEW.bytes WHERE name = 'raw_bytes'; END;
+CREATE TRIGGER IF NOT EXISTS raw_del AFTER DELETE ON raw_files
+    BEGIN UPDATE stats SET value = value - OLD.bytes WHERE name = 'raw_bytes'; END;
+CREATE TRIGGER IF NOT EXISTS raw_upd AFTER UPDATE OF bytes ON raw_files
+    BEGIN UPDATE stats SET value = value - OLD.bytes + NEW.bytes WHERE name = 'raw_bytes'; END;
+
+-- Map-step evidence from chunked analysis, keyed by the hash of the chunk and its prompt
+CREATE TABLE IF NOT EXISTS chunk_evidence (
+    hash          TEXT PRIMARY KEY,
+    evidence_json TEXT NOT NULL,
+    created_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunk_evidence_created ON chunk_evidence(created_at);
+CREATE TRIGGER IF NOT EXISTS chunks_ins AFTER INSERT ON chunk_evidence
+    BEGIN UPDATE stats SET value = value + 1 WHERE name = 'chunks'; END;
+CREATE TRIGGER IF NOT EXISTS chunks_del AFTER DELETE ON chunk_evidence
+    BEGIN UPDATE stats SET value = value - 1 WHERE name = 'chunks'; END;
+"""
+
+# One row per distinct set of analysis inputs; fingerprint is '' for entries
+# written before fingerprints existed
+ANALYSES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker      TEXT NOT NULL,
+    filing_date TEXT NOT NULL,
+    url_hash    TEXT NOT NULL,
+    url         TEXT,
+    fingerprint TEXT NOT NULL DEFAULT '',
+    result_json TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    UNIQUE (ticker, filing_date, url_hash, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_ticker ON analyses(ticker, filing_date);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses(created_at);
+"""
+ANALYSES_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS analyses_ins AFTER INSERT ON analyses
+    BEGIN UPDATE stats SET value = value + 1 WHERE name = 'analyses'; END;
+CREATE TRIGGER IF NOT EXISTS analyses_del AFTER DELETE ON analyses
+    BEGIN UPDATE stats SET value = value - 1 WHERE name = 'analyses'; END;
+"""
+
+
+def _upgrade(conn: sqlite3.Connection):
+    """Bring databases created by older versions up to the current schema."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(filings)")}
+    if "last_access" not in columns:
+        conn.execute("ALTER TABLE filings ADD COLUMN last_access REAL")
+    conn.execute("UPDATE filings SET last_access = created_at WHERE last_access IS NULL")
+    if "partial" not in columns:
+        conn.execute("ALTER TABLE filings ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_filings_last_access ON filings(last_access)")
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(analyses)")}
+    if columns and "fingerprint" not in columns:
+        # The unique key changes, which SQLite can only do by rebuilding the
+        # table. Triggers are dropped first so the copy leaves counters alone.
+        conn.executescript("""
+            BEGIN;
+            DROP TRIGGER IF EXISTS analyses_ins;
+            DROP TRIGGER IF EXISTS analyses_del;
+            DROP INDEX IF EXISTS idx_analyses_ticker;
+            DROP INDEX IF EXISTS idx_analyses_created;
+            ALTER TABLE analyses RENAME TO analyses_old;
+        """ + ANALYSES_SCHEMA + """
+            INSERT INTO analyses (id, ticker, filing_date, url_hash, url, result_json, created_at)
+                SELECT id, ticker, filing_date, url_hash, url, result_json, created_at FROM analyses_old;
+            DROP TABLE analyses_old;
+            COMMIT;
+        """)
+    else:
+        conn.executescript(ANALYSES_SCHEMA)
+    conn.executescript(ANALYSES_TRIGGERS)
+
+
+# TICKER_YYYY-MM-DD_urlhash.txt / TICKER_YYYY-MM-DD_urlhash_analysis[_fingerprint].json
+_LEGACY_NAME_RE = re.compile(
+    r"^(?P<ticker>[A-Z0-9.\-]+)_(?P<date>\d{4}-\d{2}-\d{2})_(?P<url_hash>[0-9a-f]{8})"
+    r"(?P<analysis>_analysis(?:_(?P<fingerprint>[0-9a-f]{16}))?\.json|\.txt)$"
+)
+
+
+def url_hash(filing_url: str) -> str:
+    return hashlib.md5(filing_url.encode()).hexdigest()[:8]
+
+
+class SQLiteCache:
+    """Filing text and analysis results in a single SQLite database.
+
+    Filing text is stored once per distinct content (sha256) and zlib
+    compressed; filings rows point at it. Each write is one transaction,
+    so a killed run leaves either the old row or the new one. Connections
+    are per thread; WAL lets readers proceed while a writer commits.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.created = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._init_lock:
+                if not self._initialized:
+                    self.created = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE name = 'filings'").fetchone() is None
+                    conn.executescript(SCHEMA)
+                    _upgrade(conn)
+                    self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    # ── Filing text ───────────────────────────────────────────────────────────
+
+    def _put_blob(self, conn: sqlite3.Connection, text: str) -> str:
+        raw = text.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+            data = zlib.compress(raw, 6)
+            conn.execute("INSERT OR IGNORE INTO blobs (hash, data, size, stored_bytes) VALUES (?, ?, ?, ?)",
+                         (digest, data, len(raw), len(data)))
+        return digest
+
+    def _release_blob(self, conn: sqlite3.Connection, digest: str):
+        """Delete a blob once no filing points at it."""
+        conn.execute("DELETE FROM blobs WHERE hash = ? AND NOT EXISTS "
+                     "(SELECT 1 FROM filings WHERE hash = ?)", (digest, digest))
+
+    def _drop_orphan_blobs(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM filings)")
+
+    def get_filing(self, ticker: str, filing_date: str, filing_url: str,
+                   min_chars: int | None = None) -> str | None:
+        conn = self._conn()
+        key = (ticker.upper(), filing_date, url_hash(filing_url))
+        row = conn.execute(
+            "SELECT b.data, f.partial FROM filings f JOIN blobs b ON b.hash = f.hash "
+            "WHERE f.ticker = ? AND f.filing_date = ? AND f.url_hash = ?", key,
+        ).fetchone()
+        if row is None:
+            return None
+        text = zlib.decompress(row[0]).decode("utf-8")
+        if row[1] and (min_chars is None or len(text) < min_chars):
+            return None
+        conn.execute("UPDATE filings SET last_access = ? WHERE ticker = ? AND filing_date = ? AND url_hash = ?",
+                     (time.time(), *key))
+        return text
+
+    def save_filing(self, ticker: str, filing_date: str, filing_url: str, text: str,
+                    partial: bool = False):
+        conn = self._conn()
+        key = (ticker.upper(), filing_date, url_hash(filing_url))
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            old = conn.execute("SELECT hash FROM filings WHERE ticker = ? AND filing_date = ? AND url_hash = ?",
+                               key).fetchone()
+            digest = self._put_blob(conn, text)
+            conn.execute(
+                "INSERT INTO filings (ticker, filing_date, url_hash, url, hash, created_at, last_access, partial) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (ticker, filing_date, url_hash) DO UPDATE "
+                "SET url = excluded.url, hash = excluded.hash, created_at = excluded.created_at, "
+                "last_access = excluded.last_access, partial = excluded.partial",
+                (*key, filing_url, digest, now, now, int(partial)),
+            )
+            if old and old[0] != digest:
+                self._release_blob(conn, old[0])
+
+    def previous_filing(self, ticker: str, before: str) -> dict | None:
+        """Most recent wholly cached filing dated before `before`, with its latest analysis."""
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT f.filing_date, f.url_hash, b.data FROM filings f JOIN blobs b ON b.hash = f.hash "
+            "WHERE f.ticker = ? AND f.filing_date < ? AND NOT f.partial ORDER BY f.filing_date DESC LIMIT 1",
+            (ticker.upper(), before),
+        ).fetchone()
+        if row is None:
+            return None
+        analysis = conn.execute(
+            "SELECT result_json FROM analyses WHERE ticker = ? AND filing_date = ? AND url_hash = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT 1", (ticker.upper(), row[0], row[1]),
+        ).fetchone()
+        return {"date": row[0], "text": zlib.decompress(row[2]).decode("utf-8"),
+                "analysis": json.loads(analysis[0]) if analysis else None}
+
+    # ── Analyses ──────────────────────────────────────────────────────────────
+
+    def get_analysis(self, ticker: str, filing_date: str, filing_url: str,
+                     fingerprint: str | None = None) -> dict | None:
+        """Latest analysis of a filing, or only one made from the given inputs."""
+        sql = "SELECT result_json FROM analyses WHERE ticker = ? AND filing_date = ? AND url_hash = ?"
+        params = [ticker.upper(), filing_date, url_hash(filing_url)]
+        if fingerprint is not None:
+            sql += " AND fingerprint = ?"
+            params.append(fingerprint)
+        row = self._conn().execute(sql + " ORDER BY created_at DESC, id DESC LIMIT 1", params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_analysis(self, ticker: str, filing_date: str, filing_url: str, result: dict,
+                      fingerprint: str = ""):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO analyses (ticker, filing_date, url_hash, url, fingerprint, result_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (ticker, filing_date, url_hash, fingerprint) DO UPDATE "
+                "SET url = excluded.url, result_json = excluded.result_json, created_at = excluded.created_at",
+                (ticker.upper(), filing_date, url_hash(filing_url), filing_url, fingerprint,
+                 json.dumps(result), time.time()),
+            )
+
+    def analysis_history(self, ticker: str) -> list[dict]:
+        """Every stored analysis for a ticker, newest first, stale ones included."""
+        rows = self._conn().execute(
+            "SELECT filing_date, url, fingerprint, created_at, result_json FROM analyses "
+            "WHERE ticker = ? ORDER BY filing_date DESC, created_at DESC", (ticker.upper(),)).fetchall()
+        return [{"filing_date": d, "url": u, "fingerprint": fp, "created_at": c, "result": json.loads(r)}
+                for d, u, fp, c, r in rows]
+
+    def analyses_version(self) -> tuple:
+        # Upserts keep their id but bump created_at, so both are needed
+        return tuple(self._conn().execute(
+            "SELECT COUNT(*), coalesce(MAX(id), 0), coalesce(MAX(created_at), 0) FROM analyses").fetchone())
+
+    # ── Chunk evidence ────────────────────────────────────────────────────────
+
+    def get_chunk_evidence(self, key: str) -> list | None:
+        row = self._conn().execute("SELECT evidence_json FROM chunk_evidence WHERE hash = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_chunk_evidence(self, key: str, evidence: list):
+        self._conn().execute(
+            "INSERT INTO chunk_evidence (hash, evidence_json, created_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (hash) DO UPDATE SET evidence_json = excluded.evidence_json, "
+            "created_at = excluded.created_at",
+            (key, json.dumps(evidence), time.time()),
+        )
+
+    # ── Maintenance ───────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        counts = dict(self._conn().execute("SELECT name, value FROM stats").fetchall())
+        return {
+            "cached_filings": counts.get("filings", 0),
+            "cached_analyses": counts.get("analyses", 0),
+            "unique_texts": counts.get("blobs", 0),
+            "stored_bytes": counts.get("blob_bytes", 0),
+            "raw_bytes": counts.get("raw_bytes", 0),
+            "chunk_evidence": counts.get("chunks", 0),
+        }
+
+    def clear_ticker(self, ticker: str) -> int:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            removed = conn.execute("DELETE FROM filings WHERE ticker = ?", (ticker.upper(),)).rowcount
+            removed += conn.execute("DELETE FROM analyses WHERE ticker = ?", (ticker.upper(),)).rowcount
+            raw = conn.execute("DELETE FROM raw_files WHERE ticker = ? RETURNING path", (ticker.upper(),)).fetchall()
+            self._drop_orphan_blobs(conn)
+        for (path,) in raw:
+            Path(path).unlink(missing_ok=True)
+        return removed + len(raw)
+
+    # ── Raw HTML index ────────────────────────────────────────────────────────
+
+    def track_raw(self, ticker: str, filing_date: str, filing_url: str, path: Path):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO raw_files (ticker, filing_date, url_hash, path, bytes, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (ticker, filing_date, url_hash) DO UPDATE "
+                "SET path = excluded.path, bytes = excluded.bytes, last_access = excluded.last_access",
+                (ticker.upper(), filing_date, url_hash(filing_url), str(path), path.stat().st_size, time.time()),
+            )
+
+    def touch_raw(self, ticker: str, filing_date: str, filing_url: str):
+        self._conn().execute(
+            "UPDATE raw_files SET last_access = ? WHERE ticker = ? AND filing_date = ? AND url_hash = ?",
+            (time.time(), ticker.upper(), filing_date, url_hash(filing_url)),
+        )
+
+    # ── Eviction ──────────────────────────────────────────────────────────────
+
+    def gc(self, max_bytes: int | None, max_age_days: float | None,
+           analysis_max_age_days: float | None) -> dict:
+        """Evict filings (text + raw HTML) by age, then LRU until under max_bytes.
+
+        Analyses and chunk evidence follow their own age limit — they cost a
+        Claude call to rebuild, so they usually outlive the re-downloadable
+        filing text.
+        Driven entirely by the last_access / created_at indexes.
+        """
+        conn = self._conn()
+        evicted = {"filings": 0, "raw_files": 0, "analyses": 0, "chunks": 0, "bytes_freed": 0}
+        before = self._stored_total(conn)
+        now = time.time()
+
+        def evict(key: tuple):
+            row = conn.execute("DELETE FROM filings WHERE ticker = ? AND filing_date = ? AND url_hash = ? "
+                               "RETURNING hash", key).fetchone()
+            if row:
+                self._release_blob(conn, row[0])
+                evicted["filings"] += 1
+            raw = conn.execute("DELETE FROM raw_files WHERE ticker = ? AND filing_date = ? AND url_hash = ? "
+                               "RETURNING path", key).fetchone()
+            if raw:
+                Path(raw[0]).unlink(missing_ok=True)
+                evicted["raw_files"] += 1
+
+        if max_age_days is not None:
+            cutoff = now - max_age_days * 86400
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for key in conn.execute(
+                        "SELECT ticker, filing_date, url_hash FROM filings WHERE last_access < ? "
+                        "UNION SELECT ticker, filing_date, url_hash FROM raw_files WHERE last_access < ?",
+                        (cutoff, cutoff)).fetchall():
+                    evict(key)
+
+        while max_bytes is not None and self._stored_total(conn) > max_bytes:
+            # Oldest entries from each index; a filing and its raw HTML go together
+            candidates = conn.execute(
+                "SELECT ticker, filing_date, url_hash, last_access FROM filings "
+                "ORDER BY last_access LIMIT 20").fetchall()
+            candidates += conn.execute(
+                "SELECT ticker, filing_date, url_hash, last_access FROM raw_files "
+                "ORDER BY last_access LIMIT 20").fetchall()
+            if not candidates:
+                break
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for row in sorted(candidates, key=lambda r: r[3]):
+                    evict(row[:3])
+                    if self._stored_total(conn) <= max_bytes:
+                        break
+
+        if analysis_max_age_days is not None:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                evicted["analyses"] = conn.execute(
+                    "DELETE FROM analyses WHERE created_at < ?",
+                    (now - analysis_max_age_days * 86400,)).rowcount
+                evicted["chunks"] = conn.execute(
+                    "DELETE FROM chunk_evidence WHERE created_at < ?",
+                    (now - analysis_max_age_days * 86400,)).rowcount
+
+        evicted["bytes_freed"] = max(0, before - self._stored_total(conn))
+        return evicted
+
+    def _stored_total(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT SUM(value) FROM stats WHERE name IN ('blob_bytes', 'raw_bytes')").fetchone()
+        return row[0] or 0
+
+    def import_directory(self, directory: Path) -> dict:
+        """Import loose .txt / _analysis.json files written by the file backend.
+
+        Existing rows win; unreadable or truncated files are skipped. The
+        source files are left in place.
+        """
+        imported = {"filings": 0, "analyses": 0, "skipped": 0}
+        conn = self._conn()
+        for path in sorted(Path(directory).iterdir()):
+            m = _LEGACY_NAME_RE.match(path.name)
+            if not m:
+                continue
+            key = (m["ticker"], m["date"], m["url_hash"])
+            try:
+                content = path.read_text(encoding="utf-8")
+                result = json.loads(content) if m["analysis"] != ".txt" else None
+            except (OSError, UnicodeDecodeError, ValueError):
+                imported["skipped"] += 1
+                continue
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if result is None:
+                    digest = self._put_blob(conn, content)
+                    mtime = path.stat().st_mtime
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO filings (ticker, filing_date, url_hash, hash, created_at, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", (*key, digest, mtime, mtime))
+                    imported["filings"] += cur.rowcount
+                else:
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO analyses "
+                        "(ticker, filing_date, url_hash, fingerprint, result_json, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (*key, m["fingerprint"] or "", json.dumps(result), path.stat().st_mtime))
+                    imported["analyses"] += cur.rowcount
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._drop_orphan_blobs(conn)  # texts whose filing row already existed
+        return imported
@@ -0,0 +1,218 @@
+"""Map-reduce analysis over the full cleaned filing, for disclosures past the prompt budget."""
+
+import zlib
+from concurrent.futures import CancelledError
+
+from sec_scanner.analyzer import (
+    RUBRIC, SINGLE_OUTPUT, _PROJECT_CONTEXT, _build_result, _cached_analysis, _context_block,
+    _parse_output, _sha256,
+)
+from sec_scanner.executor import get_executor
+from sec_scanner.sections import ai_term_count
+
+# Target chunk size; actual chunks run from half to twice this
+CHUNK_CHARS = 40_000
+# Trailing text of the previous chunk repeated at the start of the next
+CHUNK_OVERLAP = 2_000
+# Cap on the evidence digest sent to the reduce step
+REDUCE_MAX_CHARS = 100_000
+
+MAP_PROMPT_TEMPLATE = """You are extracting evidence about AI adoption from an excerpt of {ticker} — {company}'s SEC 10-K filing.
+
+List every statement in the excerpt about artificial intelligence, machine learning or related technology:
+named products, use cases, deployments, customers, partnerships, spending, revenue or cost impact,
+competitive claims, and generic risk-factor language.
+
+Output as JSON:
+{{"evidence": [{{"quote": "short verbatim quote", "kind": "product|financial|integration|moat|execution|risk|boilerplate", "note": "why it matters, one sentence"}}]}}
+
+If the excerpt says nothing about AI, output {{"evidence": []}}.
+
+IMPORTANT: Output ONLY the JSON object, no markdown code fences, no extra text.
+
+EXCERPT:
+{chunk}"""
+
+REDUCE_PROMPT_TEMPLATE = """You are analyzing a SEC 10-K filing for evidence of genuine AI adoption vs. AI washing.
+
+Company: {ticker} — {company}
+Filing date: {date}
+
+The full filing ({chars} chars) was read in {chunks} excerpts. Below is every AI-related statement
+found, in filing order, tagged by kind. Excerpts with nothing about AI are omitted. Judge the
+company on this evidence as you would on the filing itself.
+
+""" + RUBRIC + """
+
+""" + SINGLE_OUTPUT + """
+
+EVIDENCE:
+{evidence}"""
+
+
+def split_chunks(text: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split text into overlapping chunks on paragraph boundaries.
+
+    Boundaries are content-defined: past the minimum size, a paragraph ends
+    a chunk when its hash says so, not at a fixed offset. An edit therefore
+    only changes the chunks around it and later chunks line up again, so an
+    amended filing re-uses most cached chunk evidence.
+    """
+    low, high = chunk_chars // 2, chunk_chars * 2
+    paragraphs = []
+    for p in text.split("\n"):
+        if p.strip():
+            paragraphs.extend(p[i:i + high] for i in range(0, len(p), high))
+
+    groups: list[list[str]] = []
+    current: list[str] = []
+    size = 0
+    for p in paragraphs:
+        current.append(p)
+        size += len(p) + 1
+        # Chance of a cut grows with paragraph length: ~chunk_chars on average
+        if size >= high or (size >= low and zlib.crc32(p.encode("utf-8")) % low < len(p)):
+            groups.append(current)
+            current, size = [], 0
+    if current:
+        groups.append(current)
+
+    chunks = []
+    for n, group in enumerate(groups):
+        lead: list[str] = []
+        if n and overlap:
+            carried = 0
+            for p in reversed(groups[n - 1]):
+                if carried + len(p) > overlap:
+                    break
+                lead.insert(0, p)
+                carried += len(p) + 1
+        chunks.append("\n".join(lead + group))
+    return chunks
+
+
+def _chunk_key(filing: dict, chunk: str) -> str:
+    return _sha256("|".join([filing["ticker"].upper(), _sha256(chunk), _sha256(MAP_PROMPT_TEMPLATE),
+                             _sha256(get_executor().version())]))
+
+
+def chunked_fingerprint(filing: dict) -> str:
+    """Like analysis_fingerprint, over the full text and the map/reduce prompts."""
+    parts = [
+        _sha256(filing.get("full_text") or filing["text"]),
+        _sha256(MAP_PROMPT_TEMPLATE + REDUCE_PROMPT_TEMPLATE),
+        _sha256(_PROJECT_CONTEXT),
+        _sha256(get_executor().version()),
+    ]
+    return _sha256("|".join(parts))[:16]
+
+
+def _map(filing: dict, chunks: list[str]) -> list[list] | None:
+    """Evidence per chunk, from the cache or parallel Claude calls. None if any call failed."""
+    from sec_scanner.cache import get_chunk_evidence, save_chunk_evidence
+
+    ticker = filing["ticker"]
+    claude = get_executor()
+    evidence: list[list | None] = [None] * len(chunks)
+    futures = {}
+    reused = 0
+    for n, chunk in enumerate(chunks):
+        if not ai_term_count(chunk):
+            evidence[n] = []  # nothing for Claude to find
+            continue
+        cached = get_chunk_evidence(_chunk_key(filing, chunk))
+        if cached is not None:
+            evidence[n] = cached
+            reused += 1
+            continue
+        prompt = MAP_PROMPT_TEMPLATE.format(ticker=ticker, company=filing["company"], chunk=chunk)
+        futures[n] = claude.submit(prompt, label=f"{ticker} chunk {n + 1}/{len(chunks)}")
+
+    print(f"  [{ticker}] Chunked analysis: {len(chunks)} chunks, {len(futures)} to extract, "
+          f"{reused} cached")
+
+    failed = 0
+    for n, future in futures.items():
+        try:
+            output = future.result()
+        except (CancelledError, RuntimeError):
+            output = None
+        parsed = _parse_output(output, f"{ticker} chunk {n + 1}") if output is not None else None
+        items = parsed.get("evidence") if isinstance(parsed, dict) else None
+        if not isinstance(items, list):
+            failed += 1
+            continue
+        items = [i for i in items if isinstance(i, dict) and i.get("quote")]
+        save_chunk_evidence(_chunk_key(filing, chunks[n]), items)
+        evidence[n] = items
+
+    if failed:
+        # Successful chunks are cached, so a re-run only repeats the failures
+        print(f"  [{ticker}] ERROR: evidence extraction failed for {failed} of {len(futures)} chunks")
+        return None
+    return evidence
+
+
+def _digest(evidence: list[list]) -> str:
+    lines = []
+    seen = set()
+    for items in evidence:
+        for item in items:
+            quote = " ".join(str(item["quote"]).split())
+            if quote.lower() in seen:  # overlapping chunks repeat quotes
+                continue
+            seen.add(quote.lower())
+            note = f" — {item['note']}" if item.get("note") else ""
+            lines.append(f"- [{item.get('kind', 'other')}] \"{quote}\"{note}")
+
+    out = []
+    used = 0
+    for line in lines:
+        if used + len(line) > REDUCE_MAX_CHARS:
+            out.append(f"- ({len(lines) - len(out)} further statements omitted)")
+            break
+        out.append(line)
+        used += len(line) + 1
+    return "\n".join(out) or "(no AI-related statements found anywhere in the filing)"
+
+
+def analyze_chunked(filing: dict, reanalyze_if_stale: bool = False) -> dict | None:
+    """Analyze the whole cleaned filing: per-chunk evidence (map), then one scoring call (reduce).
+
+    Returns the same result shape as analyze_filing, or None on failure.
+    """
+    from sec_scanner.cache import save_analysis
+
+    fingerprint = chunked_fingerprint(filing)
+    cached = _cached_analysis(filing, reanalyze_if_stale, [fingerprint], mode="chunked")
+    if cached:
+        return cached
+
+    text = filing.get("full_text") or filing["text"]
+    chunks = split_chunks(text)
+    evidence = _map(filing, chunks)
+    if evidence is None:
+        return None
+
+    prompt = _context_block() + REDUCE_PROMPT_TEMPLATE.format(
+        ticker=filing["ticker"],
+        company=filing["company"],
+        date=filing["date"],
+        chars=len(text),
+        chunks=len(chunks),
+        evidence=_digest(evidence),
+    )
+    print(f"  [{filing['ticker']}] Running Claude analysis over {sum(len(e) for e in evidence)} evidence items...")
+
+    output = get_executor().run(prompt, label=filing["ticker"])
+    if output is None:
+        return None
+    parsed = _parse_output(output, filing["ticker"])
+    if parsed is None:
+        return None
+
+    result = _build_result(filing, parsed)
+    result["mode"] = "chunked"
+    save_analysis(filing["ticker"], filing["date"], filing.get("url", ""), result, fingerprint=fingerprint)
+    print(f"  [{filing['ticker']}] Analysis cached")
+    return result
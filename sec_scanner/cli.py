@@ -1,14 +1,26 @@
 """CLI entry point: sec-scanner MSFT NVDA AAPL"""
 
 import argparse
+import json
+import os
 import sys
+import threading
 import time
+from functools import partial
+
 import requests
 
 from sec_scanner.fetcher import fetch_filing
-from sec_scanner.analyzer import analyze_filing
+from sec_scanner.analyzer import BATCH_CHARS, analyze_batch, analyze_filing
 from sec_scanner.reporter import generate_report
-from sec_scanner.history import save_result, get_history, get_trend
+from sec_scanner.history import HistoryWriter, save_results, get_history, get_trend, get_trends, trend_with
+from sec_scanner.chunked import analyze_chunked
+from sec_scanner.incremental import analyze_incremental
+from sec_scanner.journal import Journal, latest_run_id
+from sec_scanner.pipeline import run_pipeline
+from sec_scanner.prescreen import DEFAULT_MIN_HITS, TRIAGE_MIN_HITS, prescreen, screened, screened_batch
+from sec_scanner import executor, metrics, session
+from sec_scanner.sections import DEFAULT_CHAR_BUDGET, DEFAULT_ITEMS
 
 WORKLOG_URL = "http://localhost:8092/api/log"
 WORKLOG_KEY = "wl-justin-2026"
@@ -29,7 +41,369 @@ def log_to_worklog(tickers, results, elapsed_hours):
         pass
 
 
-def main():
+def collect_tickers(args) -> list[str]:
+    """Tickers from the command line, --watchlist and --file, upper-cased and deduplicated in order."""
+    tickers = list(args.tickers) if args.tickers else []
+    if args.watchlist:
+        wl_path = os.path.join(os.getcwd(), "watchlist.txt")
+        if not os.path.exists(wl_path):
+            wl_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "watchlist.txt")
+        if os.path.exists(wl_path):
+            with open(wl_path) as f:
+                for line in f:
+                    t = line.strip().upper()
+                    if t and not t.startswith("#"):
+                        tickers.append(t)
+            print(f"  Loaded {len(tickers)} tickers from watchlist.txt")
+        else:
+            print("ERROR: watchlist.txt not found")
+            sys.exit(1)
+    if args.file:
+        with open(args.file) as f:
+            for line in f:
+                t = line.strip().upper()
+                if t and not t.startswith("#"):
+                    tickers.append(t)
+
+    # Deduplicate while preserving order
+    return list(dict.fromkeys(t.upper() for t in tickers))
+
+
+def _parse_size(value: str) -> int:
+    """Parse a byte size like 500M or 2G."""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    value = value.strip().upper().rstrip("B")
+    try:
+        if value and value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r} (use e.g. 500M, 2G)")
+
+
+def _parse_limit(parse):
+    """Argument type for an eviction limit: parse(value), or None for "none"/"off"."""
+    def limit(value: str):
+        if value.strip().lower() in ("none", "off"):
+            return None
+        return parse(value)
+    return limit
+
+
+def _print_gc(evicted: dict):
+    print(f"  Evicted {evicted['filings']} filings, {evicted['raw_files']} raw files, "
+          f"{evicted['analyses']} analyses and {evicted['chunks']} chunk evidence entries "
+          f"({evicted['bytes_freed'] / 1024 ** 2:.1f} MB freed)")
+
+
+def cache_command(argv: list[str]):
+    """sec-scanner cache {stats,migrate,clear,gc} — inspect and maintain the cache."""
+    from sec_scanner import cache
+
+    parser = argparse.ArgumentParser(
+        prog="sec-scanner cache",
+        description="Inspect and maintain the filing/analysis cache",
+    )
+    sub = parser.add_subparsers(dest="action", required=True)
+    sub.add_parser("stats", help="Show cache size and entry counts")
+    sub.add_parser("migrate", help="Import loose .cache files into the SQLite cache")
+    history = sub.add_parser("analyses", help="List every cached analysis for a ticker, stale ones included")
+    history.add_argument("ticker")
+    clear = sub.add_parser("clear", help="Drop cached filings and analyses for a ticker")
+    clear.add_argument("ticker")
+    gc = sub.add_parser("gc", help="Evict old / least recently used cache entries",
+                        description="Evict cache entries. Limits given here are stored and also "
+                                    "used by the automatic gc after each scan; \"none\" disables one.")
+    gc.add_argument("--max-bytes", type=_parse_limit(_parse_size), default=argparse.SUPPRESS,
+                    help="Cap on filing text + raw HTML, e.g. 500M or 2G (default: 2G)")
+    gc.add_argument("--max-age-days", type=_parse_limit(float), default=argparse.SUPPRESS,
+                    help=f"Evict filings not used for this many days (default: {cache.FILING_MAX_AGE_DAYS})")
+    gc.add_argument("--analysis-max-age-days", type=_parse_limit(float), default=argparse.SUPPRESS,
+                    help=f"Evict analyses older than this (default: {cache.ANALYSIS_MAX_AGE_DAYS})")
+    args = parser.parse_args(argv)
+
+    if args.action == "stats":
+        for key, value in cache.cache_stats().items():
+            print(f"  {key}: {value}")
+        for key, value in cache.gc_policy().items():
+            print(f"  gc {key}: {'none' if value is None else value}")
+    elif args.action == "migrate":
+        imported = cache.migrate()
+        print(f"  Imported {imported['filings']} filings and {imported['analyses']} analyses "
+              f"({imported['skipped']} unreadable files skipped)")
+    elif args.action == "analyses":
+        entries = cache.analysis_history(args.ticker)
+        if not entries:
+            print(f"No cached analyses for {args.ticker.upper()}")
+        for e in entries:
+            r = e["result"]
+            print(f"  {e['filing_date']}  Score: {r.get('score', 0):3d}/100  {r.get('verdict', '')}  "
+                  f"[inputs {e['fingerprint'] or 'unknown'}]")
+    elif args.action == "clear":
+        removed = cache.clear_ticker(args.ticker)
+        print(f"  Removed {removed} cached entries for {args.ticker.upper()}")
+    elif args.action == "gc":
+        given = {k: getattr(args, k) for k in ("max_bytes", "max_age_days", "analysis_max_age_days")
+                 if hasattr(args, k)}
+        if given:
+            cache.save_gc_policy(**given)
+            print(f"  Saved gc policy: {', '.join(f'{k}={v}' for k, v in given.items())}")
+        _print_gc(cache.gc())
+
+
+def report_command(argv: list[str]):
+    """sec-scanner report — rebuild the HTML report from stored results, no scanning."""
+    from sec_scanner.reporter import report_from_history
+
+    parser = argparse.ArgumentParser(
+        prog="sec-scanner report",
+        description="Build the report from the latest stored result per ticker",
+    )
+    parser.add_argument("tickers", nargs="*", help="Only these tickers (default: everything scanned)")
+    parser.add_argument("--output", "-o", default="report.html", help="Output HTML report path (default: report.html)")
+    parser.add_argument("--data-json", nargs="?", const="", metavar="PATH",
+                        help="Write results to a JSON file the report loads on open (default path: "
+                             "the report's name with .json)")
+    parser.add_argument("--verdict", action="append", metavar="VERDICT",
+                        help='Only this verdict, e.g. "Genuine AI Adopter" (repeatable)')
+    parser.add_argument("--min-score", type=int, metavar="N", help="Only scores of at least N")
+    parser.add_argument("--max-score", type=int, metavar="N", help="Only scores of at most N")
+    parser.add_argument("--style", action="append", choices=["verbose", "standard", "conservative"],
+                        help="Only this disclosure style (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Render even if nothing changed since last time")
+    args = parser.parse_args(argv)
+
+    data_path = None
+    if args.data_json is not None:
+        data_path = args.data_json or os.path.splitext(args.output)[0] + ".json"
+    start = time.perf_counter()
+    rendered = report_from_history(
+        args.output, data_path, force=args.force,
+        tickers=[t.upper() for t in args.tickers] or None, verdicts=args.verdict,
+        min_score=args.min_score, max_score=args.max_score, styles=args.style,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if rendered is None:
+        print(f"  {args.output} is up to date ({elapsed:.0f} ms)")
+    else:
+        print(f"  Report saved to: {args.output} — {rendered} companies ({elapsed:.0f} ms)")
+
+
+def watch_command(argv: list[str]):
+    """sec-scanner watch — poll EDGAR and analyze new 10-Ks as they are filed."""
+    import signal
+
+    from sec_scanner.watch import DEFAULT_INTERVAL, Watcher, serve_status
+
+    parser = argparse.ArgumentParser(
+        prog="sec-scanner watch",
+        description="Poll EDGAR for new 10-K filings and analyze only the companies that filed",
+    )
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols to watch")
+    parser.add_argument("--file", "-f", help="Read tickers from a file (one per line)")
+    parser.add_argument("--watchlist", "-w", action="store_true", help="Use watchlist.txt in the current directory")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, metavar="SECS",
+                        help=f"Seconds between polls (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--status-port", type=int, metavar="PORT",
+                        help="Serve GET /health and GET /status on 127.0.0.1:PORT")
+    parser.add_argument("--once", action="store_true", help="Poll once, analyze anything new and exit")
+    parser.add_argument("--baseline", action="store_true",
+                        help="Treat the filings on EDGAR at startup as seen; only analyze later ones")
+    parser.add_argument("--output", "-o", default="report.html", help="Report to refresh (default: report.html)")
+    parser.add_argument("--data-json", nargs="?", const="", metavar="PATH",
+                        help="Refresh the report with a JSON data sidecar (default path: the report's name with .json)")
+    parser.add_argument("--fetch-workers", type=int, default=2, metavar="N",
+                        help="Concurrent EDGAR requests (default: 2)")
+    parser.add_argument("--analyze-workers", type=int, default=2, metavar="N",
+                        help="Concurrent Claude analysis workers (default: 2)")
+    parser.add_argument("--prescreen-min-hits", type=int, default=DEFAULT_MIN_HITS, metavar="N",
+                        help="Score filings with fewer AI-term mentions as AI washing without Claude "
+                             "(default: 0, off)")
+    parser.add_argument("--claude-cmd", default=executor.CLAUDE_BIN, metavar="PATH",
+                        help="Claude wrapper to run (default: $SEC_SCANNER_CLAUDE or the built-in path)")
+    args = parser.parse_args(argv)
+
+    tickers = collect_tickers(args)
+    if not tickers:
+        parser.error("No tickers provided. Use: sec-scanner watch MSFT NVDA or sec-scanner watch --watchlist")
+
+    session.configure(pool_size=args.fetch_workers)
+    claude = executor.configure(cmd=[args.claude_cmd, *executor.CLAUDE_CMD[1:]],
+                                max_concurrency=args.analyze_workers)
+    data_path = None
+    if args.data_json is not None:
+        data_path = args.data_json or os.path.splitext(args.output)[0] + ".json"
+    watcher = Watcher(
+        tickers, fetch_filing, screened(analyze_filing, args.prescreen_min_hits), args.output, data_path,
+        interval=args.interval, fetch_workers=args.fetch_workers, analyze_workers=args.analyze_workers,
+        baseline=args.baseline,
+    )
+
+    def shutdown(signum, frame):
+        if watcher.status()["state"] == "stopping":
+            print("\n  Stopping now — cancelling Claude subprocesses...")
+            claude.cancel()
+            os._exit(130)
+        print("\n  Shutting down after in-flight analyses finish (signal again to force)...")
+        watcher.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    server = None
+    if args.status_port is not None:
+        server = serve_status(watcher, args.status_port)
+        print(f"  Status: http://127.0.0.1:{server.server_address[1]}/status")
+    try:
+        watcher.run(once=args.once)
+    finally:
+        if server:
+            server.shutdown()
+    print("  Watcher stopped.")
+
+
+def ingest_command(argv: list[str]):
+    """sec-scanner ingest — build the offline filing index from EDGAR bulk files."""
+    from sec_scanner.bulk import BULK_INDEX_PATH, ingest
+
+    parser = argparse.ArgumentParser(
+        prog="sec-scanner ingest",
+        description="Index the latest 10-K per ticker from a local submissions.zip or form.idx files, "
+                    "for use with --bulk-index",
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="submissions.zip, or one or more form.idx files")
+    args = parser.parse_args(argv)
+
+    print(f"  Reading {', '.join(args.paths)}...")
+    built = ingest(args.paths)
+    print(f"  Indexed the latest 10-K for {built['tickers']} tickers in {built['seconds']}s → {BULK_INDEX_PATH}")
+
+
+def backfill_command(tickers, fetch, analyze, analyze_batch, claude, args):
+    """Analyze every 10-K / 10-K/A from the last N years and record each at its filing date."""
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import date, timedelta
+
+    from sec_scanner.fetcher import get_cik, list_10k_filings
+    from sec_scanner.history import HistoryWriter, scanned_filings
+    from sec_scanner.reporter import report_from_history
+
+    since = (date.today() - timedelta(days=round(365.25 * args.backfill))).isoformat()
+    print(f"[1/3] Listing 10-K filings since {since} ({args.fetch_workers} fetch workers)...")
+
+    def list_filings(ticker):
+        try:
+            cik = get_cik(ticker)
+            if not cik:
+                print(f"  [{ticker}] ERROR: Could not find CIK")
+                return []
+            return list_10k_filings(cik, since)
+        except requests.RequestException as e:
+            print(f"  [{ticker}] ERROR: Could not list filings: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=args.fetch_workers) as pool:
+        listed = dict(zip(tickers, pool.map(list_filings, tickers)))
+
+    # Keyed "TICKER accession" so one ticker can have many filings in flight
+    scanned = scanned_filings(tickers)
+    jobs = {f"{t} {f['accession']}": (t, f) for t in tickers for f in listed[t] if (t, f["date"]) not in scanned}
+    found = sum(len(v) for v in listed.values())
+    print(f"  {found} filings found, {found - len(jobs)} already in history, {len(jobs)} to analyze\n")
+
+    print(f"[2/3] Fetching and analyzing ({args.analyze_workers} analysis workers)...\n")
+    analyzed = 0
+    writer = HistoryWriter()
+
+    def fetch_job(key):
+        ticker, f = jobs[key]
+        return fetch(ticker, latest=(f["url"], f["date"]))
+
+    def record(key, filing, result):
+        nonlocal analyzed
+        ticker, f = jobs[key]
+        if not filing:
+            print(f"  [{ticker} {f['date']}] SKIPPED — could not fetch filing")
+        elif not result:
+            print(f"  [{ticker} {f['date']}] SKIPPED — analysis failed")
+        else:
+            writer.add({**result, "scanned_at": f["date"]})
+            analyzed += 1
+            print(f"  [{ticker} {f['date']}] {f['form']} Score: {result['score']}/100 — {result['verdict']}")
+
+    try:
+        run_pipeline(
+            list(jobs), fetch_job, analyze,
+            fetch_workers=args.fetch_workers, analyze_workers=args.analyze_workers, on_result=record,
+            analyze_batch=analyze_batch, batch_size=1 if args.chunked else args.batch_size,
+            batch_chars=args.batch_chars,
+        )
+    except KeyboardInterrupt:
+        print("\n  Interrupted — stopping Claude subprocesses...")
+        claude.cancel()
+        writer.flush()
+        print(f"  {analyzed} filings saved; run the same backfill again to continue")
+        sys.exit(130)
+    writer.flush()
+    print(f"\n  {analyzed} of {len(jobs)} filings analyzed and saved to history.\n")
+
+    print(f"[3/3] Generating HTML report...\n")
+    data_path = None
+    if args.data_json is not None:
+        data_path = args.data_json or os.path.splitext(args.output)[0] + ".json"
+    rendered = report_from_history(args.output, data_path, tickers=tickers)
+    if rendered is not None:
+        print(f"  Report saved to: {args.output} — latest result for {rendered} companies\n")
+    else:
+        print(f"  {args.output} is already up to date\n")
+
+
+def report_metrics(json_path: str | None, tickers: list[str], elapsed_seconds: float):
+    """Print the stage breakdown and optionally write it as JSON."""
+    snap = metrics.snapshot()
+    snap["run"] = {"tickers": len(tickers), "elapsed_seconds": round(elapsed_seconds, 3),
+                   "http": session.stats()}
+    print("  Where the time went:")
+    print(metrics.summary_table(snap))
+    print()
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(snap, f, indent=2)
+        print(f"  Metrics written to: {json_path}\n")
+
+
+def prescreen_command(tickers, fetch, args):
+    """Fetch filings and rank them by local AI-term counts — no Claude, nothing saved."""
+    min_hits = args.prescreen_min_hits if args.prescreen_min_hits > 0 else TRIAGE_MIN_HITS
+    print(f"\n  Prescreening {len(tickers)} companies (threshold: {min_hits} AI-term hits)\n")
+
+    def show(ticker, filing, screen):
+        if not filing:
+            print(f"  [{ticker}] SKIPPED — could not fetch filing")
+        elif screen:
+            status = "analyze" if screen["hits"] >= min_hits else "AI washing (screened out)"
+            print(f"  [{ticker}] {screen['hits']:5d} AI terms, {screen['concrete']:5d} in concrete context, "
+                  f"{screen['per_10k']:6.2f}/10k chars — {status}")
+
+    outcomes = run_pipeline(tickers, fetch, prescreen, fetch_workers=args.fetch_workers,
+                            analyze_workers=args.analyze_workers, on_result=show)
+    screens = [s for _, _, s in outcomes if s]
+    passed = sum(1 for s in screens if s["hits"] >= min_hits)
+    print(f"\n  {len(screens)} filings screened: {passed} worth analyzing, "
+          f"{len(screens) - passed} screened out.\n")
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "cache":
+        return cache_command(argv[1:])
+    if argv and argv[0] == "report":
+        return report_command(argv[1:])
+    if argv and argv[0] == "watch":
+        return watch_command(argv[1:])
+    if argv and argv[0] == "ingest":
+        return ingest_command(argv[1:])
+
     parser = argparse.ArgumentParser(
         prog="sec-scanner",
         description="Scan SEC 10-K filings for genuine AI adoption vs. AI washing",
@@ -48,6 +422,14 @@ def main():
         default="report.html",
         help="Output HTML report path (default: report.html)",
     )
+    parser.add_argument(
+        "--data-json",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Write results to a JSON file the report loads on open instead of inlining them "
+             "(default path: the report's name with .json); keeps large reports small",
+    )
     parser.add_argument(
         "--watchlist", "-w",
         action="store_true",
@@ -58,8 +440,147 @@ def main():
         metavar="TICKER",
         help="Show scan history for a ticker",
     )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Concurrent EDGAR fetch workers (default: 2)",
+    )
+    parser.add_argument(
+        "--analyze-workers",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Concurrent Claude analysis workers (default: 2)",
+    )
+    parser.add_argument(
+        "--char-budget",
+        type=int,
+        default=DEFAULT_CHAR_BUDGET,
+        metavar="CHARS",
+        help=f"Max filing chars sent to Claude per company (default: {DEFAULT_CHAR_BUDGET})",
+    )
+    parser.add_argument(
+        "--items",
+        default=",".join(DEFAULT_ITEMS),
+        metavar="LIST",
+        help=f"10-K Items to draw passages from (default: {','.join(DEFAULT_ITEMS)})",
+    )
+    parser.add_argument(
+        "--store-raw",
+        action="store_true",
+        help="Also keep raw filing HTML compressed in .cache/raw",
+    )
+    parser.add_argument(
+        "--reclean",
+        action="store_true",
+        help="Rebuild cached filing text from stored raw HTML (re-downloads if none stored)",
+    )
+    parser.add_argument(
+        "--reanalyze-if-stale",
+        action="store_true",
+        help="Re-run Claude for filings whose text, prompt, context or model changed since caching",
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Analyze the whole filing: extract AI evidence chunk by chunk, then score it in one call",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-score from last year's cached analysis plus the AI passages that changed",
+    )
+    parser.add_argument(
+        "--prescreen-min-hits",
+        type=int,
+        default=DEFAULT_MIN_HITS,
+        metavar="N",
+        help="Opt-in: score filings with fewer AI-term mentions as AI washing without Claude, "
+             f"e.g. {TRIAGE_MIN_HITS} (default: 0, off; --prescreen-only reports against {TRIAGE_MIN_HITS})",
+    )
+    parser.add_argument(
+        "--prescreen-only",
+        action="store_true",
+        help="Triage: fetch and count AI terms locally, no Claude, no history or report",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Analyze up to N filings per Claude call (default: 1, no batching)",
+    )
+    parser.add_argument(
+        "--batch-chars",
+        type=int,
+        default=BATCH_CHARS,
+        metavar="CHARS",
+        help=f"Max combined filing chars in one batched prompt (default: {BATCH_CHARS})",
+    )
+    parser.add_argument(
+        "--backfill",
+        type=int,
+        metavar="YEARS",
+        help="Analyze every 10-K from the last YEARS years (not just the latest) and record each in "
+             "history at its filing date",
+    )
+    parser.add_argument(
+        "--no-gc",
+        action="store_true",
+        help="Skip the cache eviction that runs after the scan (limits: `sec-scanner cache gc`)",
+    )
+    parser.add_argument(
+        "--bulk-index",
+        action="store_true",
+        help="Take each ticker's latest 10-K from the index built by `sec-scanner ingest` "
+             "instead of asking EDGAR (tickers not in it are looked up as usual)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue an interrupted scan (\"last\" for the most recent): finished tickers are "
+             "reused, failed and unfinished ones re-run",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Time every stage and print a breakdown at the end",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        metavar="PATH",
+        help="Write stage timings and counters as JSON (implies --metrics)",
+    )
+    parser.add_argument(
+        "--claude-cmd",
+        default=executor.CLAUDE_BIN,
+        metavar="PATH",
+        help="Claude wrapper to run (default: $SEC_SCANNER_CLAUDE or the built-in path)",
+    )
+    parser.add_argument(
+        "--claude-concurrency",
+        type=int,
+        metavar="N",
+        help="Max Claude subprocesses in flight (default: --analyze-workers)",
+    )
+    parser.add_argument(
+        "--claude-timeout",
+        type=float,
+        default=executor.DEFAULT_TIMEOUT,
+        metavar="SECS",
+        help=f"Per-call Claude timeout in seconds (default: {executor.DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--claude-retries",
+        type=int,
+        default=executor.DEFAULT_RETRIES,
+        metavar="N",
+        help=f"Retries for failed or timed-out Claude calls (default: {executor.DEFAULT_RETRIES})",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Show history and exit
     if args.history:
@@ -72,105 +593,213 @@ def main():
             print("-" * 50)
             for h in history:
                 trend = "→"
-                print(f"  {h['scanned_at']}  Score: {h['score']:3d}/100  {h['verdict']}  [{h.get('disclosure_style','standard')}]")
+                delta = f"  ({h['delta']:+d})" if h["delta"] else ""
+                print(f"  {h['scanned_at']}  Score: {h['score']:3d}/100{delta}  {h['verdict']}  [{h.get('disclosure_style','standard')}]")
+                for change in json.loads(h.get("changes_json") or "[]"):
+                    print(f"      Δ {change}")
             trend = get_trend(ticker)
             print(f"\n  Trend: {trend.upper()}")
         return
 
-    # Collect tickers
-    tickers = list(args.tickers) if args.tickers else []
-    if args.watchlist:
-        import os
-        wl_path = os.path.join(os.getcwd(), "watchlist.txt")
-        if not os.path.exists(wl_path):
-            wl_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "watchlist.txt")
-        if os.path.exists(wl_path):
-            with open(wl_path) as f:
-                for line in f:
-                    t = line.strip().upper()
-                    if t and not t.startswith("#"):
-                        tickers.append(t)
-            print(f"  Loaded {len(tickers)} tickers from watchlist.txt")
-        else:
-            print("ERROR: watchlist.txt not found")
+    if args.backfill and args.resume:
+        parser.error("--backfill cannot be resumed; run the same backfill again to pick up what is missing")
+
+    # Resume a journaled run: its watchlist, plus whatever each ticker already got through
+    jobs = {}
+    if args.resume:
+        run_id = latest_run_id() if args.resume == "last" else args.resume
+        resumed = Journal.resume(run_id) if run_id else None
+        if not resumed:
+            print(f"ERROR: no scan run {args.resume!r} in the run journal")
             sys.exit(1)
-    if args.file:
-        with open(args.file) as f:
-            for line in f:
-                t = line.strip().upper()
-                if t and not t.startswith("#"):
-                    tickers.append(t)
+        journal, job_list = resumed
+        jobs = {job["ticker"]: job for job in job_list}
+        args.tickers, args.watchlist, args.file = list(jobs), False, None
 
+    tickers = collect_tickers(args)
     if not tickers:
         parser.error("No tickers provided. Use: sec-scanner MSFT NVDA or sec-scanner --file tickers.txt")
 
-    # Deduplicate while preserving order
-    seen = set()
-    unique_tickers = []
-    for t in tickers:
-        t = t.upper()
-        if t not in seen:
-            seen.add(t)
-            unique_tickers.append(t)
-    tickers = unique_tickers
+    items = tuple(i.strip().upper() for i in args.items.split(",") if i.strip())
 
     run_start = time.time()
+    if args.metrics or args.metrics_json:
+        metrics.enable()
+    session.configure(pool_size=args.fetch_workers)
+    fetch = partial(fetch_filing, char_budget=args.char_budget, items=items,
+                    store_raw=args.store_raw, reclean=args.reclean,
+                    whole_filing=args.chunked or args.incremental)
+
+    if args.prescreen_only:
+        if args.resume:
+            journal.finish("interrupted")
+        return prescreen_command(tickers, fetch, args)
+
+    claude = executor.configure(
+        cmd=[args.claude_cmd, *executor.CLAUDE_CMD[1:]],
+        max_concurrency=args.claude_concurrency or args.analyze_workers,
+        timeout=args.claude_timeout,
+        retries=args.claude_retries,
+    )
 
     print(f"\n{'='*60}")
     print(f"  SEC AI Adoption Scanner")
     print(f"  Analyzing {len(tickers)} companies: {', '.join(tickers)}")
     print(f"{'='*60}\n")
 
-    # Phase 1: Fetch filings
-    print("[1/3] Fetching 10-K filings from SEC EDGAR...\n")
-    filings = []
-    for ticker in tickers:
-        filing = fetch_filing(ticker)
-        if filing:
-            filings.append(filing)
-        else:
-            print(f"  [{ticker}] SKIPPED — could not fetch filing\n")
-    print()
+    if args.backfill:
+        analyze = screened(partial(analyze_chunked if args.chunked else analyze_filing,
+                                   reanalyze_if_stale=args.reanalyze_if_stale), args.prescreen_min_hits)
+        batch = screened_batch(partial(analyze_batch, reanalyze_if_stale=args.reanalyze_if_stale),
+                               args.prescreen_min_hits)
+        backfill_command(tickers, fetch, analyze, batch, claude, args)
+        if metrics.enabled():
+            report_metrics(args.metrics_json, tickers, time.time() - run_start)
+        return
 
-    if not filings:
-        print("ERROR: No filings could be fetched. Exiting.")
-        sys.exit(1)
+    if not args.resume:
+        journal = Journal.start(tickers, argv)
+    results = {t: job["result"] for t, job in jobs.items() if job["stage"] in ("analyzed", "saved")}
+    unsaved = [t for t, job in jobs.items() if job["stage"] == "analyzed"]
+    if unsaved:  # analyzed, but interrupted before they made it into history
+        save_results([results[t] for t in unsaved])
+        for ticker in unsaved:
+            journal.saved(ticker)
+    pending = [t for t in tickers if t not in results]
+    if args.resume:
+        failed = sum(1 for job in jobs.values() if job["stage"] == "failed")
+        print(f"  Resuming run {journal.run_id}: {len(results)} done, {failed} failed, "
+              f"{len(pending) - failed} unfinished\n")
+    else:
+        print(f"  Run ID: {journal.run_id}\n")
+
+    # Phase 1+2: Fetch and analyze, pipelined — analysis starts as soon as the first filing lands
+    print(f"[1/3] Fetching 10-K filings from SEC EDGAR ({args.fetch_workers} fetch workers)...")
+    print(f"[2/3] Analyzing filings with Claude as they arrive ({args.analyze_workers} analysis workers)...\n")
+
+    interrupted = threading.Event()
+    # Trends as of the last run, each updated with this run's score as it comes in
+    trends = get_trends(pending)
 
-    # Phase 2: Analyze with Claude
-    print(f"[2/3] Analyzing {len(filings)} filings with Claude...\n")
-    results = []
-    for filing in filings:
-        result = analyze_filing(filing)
-        if result:
-            results.append(result)
-            save_result(result)
-            trend = get_trend(result["ticker"])
+    # Results reach history in batches, and count as saved once their batch is committed
+    def mark_saved(batch):
+        for result in batch:
+            journal.saved(result["ticker"])
+
+    writer = HistoryWriter(on_saved=mark_saved)
+
+    def report_result(ticker, filing, result):
+        # Called in watchlist order, one ticker at a time
+        if interrupted.is_set():  # workers still draining after Ctrl-C; leave it to --resume
+            return
+        if not filing:
+            print(f"  [{ticker}] SKIPPED — could not fetch filing")
+        elif not result:
+            print(f"  [{ticker}] SKIPPED — analysis failed")
+        else:
+            results[ticker] = result
+            writer.add(result)
+            trend = trend_with(trends[ticker], result["score"])
             style = result.get("disclosure_style", "standard")
             style_note = " ⚠ conservative filer" if style == "conservative" else ""
             trend_note = f" [{trend}]" if trend != "new" else ""
             print(f"  [{result['ticker']}] Score: {result['score']}/100 — {result['verdict']}{trend_note}{style_note}")
-        else:
-            print(f"  [{filing['ticker']}] SKIPPED — analysis failed")
+
+    analyze = partial(analyze_chunked if args.chunked else analyze_filing,
+                      reanalyze_if_stale=args.reanalyze_if_stale)
+    if args.incremental:
+        analyze = partial(analyze_incremental, reanalyze_if_stale=args.reanalyze_if_stale,
+                          fallback=analyze.func)
+
+    # Tickers fetched before the interruption, or in the bulk index, go straight to their filing
+    known = {}
+    if args.bulk_index:
+        from sec_scanner.bulk import load_index
+        bulk = load_index()
+        if not bulk:
+            print("  WARNING: no bulk index — run `sec-scanner ingest submissions.zip` first")
+        known = {t: (url, filing_date, company) for t, (_, company, url, filing_date) in bulk.items()}
+        print(f"  Bulk index covers {sum(1 for t in pending if t in known)} of {len(pending)} tickers\n")
+    known.update({t: (job["filing"]["url"], job["filing"]["date"], job["filing"]["company"])
+                  for t, job in jobs.items() if job["stage"] == "fetched" and job["filing"]})
+
+    def fetch_pending(ticker):
+        url, filing_date, company = known.get(ticker, (None, None, None))
+        return fetch(ticker, latest=(url, filing_date) if url else None, company=company)
+
+    try:
+        outcomes = run_pipeline(
+            pending,
+            journal.wrap_fetch(fetch_pending),
+            journal.wrap_analyze(screened(analyze, args.prescreen_min_hits)),
+            fetch_workers=args.fetch_workers,
+            analyze_workers=args.analyze_workers,
+            on_result=report_result,
+            analyze_batch=journal.wrap_analyze_batch(
+                screened_batch(partial(analyze_batch, reanalyze_if_stale=args.reanalyze_if_stale),
+                               args.prescreen_min_hits)),
+            batch_size=1 if args.chunked or args.incremental else args.batch_size,
+            batch_chars=args.batch_chars,
+        )
+    except KeyboardInterrupt:
+        interrupted.set()
+        print("\n  Interrupted — stopping Claude subprocesses...")
+        claude.cancel()
+        writer.flush()
+        journal.finish("interrupted")
+        print(f"  Pick up where this left off with: sec-scanner --resume {journal.run_id}")
+        sys.exit(130)
+    writer.flush()
+    journal.finish()
     print()
 
+    failed = sum(1 for _, filing, result in outcomes if not (filing and result))
+    if failed:
+        print(f"  {failed} tickers failed — retry just those with: sec-scanner --resume {journal.run_id}\n")
+
+    if pending and not any(filing for _, filing, _ in outcomes) and not results:
+        print("ERROR: No filings could be fetched. Exiting.")
+        sys.exit(1)
+
+    results = [results[t] for t in tickers if t in results]
     if not results:
         print("ERROR: No filings could be analyzed. Exiting.")
         sys.exit(1)
 
     # Phase 3: Generate report
     print(f"[3/3] Generating HTML report...\n")
-    output = generate_report(results, args.output)
+    data_path = None
+    if args.data_json is not None:
+        data_path = args.data_json or os.path.splitext(args.output)[0] + ".json"
+    output = generate_report(results, args.output, data_path=data_path)
     print(f"  Report saved to: {output}")
+    if data_path:
+        print(f"  Report data saved to: {data_path} (serve both over HTTP to view)")
     print(f"\n  {len(results)} companies analyzed.")
     print(f"  Genuine adopters: {sum(1 for r in results if r['score'] >= 60)}")
     print(f"  AI washing: {sum(1 for r in results if r['score'] < 40)}")
     print(f"  Mixed signals: {sum(1 for r in results if 40 <= r['score'] < 60)}")
+    http = session.stats()
+    if http["requests"]:
+        print(f"  EDGAR: {http['requests']} requests over {http['connections_opened']} connections "
+              f"({http['connections_reused']} reused, {http['not_modified']} not modified)")
     print()
 
+    # Opportunistic eviction with the stored policy — index-driven, so cheap
+    if not args.no_gc:
+        from sec_scanner.cache import gc
+        evicted = gc()
+        if any(evicted[k] for k in ("filings", "raw_files", "analyses", "chunks")):
+            _print_gc(evicted)
+            print()
+
     # Auto-log to WorkLog
     elapsed = (time.time() - run_start) / 3600
     log_to_worklog(tickers, results, elapsed)
 
+    if metrics.enabled():
+        report_metrics(args.metrics_json, tickers, elapsed * 3600)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,172 @@
+"""Bounded pool of Claude CLI subprocesses — timeouts, retries and clean cancellation."""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+from sec_scanner import metrics
+from sec_scanner.ratelimit import backoff_delay
+
+# SEC_SCANNER_CLAUDE swaps in another wrapper, e.g. benchmarks/stub_claude.py
+CLAUDE_BIN = os.environ.get("SEC_SCANNER_CLAUDE", "/Users/justinadair/bin/claude-wrapper")
+CLAUDE_CMD = [CLAUDE_BIN, "-p", "--output-format", "text"]
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_TIMEOUT = 120
+DEFAULT_RETRIES = 1
+
+
+class ClaudeExecutor:
+    """Keeps up to `max_concurrency` Claude CLI processes in flight.
+
+    Jobs beyond the cap queue inside the pool, which gives callers natural
+    backpressure. Non-zero exits and timeouts are retried with jittered
+    backoff; `cancel` kills every running child and fails queued jobs fast.
+    """
+
+    def __init__(self, cmd: list[str] | None = None, max_concurrency: int = DEFAULT_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = 2.0):
+        self.cmd = list(cmd or CLAUDE_CMD)
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="claude")
+        self._procs: set[subprocess.Popen] = set()
+        self._procs_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._version: str | None = None
+        self._version_lock = threading.Lock()
+
+    def version(self) -> str:
+        """Identify the wrapper and the model behind it (`<cmd> --version`), once per executor."""
+        with self._version_lock:
+            if self._version is None:
+                try:
+                    out = subprocess.run([self.cmd[0], "--version"], stdin=subprocess.DEVNULL,
+                                         capture_output=True, text=True, timeout=10)
+                    reported = out.stdout.strip() if out.returncode == 0 else ""
+                except (OSError, subprocess.TimeoutExpired):
+                    reported = ""
+                self._version = f"{self.cmd[0]} {reported or 'unknown'}"
+            return self._version
+
+    def submit(self, prompt: str, label: str = "", timeout: float | None = None) -> Future:
+        """Queue a prompt; the future resolves to stdout, or None on failure."""
+        return self._pool.submit(self._run_with_retries, prompt, label, timeout or self.timeout)
+
+    def run(self, prompt: str, label: str = "", timeout: float | None = None) -> str | None:
+        """Run a prompt and block until it finishes. Returns stdout or None."""
+        if self._cancelled.is_set():
+            return None
+        try:
+            return self.submit(prompt, label, timeout).result()
+        except (CancelledError, RuntimeError):  # cancelled, or pool shut down under us
+            return None
+
+    def cancel(self):
+        """Kill running children and make queued jobs return None immediately."""
+        self._cancelled.set()
+        with self._procs_lock:
+            procs = list(self._procs)
+        for proc in procs:
+            _terminate(proc)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_with_retries(self, prompt: str, label: str, timeout: float) -> str | None:
+        tag = f"  [{label}] " if label else "  "
+        for attempt in range(self.retries + 1):
+            if self._cancelled.is_set():
+                return None
+            try:
+                returncode, stdout, stderr = self._run_once(prompt, timeout)
+            except subprocess.TimeoutExpired:
+                print(f"{tag}ERROR: Claude CLI timed out")
+                metrics.incr("claude.timeouts")
+            else:
+                if returncode == 0:
+                    return stdout
+                if self._cancelled.is_set():
+                    return None
+                print(f"{tag}ERROR: Claude CLI failed: {stderr[:200]}")
+                metrics.incr("claude.failures")
+            if attempt < self.retries:
+                delay = backoff_delay(attempt, base=self.backoff)
+                print(f"{tag}Retrying Claude in {delay:.1f}s ({attempt + 1}/{self.retries})...")
+                metrics.incr("claude.retries")
+                if self._cancelled.wait(delay):
+                    return None
+        return None
+
+    def _run_once(self, prompt: str, timeout: float) -> tuple[int, str, str]:
+        # Own session/process group: a terminal Ctrl-C reaches us, not the children,
+        # and cancel() can take down anything the wrapper itself spawned.
+        proc = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=(os.name == "posix"),
+        )
+        with self._procs_lock:
+            self._procs.add(proc)
+        metrics.incr("claude.calls")
+        metrics.incr("claude.prompt_chars", len(prompt))
+        try:
+            with metrics.span("claude.subprocess"):
+                stdout, stderr = proc.communicate(prompt, timeout=timeout)
+            return proc.returncode, stdout, stderr
+        except subprocess.TimeoutExpired:
+            _terminate(proc)
+            proc.communicate()
+            raise
+        finally:
+            with self._procs_lock:
+                self._procs.discard(proc)
+
+
+def _terminate(proc: subprocess.Popen, grace: float = 2.0):
+    """SIGTERM the child's process group, then SIGKILL if it doesn't exit."""
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGTERM)
+        else:
+            proc.terminate()
+        deadline = time.time() + grace
+        while proc.poll() is None and time.time() < deadline:
+            time.sleep(0.05)
+        if proc.poll() is None:
+            if os.name == "posix":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+_executor: ClaudeExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def configure(**kwargs) -> ClaudeExecutor:
+    """Replace the shared executor (cmd, max_concurrency, timeout, retries, backoff)."""
+    global _executor
+    with _executor_lock:
+        _executor = ClaudeExecutor(**kwargs)
+        return _executor
+
+
+def get_executor() -> ClaudeExecutor:
+    """Return the shared executor, creating one with defaults on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ClaudeExecutor()
+        return _executor
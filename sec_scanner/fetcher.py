@@ -1,35 +1,131 @@
 """SEC EDGAR API: fetch 10-K filings and extract clean text."""
 
+import codecs
+import json
+import os
 import re
+import threading
 import time
-import warnings
 
 import requests
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
-
-warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
-
-HEADERS = {
-    "User-Agent": "SECScanner/1.0 (research@example.com)",
-    "Accept-Encoding": "gzip, deflate",
-}
-
-# Rate limit: SEC asks for max 10 requests/second
-_last_request_time = 0.0
-
-
-def _throttle():
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
-    if elapsed < 0.15:
-        time.sleep(0.15 - elapsed)
-    _last_request_time = time.time()
-
 
+from sec_scanner import metrics, session
+from sec_scanner.cache import CACHE_DIR
+from sec_scanner.htmltext import TextExtractor
+from sec_scanner.ratelimit import TokenBucket, backoff_delay, retry_after_seconds
+from sec_scanner.sections import DEFAULT_CHAR_BUDGET, DEFAULT_ITEMS, extract_relevant
+
+# Rate limit: SEC asks for max 10 requests/second — shared by every worker and process
+_limiter = TokenBucket()
+
+MAX_RETRIES = 4
+
+# SEC_SCANNER_EDGAR_URL points both EDGAR hosts elsewhere, e.g. the benchmark fixture server
+_EDGAR_OVERRIDE = os.environ.get("SEC_SCANNER_EDGAR_URL", "").rstrip("/")
+SEC_URL = _EDGAR_OVERRIDE or "https://www.sec.gov"
+SEC_DATA_URL = _EDGAR_OVERRIDE or "https://data.sec.gov"
+
+COMPANY_TICKERS_URL = f"{SEC_URL}/files/company_tickers.json"
+TICKER_INDEX_PATH = CACHE_DIR / "ticker_index.json"
+TICKER_INDEX_TTL = 24 * 3600  # SEC regenerates company_tickers.json daily
+
+# Safety cap on cleaned text kept per filing; the prompt is cut down from this
+FULL_TEXT_MAX_CHARS = 2_000_000
+
+# Unless the whole filing is wanted, the download stops at this many times
+# the char budget: enough for section selection to reach Items 1, 1A and 7,
+# without pulling the financial statements and exhibits that follow them
+SELECTION_HEADROOM = 8
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+def _get(url: str, timeout: int = 30, **kwargs) -> requests.Response:
+    """GET an EDGAR URL under the shared rate limit, backing off on 429/503."""
+    for attempt in range(MAX_RETRIES + 1):
+        _limiter.acquire()
+        resp = session.get_session().get(url, timeout=timeout, **kwargs)
+        metrics.incr("edgar.requests")
+        if resp.status_code not in (429, 503) or attempt == MAX_RETRIES:
+            resp.raise_for_status()
+            return resp
+        retry_after = retry_after_seconds(resp.headers.get("Retry-After"))
+        delay = retry_after + backoff_delay(0) if retry_after is not None else backoff_delay(attempt)
+        print(f"  EDGAR returned {resp.status_code} — backing off {delay:.1f}s")
+        metrics.incr("edgar.retries")
+        _limiter.penalize(delay)
+
+
+def _get_json(url: str) -> dict:
+    """GET a JSON endpoint conditionally — unchanged resources come back as cheap 304s."""
+    resp = _get(url, headers=session.conditional_headers(url))
+    body = session.resolve_conditional(url, resp)
+    if body is None:  # 304 but the stored copy is gone — fetch it fresh
+        body = session.resolve_conditional(url, _get(url))
+    return json.loads(body)
+
+
+# ── Ticker index ──────────────────────────────────────────────────────────────
+
+_ticker_index: dict[str, tuple[str, str]] | None = None
+_ticker_index_loaded_at = 0.0
+_ticker_index_lock = threading.Lock()
+
+
+def _refresh_ticker_index() -> tuple[dict[str, tuple[str, str]], float]:
+    """Download company_tickers.json (a 304 if unchanged) and persist a compact index."""
+    index = {}
+    for entry in _get_json(COMPANY_TICKERS_URL).values():
+        t = entry.get("ticker", "").upper()
+        if t and t not in index:  # first listing wins, matching the old linear scan
+            index[t] = (str(entry["cik_str"]), entry.get("title", t))
+    fetched_at = time.time()
+    TICKER_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = TICKER_INDEX_PATH.with_suffix(f".tmp{os.getpid()}")
+    tmp.write_text(json.dumps({"fetched_at": fetched_at, "tickers": index}), encoding="utf-8")
+    os.replace(tmp, TICKER_INDEX_PATH)
+    return index, fetched_at
+
+
+def get_ticker_index() -> dict[str, tuple[str, str]]:
+    """Return {TICKER: (cik, company title)}, loaded once per process.
+
+    Served from .cache/ticker_index.json while it is younger than
+    TICKER_INDEX_TTL; otherwise refreshed from EDGAR.
+    """
+    global _ticker_index, _ticker_index_loaded_at
+    with _ticker_index_lock:
+        now = time.time()
+        if _ticker_index is not None and now - _ticker_index_loaded_at < TICKER_INDEX_TTL:
+            return _ticker_index
+        try:
+            stored = json.loads(TICKER_INDEX_PATH.read_text(encoding="utf-8"))
+            if now - stored["fetched_at"] < TICKER_INDEX_TTL:
+                _ticker_index = {t: tuple(v) for t, v in stored["tickers"].items()}
+                _ticker_index_loaded_at = stored["fetched_at"]
+                return _ticker_index
+        except (OSError, ValueError, KeyError):
+            pass
+        _ticker_index, _ticker_index_loaded_at = _refresh_ticker_index()
+        return _ticker_index
+
+
+def _lookup_ticker(ticker: str) -> tuple[str, str] | None:
+    index = get_ticker_index()
+    t = ticker.upper()
+    # SEC lists share classes with a dash (BRK-B); accept BRK.B too
+    return index.get(t) or index.get(t.replace(".", "-"))
+
+
+@metrics.timed("fetch.cik")
 def get_cik(ticker: str) -> str | None:
     """Look up CIK number for a ticker symbol."""
-    _throttle()
-    url = "https://www.sec.gov/cgi-bin/browse-edgar"
+    entry = _lookup_ticker(ticker)
+    if entry:
+        return entry[0]
+
+    # Not in company_tickers.json — fall back to the EDGAR company browse feed
+    url = f"{SEC_URL}/cgi-bin/browse-edgar"
     params = {
         "action": "getcompany",
         "CIK": ticker,
@@ -40,54 +136,52 @@ def get_cik(ticker: str) -> str | None:
         "search_text": "",
         "output": "atom",
     }
-    resp = requests.get(url, params=params, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-
-    soup = BeautifulSoup(resp.text, "html.parser")
+    resp = _get(url, params=params)
 
     # Extract CIK from the feed — look for accession numbers
     cik_match = re.search(r"CIK=(\d+)", resp.text)
     if cik_match:
         return cik_match.group(1).lstrip("0")
 
-    # Try company search JSON endpoint as fallback
-    _throttle()
-    tickers_url = "https://www.sec.gov/files/company_tickers.json"
-    resp2 = requests.get(tickers_url, headers=HEADERS, timeout=30)
-    resp2.raise_for_status()
-    tickers_data = resp2.json()
-    for entry in tickers_data.values():
-        if entry.get("ticker", "").upper() == ticker.upper():
-            return str(entry["cik_str"])
-
     return None
 
 
 def get_company_name(ticker: str) -> str:
-    """Get company name from SEC company tickers JSON."""
-    _throttle()
-    url = "https://www.sec.gov/files/company_tickers.json"
-    resp = requests.get(url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    for entry in resp.json().values():
-        if entry.get("ticker", "").upper() == ticker.upper():
-            return entry.get("title", ticker)
-    return ticker
+    """Get company name from the local SEC company tickers index."""
+    entry = _lookup_ticker(ticker)
+    return entry[1] if entry else ticker
 
 
+@metrics.timed("fetch.submissions")
 def get_latest_10k_url(cik: str) -> tuple[str, str] | None:
     """Get the URL and filing date of the latest 10-K for a CIK.
 
     Returns (filing_url, filing_date) or None.
     """
-    _throttle()
-    padded_cik = cik.zfill(10)
-    url = f"https://data.sec.gov/submissions/CIK{padded_cik}.json"
-    resp = requests.get(url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
-
-    recent = data.get("filings", {}).get("recent", {})
+    data = _get_json(submissions_url(cik))
+    latest = latest_10k(data, cik)
+    return latest[:2] if latest else None
+
+
+def submissions_url(cik: str) -> str:
+    return f"{SEC_DATA_URL}/submissions/CIK{cik.zfill(10)}.json"
+
+
+def poll_submissions(cik: str, etag: str | None = None) -> tuple[dict | None, str | None]:
+    """Conditional GET of a company's submissions document against the caller's own ETag.
+
+    Returns (submissions, new ETag), or (None, etag) when EDGAR answers 304
+    because nothing changed since etag.
+    """
+    resp = _get(submissions_url(cik), headers={"If-None-Match": etag} if etag else {})
+    if resp.status_code == 304:
+        return None, etag
+    return resp.json(), resp.headers.get("ETag")
+
+
+def latest_10k(submissions: dict, cik: str) -> tuple[str, str, str] | None:
+    """(filing_url, filing_date, accession) of the newest 10-K or 10-K/A in a submissions document."""
+    recent = submissions.get("filings", {}).get("recent", {})
     forms = recent.get("form", [])
     accessions = recent.get("accessionNumber", [])
     dates = recent.get("filingDate", [])
@@ -95,89 +189,181 @@ def get_latest_10k_url(cik: str) -> tuple[str, str] | None:
 
     for i, form in enumerate(forms):
         if form in ("10-K", "10-K/A"):
-            accession = accessions[i].replace("-", "")
-            doc = primary_docs[i]
-            filing_date = dates[i]
-            filing_url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession}/{doc}"
-            return filing_url, filing_date
+            return _filing_url(cik, accessions[i], primary_docs[i]), dates[i], accessions[i]
 
     return None
 
 
-def download_and_clean(url: str, max_chars: int = 80000) -> str:
-    """Download a 10-K filing and strip it to clean text."""
-    _throttle()
-    resp = requests.get(url, headers=HEADERS, timeout=60)
-    resp.raise_for_status()
+def _filing_url(cik: str, accession: str, doc: str) -> str:
+    return f"{SEC_URL}/Archives/edgar/data/{cik}/{accession.replace('-', '')}/{doc}"
 
-    soup = BeautifulSoup(resp.text, "html.parser")
 
-    # Remove script, style, and XBRL tags
-    for tag in soup.find_all(["script", "style", "ix:nonfraction", "ix:nonnumeric",
-                               "ix:header", "ix:hidden", "ix:references"]):
-        tag.decompose()
+def _10k_rows(columns: dict, cik: str, since: str) -> list[dict]:
+    return [
+        {"url": _filing_url(cik, accession, doc), "date": filed, "accession": accession, "form": form}
+        for form, filed, accession, doc in zip(columns.get("form", []), columns.get("filingDate", []),
+                                               columns.get("accessionNumber", []),
+                                               columns.get("primaryDocument", []))
+        if form in ("10-K", "10-K/A") and filed >= since
+    ]
 
-    text = soup.get_text(separator="\n")
 
-    # Clean up whitespace
-    lines = []
-    for line in text.splitlines():
-        line = line.strip()
-        if line:
-            lines.append(line)
-    text = "\n".join(lines)
+@metrics.timed("fetch.submissions")
+def list_10k_filings(cik: str, since: str) -> list[dict]:
+    """Every 10-K / 10-K/A filed on or after since (YYYY-MM-DD), newest first.
 
-    # Remove excessive repeated characters
-    text = re.sub(r"[_=\-]{10,}", "", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    Reads filings.recent and then any older filings.files pages whose date
+    range reaches back past since. Each entry has url, date, accession, form.
+    """
+    data = _get_json(submissions_url(cik))
+    filings = data.get("filings", {})
+    found = _10k_rows(filings.get("recent", {}), cik, since)
+    for page in filings.get("files", []):
+        if page.get("filingTo", "9999-12-31") < since:
+            continue
+        found += _10k_rows(_get_json(f"{SEC_DATA_URL}/submissions/{page['name']}"), cik, since)
+    unique = {f["accession"]: f for f in found}
+    return sorted(unique.values(), key=lambda f: f["date"], reverse=True)
+
+
+def _clean_chunks(chunks, max_chars: int, raw_writer=None) -> str:
+    """Feed text chunks through the streaming cleaner.
+
+    Stops consuming as soon as max_chars of clean text exist, unless the
+    raw document is being mirrored to raw_writer, which needs all of it.
+    """
+    parser = TextExtractor(max_chars=max_chars)
+    cleaning = 0.0
+    for chunk in chunks:
+        if raw_writer is not None:
+            raw_writer.write(chunk)
+        if not parser.done:
+            start = time.perf_counter()
+            parser.feed(chunk)
+            cleaning += time.perf_counter() - start
+        elif raw_writer is None:
+            break
+    start = time.perf_counter()
+    text = parser.text()
+    # Cleaning time only — the download itself is in fetch.download
+    metrics.record("fetch.clean", cleaning + time.perf_counter() - start)
+    return text
 
-    # Truncate to max_chars
-    if len(text) > max_chars:
-        text = text[:max_chars]
 
-    return text
+@metrics.timed("fetch.download")
+def download_and_clean(url: str, max_chars: int = 80000, raw_writer=None) -> str:
+    """Download a 10-K filing and strip it to clean text.
+
+    The body is streamed and cleaned chunk by chunk, and the socket is
+    closed once max_chars of text exist, so memory stays bounded no matter
+    how large the filing is. Pass raw_writer (a text stream) to also keep
+    the raw HTML; the whole body is read in that case.
+    """
+    resp = _get(url, timeout=60, stream=True)
+    # Same charset resp.text would use; utf-8 if the server names none
+    decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+
+    def chunks():
+        for block in resp.iter_content(DOWNLOAD_CHUNK_BYTES):
+            metrics.incr("edgar.download_bytes", len(block))
+            yield decoder.decode(block)
+        yield decoder.decode(b"", final=True)
+
+    try:
+        return _clean_chunks(chunks(), max_chars, raw_writer)
+    finally:
+        resp.close()
+
+
+def clean_stored_raw(ticker: str, filing_date: str, filing_url: str,
+                     max_chars: int = FULL_TEXT_MAX_CHARS) -> str | None:
+    """Re-clean a filing from its stored raw HTML, or None if none was stored."""
+    from sec_scanner.cache import open_raw_filing
+    raw = open_raw_filing(ticker, filing_date, filing_url)
+    if raw is None:
+        return None
+    with raw:
+        return _clean_chunks(iter(lambda: raw.read(DOWNLOAD_CHUNK_BYTES), ""), max_chars)
 
 
-def fetch_filing(ticker: str) -> dict | None:
+def fetch_filing(ticker: str, char_budget: int = DEFAULT_CHAR_BUDGET,
+                 items: tuple[str, ...] = DEFAULT_ITEMS, store_raw: bool = False,
+                 reclean: bool = False, latest: tuple[str, str] | None = None,
+                 company: str | None = None, whole_filing: bool = False) -> dict | None:
     """Full pipeline: ticker -> clean filing text + metadata.
 
-    Returns dict with keys: ticker, company, date, text, url
+    Returns dict with keys: ticker, company, date, text, full_text, url
+    where text is the AI-relevant extract of the given Items (at most
+    char_budget chars) and full_text is the cleaned filing. Unless
+    whole_filing is set (--chunked and --incremental read all of it),
+    full_text is only the first SELECTION_HEADROOM * char_budget chars
+    and the download is closed once they exist.
     Or None if filing could not be fetched.
     Uses disk cache — skips download if same filing seen before.
+    store_raw keeps the raw HTML compressed in .cache/raw; reclean rebuilds
+    the cached text from that raw copy instead of trusting the cached text.
+    latest=(filing_url, filing_date) skips the CIK and submissions lookups
+    for a filing that is already known, e.g. when resuming a run or from
+    the bulk index; company, if known too, skips the ticker index.
     """
-    from sec_scanner.cache import get_filing, save_filing
-    print(f"  [{ticker}] Looking up CIK...")
-    cik = get_cik(ticker)
-    if not cik:
-        print(f"  [{ticker}] ERROR: Could not find CIK")
-        return None
+    from sec_scanner.cache import get_filing, save_filing, raw_filing_writer
+    if latest:
+        company = company or get_company_name(ticker)
+        filing_url, filing_date = latest
+    else:
+        print(f"  [{ticker}] Looking up CIK...")
+        cik = get_cik(ticker)
+        if not cik:
+            print(f"  [{ticker}] ERROR: Could not find CIK")
+            return None
 
-    print(f"  [{ticker}] CIK={cik}, fetching company name...")
-    company = get_company_name(ticker)
+        print(f"  [{ticker}] CIK={cik}, fetching company name...")
+        company = get_company_name(ticker)
 
-    print(f"  [{ticker}] Finding latest 10-K filing...")
-    result = get_latest_10k_url(cik)
-    if not result:
-        print(f"  [{ticker}] ERROR: No 10-K filing found")
-        return None
+        print(f"  [{ticker}] Finding latest 10-K filing...")
+        result = get_latest_10k_url(cik)
+        if not result:
+            print(f"  [{ticker}] ERROR: No 10-K filing found")
+            return None
 
-    filing_url, filing_date = result
+        filing_url, filing_date = result
 
     # Check filing text cache first
-    cached_text = get_filing(ticker, filing_date, filing_url)
+    needed = FULL_TEXT_MAX_CHARS if whole_filing else min(FULL_TEXT_MAX_CHARS, char_budget * SELECTION_HEADROOM)
+    cached_text = None if reclean else get_filing(ticker, filing_date, filing_url,
+                                                  None if whole_filing else needed)
+    recleaned = None if cached_text else clean_stored_raw(ticker, filing_date, filing_url)
     if cached_text:
         print(f"  [{ticker}] Using cached filing from {filing_date} ({len(cached_text):,} chars)")
         text = cached_text
+    elif recleaned is not None:
+        text = recleaned
+        print(f"  [{ticker}] Re-cleaned stored raw filing from {filing_date} ({len(text):,} chars)")
+        save_filing(ticker, filing_date, filing_url, text)
     else:
         print(f"  [{ticker}] Downloading filing from {filing_date}...")
-        text = download_and_clean(filing_url)
-        print(f"  [{ticker}] Got {len(text):,} chars — caching for next time")
-        save_filing(ticker, filing_date, filing_url, text)
+        if store_raw:
+            # The raw copy needs the whole body anyway, so clean all of it
+            with raw_filing_writer(ticker, filing_date, filing_url) as raw:
+                text = download_and_clean(filing_url, max_chars=FULL_TEXT_MAX_CHARS, raw_writer=raw)
+            partial = False
+        else:
+            text = download_and_clean(filing_url, max_chars=needed)
+            partial = needed < FULL_TEXT_MAX_CHARS and len(text) >= needed
+        print(f"  [{ticker}] Got {len(text):,} chars{' (enough to select from)' if partial else ''}"
+              " — caching for next time")
+        save_filing(ticker, filing_date, filing_url, text, partial=partial)
+
+    with metrics.span("fetch.extract"):
+        prompt_text = extract_relevant(text, char_budget=char_budget, items=items)
+    if len(prompt_text) < len(text):
+        print(f"  [{ticker}] Selected {len(prompt_text):,} AI-relevant chars from Items {', '.join(items)}")
 
     return {
         "ticker": ticker.upper(),
         "company": company,
         "date": filing_date,
-        "text": text,
+        "text": prompt_text,
+        "full_text": text,
         "url": filing_url,
     }
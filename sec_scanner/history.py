@@ -2,20 +2,88 @@
 
 import sqlite3
 import json
+import threading
 from pathlib import Path
 from datetime import date
 
+from sec_scanner import metrics
+
 DB_PATH = Path(__file__).parent.parent / "scan_history.db"
 
+# Results buffered by HistoryWriter before they are inserted in one transaction
+WRITE_BATCH_SIZE = 100
+
+# Trend: compare the latest score with the oldest of the last TREND_WINDOW scans
+TREND_WINDOW = 3
+TREND_THRESHOLD = 5
+
+# scanned_at to the millisecond; rows written before this are plain dates,
+# which still sort first within their day. id breaks any remaining ties.
+# Backfilled results set their own scanned_at (the filing date) so they
+# slot into the timeline where they belong.
+_INSERT_SQL = """
+    INSERT INTO scan_history
+    (ticker, company, score, verdict, disclosure_style, filing_date, scores_json, takeaway,
+     changes_json, scanned_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, coalesce(?, strftime('%Y-%m-%d %H:%M:%f', 'now')))
+"""
+
+# The last TREND_WINDOW scans of each requested ticker come straight off the
+# (ticker, scanned_at, id) index, so the cost per ticker does not grow with
+# its history; window functions then rank them and pick out first / last.
+_TRENDS_SQL = f"""
+    WITH recent AS (
+        SELECT h.ticker, h.score,
+               ROW_NUMBER() OVER (PARTITION BY h.ticker ORDER BY h.scanned_at DESC, h.id DESC) AS age,
+               COUNT(*) OVER (PARTITION BY h.ticker) AS scans
+        FROM json_each(?) AS wanted
+        JOIN scan_history AS h ON h.id IN (
+            SELECT id FROM scan_history
+            WHERE ticker = wanted.value
+            ORDER BY scanned_at DESC, id DESC
+            LIMIT {TREND_WINDOW}
+        )
+    )
+    SELECT ticker,
+           MAX(CASE WHEN age = 1 THEN score END)     AS score,
+           MAX(CASE WHEN age = 2 THEN score END)     AS previous,
+           MAX(CASE WHEN age = scans THEN score END) AS oldest,
+           AVG(score)                                AS rolling_avg,
+           MAX(scans)                                AS scans
+    FROM recent
+    GROUP BY ticker
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized: set[str] = set()
+
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+def get_connection() -> sqlite3.Connection:
+    """This thread's long-lived connection to DB_PATH, schema set up once per process.
+
+    WAL mode lets readers carry on while another thread or process commits;
+    writers queue on the busy timeout instead of failing with "locked".
+    """
+    path = str(DB_PATH)
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == path:
+        return conn
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if path not in _initialized:
+            _create_schema(conn)
+            _initialized.add(path)
+    _local.conn, _local.path = conn, path
     return conn
 
 
-def init_db():
-    with get_connection() as conn:
+def _create_schema(conn: sqlite3.Connection):
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
         conn.execute("""
             CREATE TABLE IF NOT EXISTS scan_history (
                 id           INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -30,59 +98,208 @@ def init_db():
                 takeaway     TEXT
             )
         """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_ticker ON scan_history(ticker)")
-        conn.commit()
+        # Covers per-ticker lookups in scan order; supersedes the old idx_ticker
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_ticker_scanned ON scan_history(ticker, scanned_at, id)")
+        conn.execute("DROP INDEX IF EXISTS idx_ticker")
+        columns = {r["name"] for r in conn.execute("PRAGMA table_info(scan_history)")}
+        if "changes_json" not in columns:
+            # "What changed" notes from incremental year-over-year analysis
+            conn.execute("ALTER TABLE scan_history ADD COLUMN changes_json TEXT")
+
+
+def init_db():
+    get_connection()
+
+
+def _row(result: dict) -> tuple:
+    return (
+        result["ticker"],
+        result.get("company"),
+        result["score"],
+        result.get("verdict"),
+        result.get("disclosure_style", "standard"),
+        result.get("date"),
+        json.dumps(result.get("scores", {})),
+        result.get("takeaway"),
+        json.dumps(result["changes"]) if result.get("changes") else None,
+        result.get("scanned_at"),
+    )
+
+
+@metrics.timed("history.save")
+def save_results(results: list[dict]):
+    """Insert several results in a single transaction."""
+    if not results:
+        return
+    conn = get_connection()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(_INSERT_SQL, [_row(r) for r in results])
 
 
 def save_result(result: dict):
-    init_db()
-    with get_connection() as conn:
-        conn.execute("""
-            INSERT INTO scan_history
-            (ticker, company, score, verdict, disclosure_style, filing_date, scores_json, takeaway)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            result["ticker"],
-            result.get("company"),
-            result["score"],
-            result.get("verdict"),
-            result.get("disclosure_style", "standard"),
-            result.get("date"),
-            json.dumps(result.get("scores", {})),
-            result.get("takeaway"),
-        ))
-        conn.commit()
+    save_results([result])
+
+
+class HistoryWriter:
+    """Collects results from any number of threads and inserts them in batches.
+
+    Use as a context manager, or call flush() / close(); nothing reaches
+    the database until a batch fills or the writer is flushed. on_saved,
+    if given, is called with each batch once it is committed.
+    """
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE, on_saved=None):
+        self.batch_size = batch_size
+        self.on_saved = on_saved
+        self._pending: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, result: dict):
+        with self._lock:
+            self._pending.append(result)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self._save(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        self._save(batch)
+
+    def _save(self, batch: list[dict]):
+        save_results(batch)
+        if batch and self.on_saved:
+            self.on_saved(batch)
+
+    close = flush
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        return False
 
 
 def get_history(ticker: str) -> list[dict]:
-    """Return all scan history for a ticker, oldest first."""
-    init_db()
-    with get_connection() as conn:
-        rows = conn.execute(
-            "SELECT * FROM scan_history WHERE ticker = ? ORDER BY scanned_at ASC",
-            (ticker.upper(),)
-        ).fetchall()
-        return [dict(r) for r in rows]
+    """Return all scan history for a ticker, oldest first.
 
+    Each row also carries delta (score change since the previous scan) and
+    rolling_avg (mean score over the last TREND_WINDOW scans).
+    """
+    rows = get_connection().execute(f"""
+        SELECT *,
+               score - LAG(score) OVER w AS delta,
+               AVG(score) OVER (w ROWS BETWEEN {TREND_WINDOW - 1} PRECEDING AND CURRENT ROW) AS rolling_avg
+        FROM scan_history
+        WHERE ticker = ?
+        WINDOW w AS (ORDER BY scanned_at, id)
+        ORDER BY scanned_at, id
+    """, (ticker.upper(),)).fetchall()
+    return [dict(r) for r in rows]
 
-def get_trend(ticker: str) -> str:
-    """Return trend string: 'improving', 'declining', 'stable', or 'new'."""
-    history = get_history(ticker)
-    if len(history) < 2:
+
+def _trend(score: int, oldest: int, scans: int) -> str:
+    if scans < 2:
         return "new"
-    scores = [h["score"] for h in history[-3:]]  # last 3 scans
-    if scores[-1] > scores[0] + 5:
+    if score > oldest + TREND_THRESHOLD:
         return "improving"
-    elif scores[-1] < scores[0] - 5:
+    elif score < oldest - TREND_THRESHOLD:
         return "declining"
     return "stable"
 
 
+def get_trends(tickers: list[str]) -> dict[str, dict]:
+    """Trend summary for a whole watchlist in one query.
+
+    Maps each ticker to trend ('improving', 'declining', 'stable' or 'new'),
+    score (latest), previous, delta and rolling_avg over the last
+    TREND_WINDOW scans; tickers never scanned get trend 'new' and Nones.
+    """
+    wanted = list(dict.fromkeys(t.upper() for t in tickers))
+    trends = {t: {"trend": "new", "score": None, "previous": None, "delta": None, "rolling_avg": None}
+              for t in wanted}
+    for r in get_connection().execute(_TRENDS_SQL, (json.dumps(wanted),)):
+        trends[r["ticker"]] = {
+            "trend": _trend(r["score"], r["oldest"], r["scans"]),
+            "score": r["score"],
+            "previous": r["previous"],
+            "delta": r["score"] - r["previous"] if r["previous"] is not None else None,
+            "rolling_avg": round(r["rolling_avg"], 1),
+        }
+    return trends
+
+
+def trend_with(summary: dict, score: int) -> str:
+    """The trend once a new scan scoring `score` follows a get_trends() summary."""
+    if summary["score"] is None:
+        return "new"
+    # In a window of three the new scan pushes the oldest out, leaving previous oldest
+    oldest = summary["previous"] if summary["previous"] is not None else summary["score"]
+    return _trend(score, oldest, TREND_WINDOW)
+
+
+def get_trend(ticker: str) -> str:
+    """Return trend string: 'improving', 'declining', 'stable', or 'new'."""
+    return get_trends([ticker])[ticker.upper()]["trend"]
+
+
 def get_all_tickers() -> list[str]:
     """Return all tickers that have been scanned."""
-    init_db()
-    with get_connection() as conn:
-        rows = conn.execute(
-            "SELECT DISTINCT ticker FROM scan_history ORDER BY ticker"
-        ).fetchall()
-        return [r["ticker"] for r in rows]
+    rows = get_connection().execute(
+        "SELECT DISTINCT ticker FROM scan_history ORDER BY ticker"
+    ).fetchall()
+    return [r["ticker"] for r in rows]
+
+
+def latest_results(tickers: list[str] | None = None, verdicts: list[str] | None = None,
+                   min_score: int | None = None, max_score: int | None = None,
+                   styles: list[str] | None = None) -> list[dict]:
+    """The most recent scan of each ticker, optionally filtered, highest score first.
+
+    Filters apply to that latest scan, so a ticker whose score has since
+    moved out of range drops out rather than showing an old result.
+    """
+    where, params = [], []
+    if verdicts:
+        where.append(f"lower(verdict) IN ({', '.join('?' * len(verdicts))})")
+        params += [v.lower() for v in verdicts]
+    if min_score is not None:
+        where.append("score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        where.append("score <= ?")
+        params.append(max_score)
+    if styles:
+        where.append(f"coalesce(disclosure_style, 'standard') IN ({', '.join('?' * len(styles))})")
+        params += [s.lower() for s in styles]
+    scope = ""
+    if tickers:
+        scope = "WHERE ticker IN (SELECT value FROM json_each(?))"
+        params.insert(0, json.dumps([t.upper() for t in tickers]))
+    rows = get_connection().execute(f"""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY scanned_at DESC, id DESC) AS age
+            FROM scan_history {scope}
+        )
+        WHERE age = 1 {''.join(' AND ' + w for w in where)}
+        ORDER BY score DESC, ticker
+    """, params).fetchall()
+    return [dict(r) for r in rows]
+
+
+def history_version() -> tuple[int, int]:
+    """(newest row id, row count) — changes whenever a scan is added or removed."""
+    row = get_connection().execute("SELECT coalesce(MAX(id), 0), COUNT(*) FROM scan_history").fetchone()
+    return row[0], row[1]
+
+
+def scanned_filings(tickers: list[str]) -> set[tuple[str, str]]:
+    """(ticker, filing_date) pairs already in history for these tickers."""
+    rows = get_connection().execute(
+        "SELECT DISTINCT ticker, filing_date FROM scan_history "
+        "WHERE ticker IN (SELECT value FROM json_each(?)) AND filing_date IS NOT NULL",
+        (json.dumps([t.upper() for t in tickers]),)).fetchall()
+    return {(r["ticker"], r["filing_date"]) for r in rows}
@@ -0,0 +1,201 @@
+"""Streaming HTML → text for 10-K filings — one pass, no DOM, stops at the char budget."""
+
+import re
+from html.parser import HTMLParser
+
+# Subtrees dropped entirely: scripts, styles and inline-XBRL metadata
+SKIP_TAGS = frozenset({
+    "script", "style", "ix:nonfraction", "ix:nonnumeric",
+    "ix:header", "ix:hidden", "ix:references",
+})
+
+# Elements that never take an end tag, so are never left open
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+})
+
+# Where an unterminated <script>/<style> is taken to have ended, failing its
+# parent's end tag
+BLOCK_TAGS = ("div", "p", "table", "tr", "td", "th", "ul", "ol", "li", "dl", "pre",
+              "blockquote", "center", "section", "article", "form", "body",
+              "h1", "h2", "h3", "h4", "h5", "h6")
+
+# Raw text a <script>/<style> may hold before it is treated as unterminated
+MAX_RAW_TEXT = 1 << 20
+
+_RULE_RE = re.compile(r"[_=\-]{10,}")
+_BLOCK_START_RE = re.compile(r"<(?:%s)(?=[\s/>])" % "|".join(BLOCK_TAGS), re.IGNORECASE)
+
+
+class TextExtractor(HTMLParser):
+    """Incremental filing cleaner.
+
+    Produces the same text as the old BeautifulSoup pipeline (get_text with
+    newline separators, stripped non-empty lines, rules of _/=/- removed,
+    runs of blank lines collapsed) without building a tree. Feed it chunks
+    and check `done`: once `max_chars` of clean text exist, the rest of the
+    document cannot change the result and parsing can stop.
+
+    Only a stack of open tag names is kept. As with BeautifulSoup, an end
+    tag closes every element opened inside it, so a skipped element that
+    is never closed ends with its parent instead of swallowing the rest of
+    the filing. An unterminated <script>/<style> (whose content the parser
+    reads as raw text) ends at its parent's end tag or the next block-level
+    tag, once MAX_RAW_TEXT has piled up or the document ends.
+    """
+
+    def __init__(self, max_chars: int | None = None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._skip_depth = 0  # skipped elements in _open
+        self._open: list[str] = []
+        self._pending: list[str] = []  # data of the current text node
+        self._out: list[str] = []
+        self._length = 0
+        self._blank_lines = 0
+        self._started = False
+
+    # ── HTMLParser hooks ──────────────────────────────────────────────────────
+
+    def feed(self, data):
+        super().feed(data)
+        while self._end_raw_text(min_pending=MAX_RAW_TEXT):
+            pass
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in VOID_TAGS:
+            return
+        self._open.append(tag)
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()  # self-closing tags have no content to skip
+
+    def handle_endtag(self, tag):
+        self._flush()
+        # Close the innermost open element of this name and everything left
+        # open inside it; an end tag with nothing to close is ignored
+        for depth in range(len(self._open) - 1, -1, -1):
+            if self._open[depth] == tag:
+                self._close_to(depth)
+                return
+
+    def handle_data(self, data):
+        if not self._skip_depth and not self.done:
+            self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        # CDATA sections count as text, as they did with BeautifulSoup
+        if data.upper().startswith("CDATA[") and not self._skip_depth:
+            self._pending.append(data[len("CDATA["):])
+            self._flush()
+
+    # ── Open elements ─────────────────────────────────────────────────────────
+
+    def _close_to(self, depth: int):
+        while len(self._open) > depth:
+            if self._open.pop() in SKIP_TAGS:
+                self._skip_depth -= 1
+
+    # ── Unterminated raw text ─────────────────────────────────────────────────
+    # HTMLParser has no public way out of the raw-text mode it enters for
+    # <script>/<style>, so _end_raw_text is the one place that touches its
+    # internals (cdata_elem, rawdata, clear_cdata_mode). Should they be
+    # missing, recovery is skipped and the element runs to the end of the
+    # document, which is what the parser would do on its own.
+
+    def _end_raw_text(self, min_pending: int = 0) -> bool:
+        """End an unterminated <script>/<style> and parse what follows it as markup.
+
+        Only acts once more than `min_pending` characters of raw text are
+        buffered. Returns False if there is nothing to end, or no parent end
+        tag or block-level tag to end it at, in which case everything after
+        it stays dropped.
+        """
+        try:
+            raw = self.rawdata if self.cdata_elem else None
+            clear_cdata_mode = self.clear_cdata_mode
+        except AttributeError:
+            return False
+        if raw is None or len(raw) <= min_pending:
+            return False
+        parent = self._open[-2] if len(self._open) > 1 else None
+        m = re.search(r"</\s*%s\s*>" % re.escape(parent), raw, re.IGNORECASE) if parent else None
+        m = m or _BLOCK_START_RE.search(raw)
+        if m is None:
+            return False
+        self.rawdata = ""
+        clear_cdata_mode()
+        self._close_to(len(self._open) - 1)
+        super().feed(raw[m.start():])
+        return True
+
+    # ── Output ────────────────────────────────────────────────────────────────
+
+    def _flush(self):
+        if not self._pending:
+            return
+        node = "".join(self._pending)
+        self._pending = []
+        if self.done:
+            return
+        for line in node.splitlines():
+            line = line.strip()
+            if line:
+                self._emit(_RULE_RE.sub("", line))
+
+    def _emit(self, line: str):
+        if not line:
+            self._blank_lines += 1
+            return
+        # Equivalent of "\n".join(lines) followed by re.sub(r"\n{3,}", "\n\n")
+        if self._started:
+            sep = "\n" * min(self._blank_lines + 1, 2)
+        else:
+            sep = "\n" * min(self._blank_lines, 2)
+            self._started = True
+        self._blank_lines = 0
+        self._out.append(sep + line)
+        self._length += len(sep) + len(line)
+        if self.max_chars is not None and self._length >= self.max_chars:
+            self.done = True
+
+    def text(self) -> str:
+        """Finish parsing and return the cleaned text."""
+        while not self.done and self._end_raw_text():
+            pass
+        if not self.done:
+            self.close()
+        self._flush()
+        if self._started:
+            tail = "\n" * min(self._blank_lines, 2)
+        else:
+            tail = "\n" * min(max(self._blank_lines - 1, 0), 2)
+        text = "".join(self._out) + (tail if not self.done else "")
+        if self.max_chars is not None and len(text) > self.max_chars:
+            text = text[:self.max_chars]
+        return text
+
+
+def html_to_text(html: str, max_chars: int | None = None, chunk_size: int = 1 << 20) -> str:
+    """Clean a whole HTML document, stopping early once max_chars is reached."""
+    parser = TextExtractor(max_chars=max_chars)
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        if parser.done:
+            break
+    return parser.text()
@@ -0,0 +1,149 @@
+"""Incremental year-over-year analysis — re-score only what changed since the last cached 10-K."""
+
+import hashlib
+import json
+
+from sec_scanner.analyzer import (
+    BATCH_PROMPT_TEMPLATE, RUBRIC, SINGLE_OUTPUT, _build_result, _cached_analysis,
+    _context_block, _parse_output, analysis_fingerprint, analyze_filing,
+)
+from sec_scanner.executor import get_executor
+from sec_scanner.sections import ai_term_count
+
+# More new/changed AI text than this and a full re-analysis is cheaper to trust
+DELTA_MAX_CHARS = 40_000
+# Dropped passages are context only; send at most this much of them
+REMOVED_MAX_CHARS = 8_000
+
+DELTA_PROMPT_TEMPLATE = """You are updating last year's assessment of a SEC 10-K filing for evidence of genuine AI adoption vs. AI washing.
+
+Company: {ticker} — {company}
+Filing date: {date} (previous filing: {previous_date})
+
+PREVIOUS ASSESSMENT ({previous_date}):
+{previous}
+
+Most of the new filing repeats the previous one. Below are only the AI-related passages that are
+new or reworded, and the AI-related passages that were dropped. Start from the previous assessment
+and adjust it for these changes; keep findings that still hold.
+
+""" + RUBRIC + """
+
+Also include "changes": 2-4 short statements on what changed in the company's AI disclosure since
+{previous_date} and how it moved the scores.
+
+""" + SINGLE_OUTPUT + """
+
+NEW OR CHANGED AI-RELATED PASSAGES:
+{added}
+
+DROPPED AI-RELATED PASSAGES:
+{removed}"""
+
+
+def _paragraphs(text: str) -> list[tuple[bytes, str]]:
+    """(hash, paragraph) pairs; whitespace is normalized so re-wrapping isn't a change."""
+    out = []
+    for line in text.split("\n"):
+        p = " ".join(line.split())
+        if p:
+            out.append((hashlib.blake2b(p.encode("utf-8"), digest_size=16).digest(), p))
+    return out
+
+
+def diff_paragraphs(old_text: str, new_text: str) -> tuple[list[str], list[str]]:
+    """AI-relevant paragraphs added to and dropped from a filing, each in filing order."""
+    old = _paragraphs(old_text)
+    new = _paragraphs(new_text)
+    old_hashes = {h for h, _ in old}
+    new_hashes = {h for h, _ in new}
+
+    def pick(paragraphs, other):
+        seen = set()
+        out = []
+        for h, p in paragraphs:
+            if h not in other and h not in seen and ai_term_count(p):
+                seen.add(h)
+                out.append(p)
+        return out
+
+    return pick(new, old_hashes), pick(old, new_hashes)
+
+
+def _clip(paragraphs: list[str], max_chars: int) -> str:
+    out = []
+    used = 0
+    for p in paragraphs:
+        if used + len(p) > max_chars:
+            out.append(f"({len(paragraphs) - len(out)} more not shown)")
+            break
+        out.append(p)
+        used += len(p) + 1
+    return "\n\n".join(out) or "(none)"
+
+
+def analyze_incremental(filing: dict, reanalyze_if_stale: bool = False, fallback=analyze_filing) -> dict | None:
+    """Re-score a filing from last year's analysis plus the AI passages that changed.
+
+    Needs an earlier filing for the ticker in the cache, analyzed. Without
+    one, or when too much AI text changed, fallback(filing) does a full
+    analysis instead. The result carries a "changes" list for history.
+    """
+    from sec_scanner.cache import previous_filing, save_analysis
+
+    ticker = filing["ticker"]
+    previous = previous_filing(ticker, filing["date"])
+    if not previous or not previous["analysis"]:
+        return fallback(filing, reanalyze_if_stale=reanalyze_if_stale)
+
+    text = filing.get("full_text") or filing["text"]
+    prior = previous["analysis"]
+    fingerprint = analysis_fingerprint(
+        {"text": "|".join([text, previous["date"], json.dumps(prior, sort_keys=True)])},
+        DELTA_PROMPT_TEMPLATE,
+    )
+    fresh = [fingerprint, analysis_fingerprint(filing), analysis_fingerprint(filing, BATCH_PROMPT_TEMPLATE)]
+    # A full analysis from the current inputs beats a delta; stale ones count only if they were deltas too
+    cached = _cached_analysis(filing, reanalyze_if_stale, fresh, mode="incremental")
+    if cached:
+        return cached
+
+    added, removed = diff_paragraphs(previous["text"], text)
+    print(f"  [{ticker}] Incremental: {len(added)} new/changed and {len(removed)} dropped AI passages "
+          f"since {previous['date']}")
+
+    if not added and not removed:
+        # AI disclosure is word-for-word last year's; so is the assessment
+        result = {**prior, "date": filing["date"], "company": filing["company"],
+                  "changes": [f"No changes to AI-related disclosure since {previous['date']}"],
+                  "previous": {"date": previous["date"], "score": prior.get("score")}}
+    elif sum(len(p) for p in added) > DELTA_MAX_CHARS:
+        print(f"  [{ticker}] Too much changed for an incremental update — running full analysis")
+        return fallback(filing, reanalyze_if_stale=reanalyze_if_stale)
+    else:
+        summary = {k: prior.get(k) for k in ("score", "verdict", "scores", "findings", "flags",
+                                              "takeaway", "disclosure_style")}
+        prompt = _context_block() + DELTA_PROMPT_TEMPLATE.format(
+            ticker=ticker,
+            company=filing["company"],
+            date=filing["date"],
+            previous_date=previous["date"],
+            previous=json.dumps(summary, indent=2),
+            added=_clip(added, DELTA_MAX_CHARS),
+            removed=_clip(removed, REMOVED_MAX_CHARS),
+        )
+        print(f"  [{ticker}] Running incremental Claude analysis...")
+        output = get_executor().run(prompt, label=ticker)
+        if output is None:
+            return None
+        parsed = _parse_output(output, ticker)
+        if parsed is None:
+            return None
+        result = _build_result(filing, parsed)
+        result["changes"] = [str(c) for c in parsed.get("changes", []) if c]
+        result["previous"] = {"date": previous["date"], "score": prior.get("score")}
+
+    result["mode"] = "incremental"
+    save_analysis(ticker, filing["date"], filing.get("url", ""), result, fingerprint=fingerprint)
+    print(f"  [{ticker}] Analysis cached")
+    return result
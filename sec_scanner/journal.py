@@ -0,0 +1,205 @@
+"""Run journal — per-ticker stage state so an interrupted scan can pick up where it stopped.
+
+Lives in scan_journal.db next to scan_history.db. Workers never touch
+SQLite themselves: each state change is queued to one writer thread that
+commits them in batches, so journaling never makes a fetch or analysis
+worker wait on a lock.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    status      TEXT NOT NULL,          -- running | complete | interrupted
+    argv_json   TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id      TEXT NOT NULL,
+    ticker      TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    stage       TEXT NOT NULL,          -- pending | fetched | analyzed | saved | failed
+    filing_json TEXT,                   -- company, date and url once fetched (no text)
+    result_json TEXT,                   -- analysis result once analyzed
+    error       TEXT,                   -- "<stage>: <reason>" when failed
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (run_id, ticker)
+);
+"""
+
+_STOP = object()
+
+
+def journal_path() -> Path:
+    from sec_scanner import history
+    return Path(history.DB_PATH).with_name("scan_journal.db")
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def latest_run_id(path: Path | None = None) -> str | None:
+    conn = _connect(path or journal_path())
+    try:
+        row = conn.execute("SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+class Journal:
+    """Stage log for one run. Use start() for a new run, resume() to continue one."""
+
+    def __init__(self, run_id: str, path: Path | None = None):
+        self.run_id = run_id
+        self.path = path or journal_path()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="journal", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def start(cls, tickers: list[str], argv: list[str], path: Path | None = None) -> "Journal":
+        run_id = f"{datetime.now():%Y%m%d-%H%M%S}-{os.urandom(2).hex()}"
+        journal = cls(run_id, path)
+        now = time.time()
+        journal._put("INSERT INTO runs (run_id, started_at, status, argv_json) VALUES (?, ?, 'running', ?)",
+                     (run_id, now, json.dumps(argv)))
+        for position, ticker in enumerate(tickers):
+            journal._put("INSERT INTO jobs (run_id, ticker, position, stage, updated_at) "
+                         "VALUES (?, ?, ?, 'pending', ?)", (run_id, ticker, position, now))
+        return journal
+
+    @classmethod
+    def resume(cls, run_id: str, path: Path | None = None) -> tuple["Journal", list[dict]] | None:
+        """Reopen a run; returns the journal and its jobs in watchlist order, or None if unknown."""
+        path = path or journal_path()
+        conn = _connect(path)
+        try:
+            if conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is None:
+                return None
+            rows = conn.execute(
+                "SELECT ticker, stage, filing_json, result_json, error FROM jobs "
+                "WHERE run_id = ? ORDER BY position", (run_id,)).fetchall()
+        finally:
+            conn.close()
+        jobs = [{"ticker": t, "stage": s, "filing": json.loads(f) if f else None,
+                 "result": json.loads(r) if r else None, "error": e} for t, s, f, r, e in rows]
+        journal = cls(run_id, path)
+        journal._put("UPDATE runs SET status = 'running', finished_at = NULL WHERE run_id = ?", (run_id,))
+        return journal, jobs
+
+    # ── Stage changes (non-blocking) ──────────────────────────────────────────
+
+    def _put(self, sql: str, params: tuple):
+        self._queue.put((sql, params))
+
+    def _job(self, ticker: str, stage: str, **columns):
+        sets = ", ".join(f"{c} = ?" for c in columns)
+        self._put(f"UPDATE jobs SET stage = ?, updated_at = ?{', ' if sets else ''}{sets} "
+                  f"WHERE run_id = ? AND ticker = ?",
+                  (stage, time.time(), *columns.values(), self.run_id, ticker))
+
+    def fetched(self, ticker: str, filing: dict):
+        meta = {k: filing.get(k) for k in ("company", "date", "url")}
+        self._job(ticker, "fetched", filing_json=json.dumps(meta), error=None)
+
+    def analyzed(self, ticker: str, result: dict):
+        self._job(ticker, "analyzed", result_json=json.dumps(result), error=None)
+
+    def saved(self, ticker: str):
+        self._job(ticker, "saved")
+
+    def failed(self, ticker: str, stage: str, reason: str):
+        self._job(ticker, "failed", error=f"{stage}: {reason}"[:500])
+
+    def finish(self, status: str = "complete"):
+        """Mark the run finished and wait until everything is on disk."""
+        self._put("UPDATE runs SET status = ?, finished_at = ? WHERE run_id = ?",
+                  (status, time.time(), self.run_id))
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    # ── Pipeline hooks ────────────────────────────────────────────────────────
+
+    def wrap_fetch(self, fetch):
+        def _fetch(ticker):
+            try:
+                filing = fetch(ticker)
+            except Exception as e:
+                self.failed(ticker, "fetch", str(e))
+                raise
+            if filing:
+                self.fetched(ticker, filing)
+            else:
+                self.failed(ticker, "fetch", "no 10-K filing found")
+            return filing
+        return _fetch
+
+    def wrap_analyze(self, analyze):
+        def _analyze(filing):
+            try:
+                result = analyze(filing)
+            except Exception as e:
+                self.failed(filing["ticker"], "analyze", str(e))
+                raise
+            self._record_analysis(filing, result)
+            return result
+        return _analyze
+
+    def wrap_analyze_batch(self, analyze_batch):
+        def _analyze_batch(filings):
+            try:
+                results = analyze_batch(filings)
+            except Exception as e:
+                for filing in filings:
+                    self.failed(filing["ticker"], "analyze", str(e))
+                raise
+            for filing, result in zip(filings, results):
+                self._record_analysis(filing, result)
+            return results
+        return _analyze_batch
+
+    def _record_analysis(self, filing: dict, result: dict | None):
+        if result:
+            self.analyzed(filing["ticker"], result)
+        else:
+            self.failed(filing["ticker"], "analyze", "analysis failed")
+
+    # ── Writer thread ─────────────────────────────────────────────────────────
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stop = True
+                batch = [b for b in batch if b is not _STOP]
+            if batch:
+                try:
+                    with conn:
+                        conn.execute("BEGIN IMMEDIATE")
+                        for sql, params in batch:
+                            conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    print(f"  WARNING: run journal write failed: {e}")
+        conn.close()
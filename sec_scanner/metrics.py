@@ -0,0 +1,139 @@
+"""Spans and counters for a scan run — where the time went, in-process and near-free when off.
+
+Instrumented code calls `span(name)` / `incr(name)` unconditionally; until
+`enable()` is called both return immediately (span hands back a shared
+no-op context manager), so the disabled cost is one global lookup.
+"""
+
+import functools
+import threading
+import time
+from collections import Counter, defaultdict
+
+_enabled = False
+_lock = threading.Lock()
+_spans: dict[str, list[float]] = defaultdict(list)
+_counters: Counter = Counter()
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def span(name: str):
+    """Context manager timing the block under `name`."""
+    return _Span(name) if _enabled else _NO_SPAN
+
+
+def record(name: str, seconds: float):
+    """Add one measured duration to span `name`."""
+    if _enabled:
+        with _lock:
+            _spans[name].append(seconds)
+
+
+def timed(name: str):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def incr(name: str, n: int = 1):
+    if _enabled:
+        with _lock:
+            _counters[name] += n
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] if ordered else 0.0
+
+
+def snapshot() -> dict:
+    """Spans (count, total, p50, p95, max seconds), counters and derived ratios."""
+    with _lock:
+        spans = {name: sorted(values) for name, values in _spans.items()}
+        counters = dict(_counters)
+    out = {
+        "spans": {
+            name: {
+                "count": len(v),
+                "total": round(sum(v), 6),
+                "p50": round(_percentile(v, 50), 6),
+                "p95": round(_percentile(v, 95), 6),
+                "max": round(v[-1], 6),
+            } for name, v in sorted(spans.items())
+        },
+        "counters": dict(sorted(counters.items())),
+    }
+    ratios = {}
+    for kind in ("filing", "analysis"):
+        hits, misses = counters.get(f"cache.{kind}_hits", 0), counters.get(f"cache.{kind}_misses", 0)
+        if hits + misses:
+            ratios[f"cache.{kind}_hit_ratio"] = round(hits / (hits + misses), 4)
+    out["ratios"] = ratios
+    return out
+
+
+def summary_table(snap: dict | None = None) -> str:
+    """Human-readable version of snapshot()."""
+    snap = snap or snapshot()
+    lines = [f"  {'span':<24} {'count':>6} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+    for name, s in snap["spans"].items():
+        lines.append(f"  {name:<24} {s['count']:>6} {s['total']:>9.2f} {s['p50'] * 1000:>9.1f} "
+                     f"{s['p95'] * 1000:>9.1f} {s['max'] * 1000:>9.1f}")
+    if snap["counters"] or snap["ratios"]:
+        lines.append("")
+        for name, value in {**snap["counters"], **snap["ratios"]}.items():
+            if name.endswith("bytes"):
+                value = f"{value / 1024 ** 2:.1f} MB"
+            elif name.endswith("ratio"):
+                value = f"{value:.0%}"
+            lines.append(f"  {name:<24} {value:>9}")
+    return "\n".join(lines)
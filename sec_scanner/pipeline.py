@@ -0,0 +1,169 @@
+"""Pipelined fetch → analyze scheduler — overlaps EDGAR I/O with Claude calls."""
+
+import queue
+import threading
+
+from sec_scanner import metrics
+
+_DONE = object()
+
+
+def run_pipeline(
+    tickers: list[str],
+    fetch,
+    analyze,
+    fetch_workers: int = 2,
+    analyze_workers: int = 2,
+    queue_size: int | None = None,
+    on_result=None,
+    analyze_batch=None,
+    batch_size: int = 1,
+    batch_chars: int | None = None,
+    batch_wait: float = 1.0,
+) -> list[tuple[str, dict | None, dict | None]]:
+    """Run fetch and analyze concurrently, feeding filings through a bounded queue.
+
+    Fetch workers pull tickers and push fetched filings onto a queue that the
+    analysis workers drain, so the first analysis starts as soon as the first
+    filing lands. The queue is bounded (default: 2 × analyze_workers) so fast
+    fetchers can't run arbitrarily far ahead of analysis.
+
+    Args:
+        tickers: ticker symbols, in the order results should be reported
+        fetch: callable(ticker) -> filing dict or None
+        analyze: callable(filing) -> result dict or None
+        fetch_workers: number of concurrent fetch threads
+        analyze_workers: number of concurrent analysis threads
+        queue_size: max filings waiting for analysis
+        on_result: optional callable(ticker, filing, result), invoked once per
+            ticker in watchlist order as soon as that ticker and every ticker
+            before it have finished; an exception it raises is logged and
+            the remaining results are still emitted
+        analyze_batch: optional callable(list of filings) -> list of results;
+            when given with batch_size > 1, each analysis worker gathers up to
+            batch_size filings (and at most batch_chars of filing text) and
+            analyzes them together
+        batch_size: max filings per analyze_batch call
+        batch_chars: max combined filing text per batch (None: unlimited)
+        batch_wait: seconds a worker waits for more filings before running a
+            partial batch
+
+    Returns:
+        list of (ticker, filing, result) tuples in watchlist order. filing is
+        None if the fetch failed; result is None if fetch or analysis failed.
+    """
+    fetch_workers = max(1, fetch_workers)
+    analyze_workers = max(1, analyze_workers)
+    if queue_size is None:
+        queue_size = analyze_workers * 2
+
+    outcomes: list[list] = [[t, None, None] for t in tickers]
+    finished = [False] * len(tickers)
+    emit_lock = threading.Lock()
+    next_emit = 0
+
+    def _finish(index: int):
+        # Release results strictly in watchlist order
+        nonlocal next_emit
+        with emit_lock:
+            finished[index] = True
+            while next_emit < len(tickers) and finished[next_emit]:
+                if on_result:
+                    # A failing callback must not kill this worker: the rest
+                    # of the scan would stall behind it
+                    try:
+                        on_result(*outcomes[next_emit])
+                    except Exception as e:
+                        print(f"  [{outcomes[next_emit][0]}] ERROR: result handler failed: {e}")
+                next_emit += 1
+
+    work: queue.Queue = queue.Queue()
+    for i, t in enumerate(tickers):
+        work.put((i, t))
+    filings: queue.Queue = queue.Queue(maxsize=queue_size)
+
+    def _fetch_worker():
+        while True:
+            try:
+                i, ticker = work.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                with metrics.span("stage.fetch"):
+                    filing = fetch(ticker)
+            except Exception as e:
+                print(f"  [{ticker}] ERROR: fetch failed: {e}")
+                filing = None
+            outcomes[i][1] = filing
+            if filing:
+                filings.put((i, filing))  # blocks while analysis is behind
+            else:
+                _finish(i)
+
+    def _analyze_worker():
+        while True:
+            item = filings.get()
+            if item is _DONE:
+                return
+            i, filing = item
+            try:
+                with metrics.span("stage.analyze"):
+                    outcomes[i][2] = analyze(filing)
+            except Exception as e:
+                print(f"  [{filing['ticker']}] ERROR: analysis failed: {e}")
+            _finish(i)
+
+    def _batch_worker():
+        done = False
+        while not done:
+            item = filings.get()
+            if item is _DONE:
+                return
+            batch = [item]
+            chars = len(item[1].get("text", ""))
+            # Top the batch up with whatever arrives shortly; a filing that
+            # would blow the char budget waits for the next batch
+            carry = None
+            while len(batch) < batch_size:
+                try:
+                    item = filings.get(timeout=batch_wait)
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                size = len(item[1].get("text", ""))
+                if batch_chars is not None and chars + size > batch_chars:
+                    carry = item
+                    break
+                batch.append(item)
+                chars += size
+            _analyze_many(batch)
+            if carry is not None:
+                _analyze_many([carry])
+
+    def _analyze_many(batch):
+        try:
+            with metrics.span("stage.analyze_batch"):
+                results = analyze_batch([f for _, f in batch])
+        except Exception as e:
+            print(f"  [{'+'.join(f['ticker'] for _, f in batch)}] ERROR: analysis failed: {e}")
+            results = [None] * len(batch)
+        for (i, _), result in zip(batch, results):
+            outcomes[i][2] = result
+            _finish(i)
+
+    worker = _batch_worker if analyze_batch and batch_size > 1 else _analyze_worker
+    fetchers = [threading.Thread(target=_fetch_worker, daemon=True) for _ in range(fetch_workers)]
+    analyzers = [threading.Thread(target=worker, daemon=True) for _ in range(analyze_workers)]
+    for t in fetchers + analyzers:
+        t.start()
+
+    for t in fetchers:
+        t.join()
+    for _ in analyzers:
+        filings.put(_DONE)
+    for t in analyzers:
+        t.join()
+
+    return [tuple(o) for o in outcomes]
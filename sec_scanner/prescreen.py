@@ -0,0 +1,139 @@
+"""Local AI-term prescreen — settles filings with negligible AI content without calling Claude."""
+
+import re
+from collections import Counter
+
+from sec_scanner import metrics
+from sec_scanner.sections import AI_TERMS_RE
+
+# Filings with fewer AI-term hits than this skip Claude. Off by default: a
+# screened-out filing gets a locally built score that Claude never reviewed,
+# so scanning with the prescreen is opt-in (--prescreen-min-hits N)
+DEFAULT_MIN_HITS = 0
+
+# Threshold --prescreen-only reports against when none is given
+TRIAGE_MIN_HITS = 3
+
+# Chars either side of a hit that count as its context / go into a snippet
+CONTEXT_CHARS = 150
+SNIPPET_CHARS = 120
+MAX_SNIPPETS = 3
+
+# Context that suggests a mention is about something real rather than boilerplate
+CONCRETE_RE = re.compile(
+    r"\$\s?\d|\d+(?:\.\d+)?\s?%|\b(?:revenue|customers?|deployed|deployment|launched|"
+    r"products?|platforms?|partnership|patents?|data ?cent(?:er|re)s?)\b",
+    re.IGNORECASE,
+)
+
+_WS_RE = re.compile(r"\s+")
+
+
+@metrics.timed("prescreen")
+def prescreen(filing: dict) -> dict:
+    """Count AI terms in the cleaned filing and grade the context around them.
+
+    Scans the full cleaned text when the fetcher kept it, otherwise the
+    prompt text. Returns hits, hits in concrete context (money, percentages,
+    products, customers...), per-term counts and a few evidence snippets.
+    """
+    text = filing.get("full_text") or filing.get("text", "")
+    terms: Counter = Counter()
+    concrete = []
+    plain = []
+    for m in AI_TERMS_RE.finditer(text):
+        terms[m.group(0).lower()] += 1
+        window = text[max(0, m.start() - CONTEXT_CHARS):m.end() + CONTEXT_CHARS]
+        (concrete if CONCRETE_RE.search(window) else plain).append(m)
+
+    snippets = []
+    last_end = -1
+    for m in sorted(concrete, key=lambda m: m.start()) + plain:
+        if len(snippets) >= MAX_SNIPPETS:
+            break
+        if m.start() < last_end:  # already inside a previous snippet
+            continue
+        start = max(0, m.start() - SNIPPET_CHARS)
+        end = min(len(text), m.end() + SNIPPET_CHARS)
+        snippets.append(("…" if start else "") + _WS_RE.sub(" ", text[start:end]).strip()
+                        + ("…" if end < len(text) else ""))
+        last_end = end
+
+    hits = sum(terms.values())
+    return {
+        "ticker": filing["ticker"],
+        "hits": hits,
+        "concrete": len(concrete),
+        "per_10k": round(hits * 10_000 / max(len(text), 1), 2),
+        "terms": dict(terms.most_common()),
+        "snippets": snippets,
+    }
+
+
+def screened_out_result(filing: dict, screen: dict, min_hits: int) -> dict:
+    """Deterministic analyze_filing-shaped result for a filing below the threshold."""
+    hits = screen["hits"]
+    if hits:
+        top = ", ".join(f'"{t}" ×{n}' for t, n in list(screen["terms"].items())[:3])
+        findings = [f"Only {hits} AI-term mention{'s' if hits != 1 else ''} in the filing ({top})"]
+        findings += [f"Evidence: {s}" for s in screen["snippets"]]
+    else:
+        findings = ["No AI-related terms found in the filing text"]
+    return {
+        "ticker": filing["ticker"],
+        "company": filing["company"],
+        "score": 0,
+        "verdict": "Strong AI Washing",
+        "scores": {"SPECIFICITY": 0, "FINANCIAL_IMPACT": 0, "INTEGRATION_DEPTH": 0,
+                   "COMPETITIVE_MOAT": 0, "EXECUTION_EVIDENCE": 0},
+        "findings": findings,
+        "flags": [
+            f"Below the prescreen threshold of {min_hits} AI-term mentions",
+            "Scored locally — not reviewed by Claude",
+        ],
+        "takeaway": "The 10-K says almost nothing about AI, so there is no adoption story to "
+                    "evaluate. Any AI positioning elsewhere is not backed by the filing.",
+        "disclosure_style": "standard",
+        "date": filing["date"],
+        "prescreen": screen,
+    }
+
+
+def screened(analyze, min_hits: int = DEFAULT_MIN_HITS):
+    """Wrap analyze(filing) so filings below min_hits never reach Claude."""
+    if min_hits <= 0:
+        return analyze
+
+    def _analyze(filing: dict):
+        screen = prescreen(filing)
+        if screen["hits"] < min_hits:
+            print(f"  [{filing['ticker']}] Prescreen: {screen['hits']} AI-term hits — skipping Claude")
+            metrics.incr("prescreen.skipped")
+            return screened_out_result(filing, screen, min_hits)
+        return analyze(filing)
+
+    return _analyze
+
+
+def screened_batch(analyze_batch, min_hits: int = DEFAULT_MIN_HITS):
+    """Same as screened, for analyze_batch(filings) -> results."""
+    if min_hits <= 0:
+        return analyze_batch
+
+    def _analyze_batch(filings: list[dict]):
+        results = [None] * len(filings)
+        keep = []
+        for i, filing in enumerate(filings):
+            screen = prescreen(filing)
+            if screen["hits"] < min_hits:
+                print(f"  [{filing['ticker']}] Prescreen: {screen['hits']} AI-term hits — skipping Claude")
+                metrics.incr("prescreen.skipped")
+                results[i] = screened_out_result(filing, screen, min_hits)
+            else:
+                keep.append(i)
+        if keep:
+            for i, result in zip(keep, analyze_batch([filings[i] for i in keep])):
+                results[i] = result
+        return results
+
+    return _analyze_batch
@@ -0,0 +1,121 @@
+"""Token-bucket rate limiter shared across threads and processes (SEC EDGAR: 10 req/s)."""
+
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows — limiter is still thread-safe, just not cross-process
+    fcntl = None
+
+from sec_scanner.cache import CACHE_DIR
+
+STATE_PATH = CACHE_DIR / "edgar_ratelimit.state"
+
+# SEC allows 10 requests/second. A token bucket admits at most burst + rate
+# requests in any one-second window, so 8/s with a burst of 2 never exceeds it.
+DEFAULT_RATE = 8.0
+DEFAULT_BURST = 2
+
+
+class TokenBucket:
+    """Token bucket whose state lives in a lock-protected file.
+
+    Every process pointing at the same state file draws from one bucket, so
+    parallel scans together stay under the limit. `penalize` pauses all of
+    them at once when EDGAR pushes back with a 429/503.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 state_path: Path | None = STATE_PATH):
+        self.rate = rate
+        self.burst = burst
+        self.state_path = state_path if fcntl else None
+        self._lock = threading.Lock()
+        self._fd = None
+        # In-process state, used when there is no state file
+        self._state = [float(burst), time.time(), 0.0]  # tokens, updated, blocked_until
+
+    def acquire(self):
+        """Block until a request token is available."""
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """Stop every sharer of this bucket from sending requests for `seconds`."""
+        with self._locked_state() as state:
+            state[2] = max(state[2], time.time() + seconds)
+            state[0] = 0.0
+
+    def _try_take(self) -> float:
+        """Take a token if one is available. Returns 0, or seconds to wait."""
+        with self._locked_state() as state:
+            tokens, updated, blocked_until = state
+            now = time.time()
+            if now < blocked_until:
+                return blocked_until - now
+            tokens = min(float(self.burst), tokens + max(0.0, now - updated) * self.rate)
+            state[1] = now
+            if tokens >= 1:
+                state[0] = tokens - 1
+                return 0.0
+            state[0] = tokens
+            return (1 - tokens) / self.rate
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock:
+            if self.state_path is None:
+                yield self._state
+                return
+            if self._fd is None:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                raw = os.read(self._fd, 256).decode("ascii", "ignore").split()
+                try:
+                    state = [float(x) for x in raw[:3]]
+                    if len(state) != 3:
+                        raise ValueError
+                except ValueError:
+                    state = [float(self.burst), time.time(), 0.0]
+                yield state
+                data = " ".join(f"{x:.6f}" for x in state).encode()
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.ftruncate(self._fd, 0)
+                os.write(self._fd, data)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff with jitter, so blocked workers don't retry in lockstep."""
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.5)
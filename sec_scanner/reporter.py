@@ -1,147 +1,249 @@
 """Inject real data into report-template.html."""
 
+import hashlib
 import json
 import os
 import re
-from datetime import date
+from datetime import date, datetime, timezone
+
+from sec_scanner import metrics
+
+# Parts of the template that get real data, found once per template file.
+# Patterns with a group replace just the group; otherwise the whole match.
+SLOTS = {
+    "meta": r"// 10-K Filing Analysis — \d+ Companies — \w+ \d+",
+    "total": r'<span class="stat-label">Companies Scanned</span>\s*<span class="stat-value blue">(\d+)</span>',
+    "genuine": r'<span class="stat-label">Genuine Adopters</span>\s*<span class="stat-value green">(\d+)</span>',
+    "washing": r'<span class="stat-label">AI Washing Caught</span>\s*<span class="stat-value red">(\d+)</span>',
+    "top_score": r'<span class="stat-label">Top Score</span>\s*<span class="stat-value yellow">(\d+)</span>',
+    "top_company": r'<span class="stat-label">Top Score</span>\s*<span class="stat-value yellow">\d+</span>'
+                   r'\s*<span class="stat-sub">(.*?)</span>',
+    "notes": r'<div class="analyst-note-header">.*?</div>(\s*<p>.*?)(?=\s*</div>\s*<!--\s*Methodology)',
+    "data": r"const data = \[.*?\];\s*const dataUrl = null;",
+}
+
+# Entry fields copied into the page (or the JSON sidecar)
+FIELDS = ("ticker", "company", "score", "verdict", "date", "scores", "findings", "flags", "takeaway")
+
+_compiled: dict[tuple[str, int], list] = {}
+
+
+def find_template() -> str:
+    # Look for template relative to this file, then in cwd
+    here = os.path.dirname(os.path.abspath(__file__))
+    candidates = [
+        os.path.join(here, "..", "report-template.html"),
+        os.path.join(os.getcwd(), "report-template.html"),
+    ]
+    for c in candidates:
+        if os.path.exists(c):
+            return c
+    raise FileNotFoundError("Could not find report-template.html")
+
+
+def compile_template(template_path: str) -> list:
+    """Split the template into literal text and (slot, original text) pairs.
+
+    Cached per file and modification time, so a long-lived process parses
+    the template once and still picks up edits to it.
+    """
+    key = (os.path.abspath(template_path), os.stat(template_path).st_mtime_ns)
+    parts = _compiled.get(key)
+    if parts is not None:
+        return parts
+
+    with open(template_path, "r") as f:
+        html = f.read()
+    spans = []
+    for name, pattern in SLOTS.items():
+        m = re.search(pattern, html, flags=re.DOTALL)
+        if m:
+            group = 1 if m.re.groups else 0
+            spans.append((m.start(group), m.end(group), name))
+    spans.sort()
+
+    parts, pos = [], 0
+    for start, end, name in spans:
+        parts.append(html[pos:start])
+        parts.append((name, html[start:end]))
+        pos = end
+    parts.append(html[pos:])
+    _compiled.clear()
+    _compiled[key] = parts
+    return parts
+
+
+def _entry(r: dict) -> dict:
+    entry = {k: r[k] for k in FIELDS}
+    entry["disclosure_style"] = r.get("disclosure_style", "standard")
+    return entry
+
+
+def _write_entries(f, results: list[dict]):
+    """Stream results as a compact JSON array, one entry per line."""
+    f.write("[")
+    for i, r in enumerate(results):
+        # "</" would end the inline <script> early
+        f.write(("\n" if i == 0 else ",\n") + json.dumps(_entry(r)).replace("</", "<\\/"))
+    f.write("\n]")
+
+
+def _notes_html(results: list[dict]) -> str | None:
+    # Remove hardcoded analyst notes (they're specific to the sample data)
+    # Replace with a generic note based on actual results
+    if not results:
+        return None
+    top_washer = [r for r in results if r["score"] < 40]
+    top_genuine = [r for r in results if r["score"] >= 60]
+
+    notes = []
+    if top_genuine:
+        best = top_genuine[0]
+        notes.append(
+            f'<p><strong>{best["ticker"]} — Top Scorer ({best["score"]}/100).</strong> '
+            f'{best["takeaway"]}</p>'
+        )
+    if top_washer:
+        worst = top_washer[-1]
+        notes.append(
+            f'<p><strong>{worst["ticker"]} — Lowest Score ({worst["score"]}/100).</strong> '
+            f'{worst["takeaway"]}</p>'
+        )
+    return "\n    " + "\n    ".join(notes)
 
 
-def generate_report(results: list[dict], output_path: str, template_path: str | None = None) -> str:
+@metrics.timed("report.render")
+def generate_report(results: list[dict], output_path: str, template_path: str | None = None,
+                    data_path: str | None = None) -> str:
     """Generate HTML report from analysis results.
 
     Args:
         results: list of analysis result dicts
         output_path: where to write the HTML file
         template_path: path to report-template.html (auto-detected if None)
+        data_path: if given, write the results there as compact JSON and have
+            the page fetch it on load instead of inlining them, which keeps
+            the HTML small for large watchlists (the page must then be
+            served over HTTP)
 
     Returns:
         The output file path.
     """
-    if template_path is None:
-        # Look for template relative to this file, then in cwd
-        here = os.path.dirname(os.path.abspath(__file__))
-        candidates = [
-            os.path.join(here, "..", "report-template.html"),
-            os.path.join(os.getcwd(), "report-template.html"),
-        ]
-        for c in candidates:
-            if os.path.exists(c):
-                template_path = c
-                break
-        else:
-            raise FileNotFoundError("Could not find report-template.html")
-
-    with open(template_path, "r") as f:
-        html = f.read()
+    parts = compile_template(template_path or find_template())
 
     # Sort results by score descending
     results = sorted(results, key=lambda r: r["score"], reverse=True)
 
-    # Build the JS data array
-    js_entries = []
-    for r in results:
-        entry = {
-            "ticker": r["ticker"],
-            "company": r["company"],
-            "score": r["score"],
-            "verdict": r["verdict"],
-            "date": r["date"],
-            "scores": r["scores"],
-            "findings": r["findings"],
-            "flags": r["flags"],
-            "takeaway": r["takeaway"],
-            "disclosure_style": r.get("disclosure_style", "standard"),
-        }
-        js_entries.append(entry)
-
-    js_data = "const data = " + json.dumps(js_entries, indent=2) + ";"
-
-    # Replace the hardcoded data array (use lambda to avoid re escape issues)
-    html = re.sub(
-        r"const data = \[.*?\];",
-        lambda m: js_data,
-        html,
-        flags=re.DOTALL,
-    )
-
-    # Update summary stats
     total = len(results)
-    genuine = sum(1 for r in results if r["score"] >= 60)
-    washing = sum(1 for r in results if r["score"] < 40)
     top = results[0] if results else None
+    values = {
+        "meta": f"// 10-K Filing Analysis — {total} Companies — {date.today().strftime('%b %Y')}",
+        "total": str(total),
+        "genuine": str(sum(1 for r in results if r["score"] >= 60)),
+        "washing": str(sum(1 for r in results if r["score"] < 40)),
+        "top_score": str(top["score"]) if top else None,
+        "top_company": f'{top["ticker"]} — {top["company"]}' if top else None,
+        "notes": _notes_html(results),
+    }
+
+    if data_path:
+        tmp = f"{data_path}.tmp"
+        with open(tmp, "w") as f:
+            _write_entries(f, results)
+        os.replace(tmp, data_path)
+        data_url = os.path.relpath(os.path.abspath(data_path), os.path.dirname(os.path.abspath(output_path)))
+
+    # One pass over the compiled template, written straight to disk; the
+    # rename means a dashboard never sees a half-written report
+    tmp = f"{output_path}.tmp"
+    with open(tmp, "w") as f:
+        for part in parts:
+            if isinstance(part, str):
+                f.write(part)
+                continue
+            name, original = part
+            if name == "data":
+                if data_path:
+                    f.write(f"const data = null;\nconst dataUrl = {json.dumps(data_url.replace(os.sep, '/'))};")
+                else:
+                    f.write("const data = ")
+                    _write_entries(f, results)
+                    f.write(";\nconst dataUrl = null;")
+            else:
+                value = values[name]
+                f.write(original if value is None else value)
+    os.replace(tmp, output_path)
 
-    # Update header meta
-    today = date.today().strftime("%b %Y")
-    html = re.sub(
-        r'// 10-K Filing Analysis — \d+ Companies — \w+ \d+',
-        f'// 10-K Filing Analysis — {total} Companies — {today}',
-        html,
-    )
-
-    # Update summary stat values
-    # Companies Scanned
-    html = re.sub(
-        r'(<span class="stat-label">Companies Scanned</span>\s*<span class="stat-value blue">)\d+(</span>)',
-        rf'\g<1>{total}\2',
-        html,
-    )
-
-    # Genuine Adopters
-    html = re.sub(
-        r'(<span class="stat-label">Genuine Adopters</span>\s*<span class="stat-value green">)\d+(</span>)',
-        rf'\g<1>{genuine}\2',
-        html,
-    )
-
-    # AI Washing Caught
-    html = re.sub(
-        r'(<span class="stat-label">AI Washing Caught</span>\s*<span class="stat-value red">)\d+(</span>)',
-        rf'\g<1>{washing}\2',
-        html,
-    )
-
-    # Top Score
-    if top:
-        html = re.sub(
-            r'(<span class="stat-label">Top Score</span>\s*<span class="stat-value yellow">)\d+(</span>)',
-            rf'\g<1>{top["score"]}\2',
-            html,
-        )
-        html = re.sub(
-            r'(<span class="stat-label">Top Score</span>\s*<span class="stat-value yellow">\d+</span>\s*<span class="stat-sub">).*?(</span>)',
-            rf'\1{top["ticker"]} — {top["company"]}\2',
-            html,
-        )
+    return output_path
 
-    # Remove hardcoded analyst notes (they're specific to the sample data)
-    # Replace with a generic note based on actual results
-    if results:
-        top_washer = [r for r in results if r["score"] < 40]
-        top_genuine = [r for r in results if r["score"] >= 60]
-
-        notes = []
-        if top_genuine:
-            best = top_genuine[0]
-            notes.append(
-                f'<p><strong>{best["ticker"]} — Top Scorer ({best["score"]}/100).</strong> '
-                f'{best["takeaway"]}</p>'
-            )
-        if top_washer:
-            worst = top_washer[-1]
-            notes.append(
-                f'<p><strong>{worst["ticker"]} — Lowest Score ({worst["score"]}/100).</strong> '
-                f'{worst["takeaway"]}</p>'
-            )
-
-        notes_html = "\n    ".join(notes)
-        html = re.sub(
-            r'(<div class="analyst-note-header">.*?</div>)\s*<p>.*?(?=\s*</div>\s*<!--\s*Methodology)',
-            rf'\1\n    {notes_html}\n  ',
-            html,
-            flags=re.DOTALL,
-        )
 
-    with open(output_path, "w") as f:
-        f.write(html)
+# ── Reports from stored history ───────────────────────────────────────────────
 
-    return output_path
+def _scan_time(scanned_at: str | None) -> float:
+    """scan_history.scanned_at (UTC, to the millisecond or a plain date) as a timestamp."""
+    try:
+        return datetime.fromisoformat(scanned_at).replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return float("inf")
+
+
+def _history_result(row: dict, analyses: list[dict]) -> dict:
+    """Report entry for a history row; findings and flags come from the cached analysis.
+
+    analyses is the ticker's analysis_history(). The row's analysis is the
+    newest one for its filing date that existed when the row was saved, or
+    failing that (rows from before millisecond scan times, backfills) the
+    newest one for that filing date.
+    """
+    same_filing = [e for e in analyses if e["filing_date"] == row["filing_date"]]  # newest first
+    scanned = _scan_time(row.get("scanned_at"))
+    entry = next((e for e in same_filing if e["created_at"] <= scanned), None) or next(iter(same_filing), None)
+    cached = entry["result"] if entry else {}
+    return {
+        "ticker": row["ticker"],
+        "company": row["company"] or row["ticker"],
+        "score": row["score"],
+        "verdict": row["verdict"],
+        "date": row["filing_date"],
+        "scores": json.loads(row["scores_json"] or "{}"),
+        "findings": cached.get("findings", []),
+        "flags": cached.get("flags", []),
+        "takeaway": row["takeaway"] or "",
+        "disclosure_style": row["disclosure_style"] or "standard",
+    }
+
+
+def report_from_history(output_path: str, data_path: str | None = None, template_path: str | None = None,
+                        force: bool = False, **filters) -> int | None:
+    """Render the latest stored result per ticker, without scanning anything.
+
+    filters are passed to history.latest_results. The inputs (history and
+    analysis cache versions, template, filters, output options) are hashed into
+    <output_path>.inputs; when they match the last render and the report is
+    still there, nothing is read or written and None is returned.
+    Otherwise returns the number of companies in the report.
+    """
+    from sec_scanner import cache, history
+
+    template_path = template_path or find_template()
+    inputs = json.dumps([history.history_version(), str(history.DB_PATH), cache.analyses_version(),
+                         str(cache.CACHE_DIR), os.stat(template_path).st_mtime_ns, sorted(filters.items()),
+                         data_path])
+    digest = hashlib.sha256(inputs.encode("utf-8")).hexdigest()
+    stamp = f"{output_path}.inputs"
+    if not force and os.path.exists(output_path) and (data_path is None or os.path.exists(data_path)):
+        try:
+            with open(stamp) as f:
+                if f.read().strip() == digest:
+                    return None
+        except OSError:
+            pass
+
+    rows = history.latest_results(**filters)
+    # One analysis_history read per ticker, not per row
+    analyses = {t: cache.analysis_history(t) for t in dict.fromkeys(r["ticker"] for r in rows)}
+    results = [_history_result(row, analyses[row["ticker"]]) for row in rows]
+    generate_report(results, output_path, template_path, data_path)
+    with open(stamp, "w") as f:
+        f.write(digest + "\n")
+    return len(results)
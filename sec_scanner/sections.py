@@ -0,0 +1,146 @@
+"""Split a cleaned 10-K into Items and pick the most AI-relevant passages for the prompt."""
+
+import re
+
+# Items worth spending prompt budget on: Business, Risk Factors, MD&A
+DEFAULT_ITEMS = ("1", "1A", "7")
+DEFAULT_CHAR_BUDGET = 80000
+
+# Opening of Item 1 (the business overview) is always included, AI or not
+LEAD_CHARS = 3000
+
+ITEM_TITLES = {
+    "1": "Business",
+    "1A": "Risk Factors",
+    "1B": "Unresolved Staff Comments",
+    "1C": "Cybersecurity",
+    "2": "Properties",
+    "3": "Legal Proceedings",
+    "5": "Market for Registrant's Common Equity",
+    "7": "Management's Discussion and Analysis",
+    "7A": "Quantitative and Qualitative Disclosures About Market Risk",
+    "8": "Financial Statements",
+}
+
+# Acronyms match case-sensitively ("AI", not "said"); phrases match any case
+AI_TERMS_RE = re.compile(
+    r"\b(?:AI|ML|LLMs?|NLP|GenAI|GPUs?"
+    r"|(?i:artificial intelligence|machine learning|deep learning|neural networks?"
+    r"|large language models?|generative|natural language processing|computer vision"
+    r"|chatbots?|copilots?|predictive analytics|inference|autonomous driving"
+    r"|foundation models?|accelerated computing))\b"
+)
+
+_ITEM_HEADING_RE = re.compile(r"^\s*item\s+(\d{1,2}[a-c]?)\b\.?", re.IGNORECASE)
+_MAX_HEADING_LEN = 120
+
+
+def split_items(text: str) -> dict[str, list[str]]:
+    """Split cleaned filing text into {item id: paragraphs}.
+
+    Item headings appear twice — once in the table of contents and once
+    before the real section — so for each item the longest segment wins.
+    Items come back in the order their winning segments appear in the
+    filing. Text before the first heading is returned under "cover". If no
+    headings are found the whole filing comes back under "filing".
+    """
+    lines = text.split("\n")
+    headings = []
+    for i, line in enumerate(lines):
+        if len(line) <= _MAX_HEADING_LEN:
+            m = _ITEM_HEADING_RE.match(line)
+            if m:
+                headings.append((i, m.group(1).upper()))
+
+    if not headings:
+        return {"filing": [l for l in lines if l.strip()]}
+
+    found: dict[str, tuple[int, int, list[str]]] = {}  # item -> (size, start line, paragraphs)
+    for n, (start, item) in enumerate(headings):
+        end = headings[n + 1][0] if n + 1 < len(headings) else len(lines)
+        body = [l for l in lines[start + 1:end] if l.strip()]
+        size = sum(len(l) for l in body)
+        if item not in found or size > found[item][0]:
+            found[item] = (size, start, body)
+
+    sections: dict[str, list[str]] = {"cover": [l for l in lines[:headings[0][0]] if l.strip()]}
+    for item, (_, _, body) in sorted(found.items(), key=lambda kv: kv[1][1]):
+        sections[item] = body
+    return sections
+
+
+def ai_term_count(text: str) -> int:
+    return sum(1 for _ in AI_TERMS_RE.finditer(text))
+
+
+def extract_relevant(text: str, char_budget: int = DEFAULT_CHAR_BUDGET,
+                     items: tuple[str, ...] = DEFAULT_ITEMS) -> str:
+    """Build prompt text from the highest-signal passages of the selected Items.
+
+    Budget is spent in three passes: the opening of Item 1, then paragraphs
+    ranked by AI-term density, then remaining paragraphs in filing order.
+    Chosen paragraphs are emitted in filing order under their Item heading,
+    whatever order `items` lists them in.
+    """
+    if len(text) <= char_budget:
+        return text
+
+    sections = split_items(text)
+    requested = {i.upper() for i in items}
+    wanted = [k for k in sections if k in requested]  # filing order
+    if not wanted:
+        wanted = [k for k in sections if k != "cover"] or list(sections)
+
+    # (item, position, paragraph) in filing order
+    paragraphs = [(item, pos, p) for item in wanted for pos, p in enumerate(sections[item])]
+    chosen: set[int] = set()
+    used = 0
+    limit = char_budget - 80 * len(wanted)  # room for the "=== Item ... ===" headers
+
+    def take(idx: int) -> bool:
+        nonlocal used
+        cost = len(paragraphs[idx][2]) + 1
+        if idx in chosen or used + cost > limit:
+            return False
+        chosen.add(idx)
+        used += cost
+        return True
+
+    # Pass 1: business overview — Item 1, or the start of a filing without headings
+    lead_item = "1" if "1" in wanted else "filing"
+    lead = 0
+    for idx, (item, _, p) in enumerate(paragraphs):
+        if item != lead_item:
+            continue
+        if lead >= LEAD_CHARS:
+            break
+        if take(idx):
+            lead += len(p)
+
+    # Pass 2: AI-dense paragraphs; short ones are scored as if 200 chars so a
+    # lone "AI" heading doesn't outrank a substantive passage
+    scored = []
+    for idx, (_, _, p) in enumerate(paragraphs):
+        hits = ai_term_count(p)
+        if hits:
+            scored.append((hits / max(len(p), 200), idx))
+    for _, idx in sorted(scored, key=lambda s: (-s[0], s[1])):
+        take(idx)
+
+    # Pass 3: fill what's left in filing order
+    for idx in range(len(paragraphs)):
+        if used >= limit:
+            break
+        take(idx)
+
+    out = []
+    current = None
+    for idx in sorted(chosen):
+        item, _, p = paragraphs[idx]
+        if item != current:
+            title = ITEM_TITLES.get(item, "")
+            label = f"Item {item}. {title}".strip() if item not in ("cover", "filing") else item.title()
+            out.append(f"\n=== {label} ===")
+            current = item
+        out.append(p)
+    return "\n".join(out).strip()
@@ -0,0 +1,150 @@
+"""Shared pooled HTTP session for EDGAR, with persisted ETag/Last-Modified validators."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from sec_scanner.cache import CACHE_DIR
+
+HEADERS = {
+    "User-Agent": "SECScanner/1.0 (research@example.com)",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+VALIDATOR_DIR = CACHE_DIR / "http"
+
+DEFAULT_POOL_SIZE = 10
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_pool_size = DEFAULT_POOL_SIZE
+
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "connections_opened": 0, "not_modified": 0}
+
+
+def _count(key: str, n: int = 1):
+    with _stats_lock:
+        _stats[key] += n
+
+
+# ── Connection accounting ─────────────────────────────────────────────────────
+
+class _CountingHTTPPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count("connections_opened")
+        return super()._new_conn()
+
+
+class _CountingHTTPSPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count("connections_opened")
+        return super()._new_conn()
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report every new TCP/TLS connection they open."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPPool,
+            "https": _CountingHTTPSPool,
+        }
+
+    def send(self, request, **kwargs):
+        _count("requests")
+        return super().send(request, **kwargs)
+
+
+# ── Session ───────────────────────────────────────────────────────────────────
+
+def configure(pool_size: int):
+    """Size the connection pool for the number of concurrent workers.
+
+    Must be called before the first request; the session is built lazily.
+    """
+    global _pool_size
+    _pool_size = max(1, pool_size)
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide keep-alive session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            # One pool per host (www.sec.gov, data.sec.gov), each sized for every worker
+            adapter = _CountingAdapter(pool_connections=4, pool_maxsize=_pool_size, pool_block=False)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def stats() -> dict:
+    """Return request/connection counters for this process."""
+    with _stats_lock:
+        s = dict(_stats)
+    s["connections_reused"] = max(0, s["requests"] - s["connections_opened"])
+    return s
+
+
+# ── Conditional requests ──────────────────────────────────────────────────────
+
+def _validator_path(url: str) -> Path:
+    return VALIDATOR_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+
+def conditional_headers(url: str) -> dict:
+    """Return If-None-Match / If-Modified-Since headers for a previously seen URL."""
+    path = _validator_path(url)
+    if not path.exists():
+        return {}
+    try:
+        stored = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    headers = {}
+    if stored.get("etag"):
+        headers["If-None-Match"] = stored["etag"]
+    if stored.get("last_modified"):
+        headers["If-Modified-Since"] = stored["last_modified"]
+    return headers
+
+
+def resolve_conditional(url: str, resp: requests.Response) -> str | None:
+    """Return the body for a conditional response.
+
+    On 304 the stored body is returned; on 200 the body and its validators
+    are stored for next time. Returns None if a 304 arrives with nothing stored.
+    """
+    path = _validator_path(url)
+    if resp.status_code == 304:
+        _count("not_modified")
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["body"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    body = resp.text
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        VALIDATOR_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+        tmp.write_text(json.dumps({
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        }), encoding="utf-8")
+        os.replace(tmp, path)  # atomic — a killed run never leaves a torn entry
+    return body
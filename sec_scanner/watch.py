@@ -0,0 +1,265 @@
+"""Watch mode — poll EDGAR for new 10-Ks and analyze only the companies that filed one.
+
+CIKs are resolved once (a failed lookup is retried next poll) and each
+company's submissions ETag and latest 10-K accession are kept in memory,
+so a poll where nothing changed is one conditional request per company
+answered with a bodiless 304. Companies with a new 10-K or 10-K/A go
+through fetch → analyze → save_result, then the report is refreshed from
+history.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sec_scanner import fetcher
+from sec_scanner.history import latest_results, save_result
+from sec_scanner.pipeline import run_pipeline
+from sec_scanner.reporter import report_from_history
+
+DEFAULT_INTERVAL = 600  # seconds between polls
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class Watcher:
+    """Polls a watchlist on a schedule until stop() is called.
+
+    fetch(ticker, latest=(url, date)) and analyze(filing) are the same
+    callables the scan pipeline uses.
+    """
+
+    def __init__(self, tickers: list[str], fetch, analyze, output: str, data_path: str | None = None,
+                 interval: float = DEFAULT_INTERVAL, fetch_workers: int = 2, analyze_workers: int = 2,
+                 baseline: bool = False):
+        self.tickers = tickers
+        self.fetch = fetch
+        self.analyze = analyze
+        self.output = output
+        self.data_path = data_path
+        self.interval = interval
+        self.fetch_workers = fetch_workers
+        self.analyze_workers = analyze_workers
+        self.baseline = baseline
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        # ticker -> {"cik", "etag", "accession", "date"}; date is the last analyzed filing's
+        self._state: dict[str, dict] = {}
+        self._status = {
+            "state": "starting",
+            "started_at": _now(),
+            "polls": 0,
+            "last_poll_at": None,
+            "last_poll_seconds": None,
+            "next_poll_at": None,
+            "not_modified": 0,
+            "new_filings": 0,
+            "analyzed": 0,
+            "failed": 0,
+            "errors": 0,
+            "last_error": None,
+            "last_new": [],
+            "report_refreshed_at": None,
+        }
+
+    # ── Status ────────────────────────────────────────────────────────────────
+
+    def _set(self, **changes):
+        with self._lock:
+            self._status.update(changes)
+
+    def _set_state(self, state: str, **changes):
+        """Move to state unless stop() has already said "stopping"."""
+        with self._lock:
+            if self._status["state"] != "stopping":
+                self._status["state"] = state
+            self._status.update(changes)
+
+    def _bump(self, key: str, n: int = 1):
+        with self._lock:
+            self._status[key] += n
+
+    def status(self) -> dict:
+        with self._lock:
+            return {**self._status, "tickers": len(self.tickers), "watching": len(self._state),
+                    "interval": self.interval}
+
+    def healthy(self) -> bool:
+        """False once stopping, or if the poll loop has stalled for two intervals."""
+        s = self.status()
+        if s["state"] in ("stopping", "stopped"):
+            return False
+        last = s["last_poll_at"]
+        if last is None:
+            return True
+        age = time.time() - datetime.fromisoformat(last).timestamp()
+        return age < 2 * self.interval + (s["last_poll_seconds"] or 0) + 60
+
+    # ── Polling ───────────────────────────────────────────────────────────────
+
+    def _error(self, ticker: str, e: Exception):
+        self._bump("errors")
+        self._set(last_error=f"{ticker}: {e}")
+
+    def _resolve(self):
+        """Look up CIKs not yet known and remember which filing history already covers.
+
+        Tickers whose lookup fails or finds nothing are tried again next poll.
+        """
+        pending = [t for t in self.tickers if t not in self._state]
+        if not pending:
+            return
+        scanned = {r["ticker"]: r["filing_date"] for r in latest_results(tickers=pending)}
+        for ticker in pending:
+            try:
+                cik = fetcher.get_cik(ticker)
+            except Exception as e:
+                print(f"  [{ticker}] CIK lookup failed: {e} — will retry next poll")
+                self._error(ticker, e)
+                continue
+            if not cik:
+                print(f"  [{ticker}] ERROR: Could not find CIK — will retry next poll")
+                continue
+            self._state[ticker] = {"cik": cik, "etag": None, "accession": None, "date": scanned.get(ticker)}
+
+    def _check(self, ticker: str) -> tuple[str, str] | None:
+        """Conditional submissions request; (url, date) if there is a 10-K we have not analyzed."""
+        state = self._state[ticker]
+        submissions, state["etag"] = fetcher.poll_submissions(state["cik"], state["etag"])
+        if submissions is None:
+            self._bump("not_modified")
+            return None
+        latest = fetcher.latest_10k(submissions, state["cik"])
+        if not latest:
+            return None
+        filing_url, filing_date, accession = latest
+        first_look = state["accession"] is None
+        known = accession == state["accession"] or (first_look and (self.baseline or filing_date == state["date"]))
+        state["accession"] = accession
+        if known:
+            return None
+        return filing_url, filing_date
+
+    def poll(self) -> dict[str, tuple[str, str]]:
+        """Check every company once; returns the ones with a new 10-K."""
+        self._resolve()
+        new = {}
+
+        def check(ticker):
+            if self._stop.is_set():
+                return
+            try:
+                found = self._check(ticker)
+            except Exception as e:
+                print(f"  [{ticker}] Poll failed: {e}")
+                self._error(ticker, e)
+                return
+            if found:
+                new[ticker] = found
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            list(pool.map(check, list(self._state)))
+        return {t: new[t] for t in self.tickers if t in new}  # watchlist order
+
+    def process(self, new: dict[str, tuple[str, str]]):
+        """fetch → analyze → save_result for each new filing, then refresh the report."""
+        saved = 0
+
+        def fetch(ticker):
+            if self._stop.is_set():  # shutting down: let in-flight work finish, start nothing new
+                return None
+            return self.fetch(ticker, latest=new[ticker])
+
+        def on_result(ticker, filing, result):
+            nonlocal saved
+            if filing and result:
+                save_result(result)
+                saved += 1
+                print(f"  [{ticker}] New 10-K from {filing['date']} — Score: {result['score']}/100 — "
+                      f"{result['verdict']}")
+            else:
+                self._bump("failed")
+                # Forget the accession (and the ETag that would hide it) so the next poll retries
+                self._state[ticker].update(accession="", etag=None)
+                print(f"  [{ticker}] New 10-K could not be analyzed — will retry next poll")
+
+        run_pipeline(list(new), fetch, self.analyze, fetch_workers=self.fetch_workers,
+                     analyze_workers=self.analyze_workers, on_result=on_result)
+        self._bump("analyzed", saved)
+        if saved:
+            self.refresh_report()
+
+    def refresh_report(self):
+        rendered = report_from_history(self.output, self.data_path, tickers=self.tickers)
+        if rendered is not None:
+            print(f"  Report refreshed: {self.output} — {rendered} companies")
+            self._set(report_refreshed_at=_now())
+
+    # ── Loop ──────────────────────────────────────────────────────────────────
+
+    def run(self, once: bool = False):
+        print(f"  Resolving {len(self.tickers)} tickers...")
+        self._resolve()
+        print(f"  Watching {len(self._state)} companies, polling every {self.interval:g}s")
+        while not self._stop.is_set():
+            self._set_state("polling")
+            start = time.time()
+            new = self.poll()
+            self._set(last_poll_at=_now(), last_poll_seconds=round(time.time() - start, 3),
+                      last_new=list(new))
+            self._bump("polls")
+            self._bump("new_filings", len(new))
+            if new and not self._stop.is_set():
+                print(f"  {len(new)} new 10-K filings: {', '.join(new)}")
+                self._set_state("analyzing")
+                self.process(new)
+            if once:
+                break
+            self._set_state("idle", next_poll_at=datetime.fromtimestamp(
+                start + self.interval, timezone.utc).isoformat(timespec="seconds"))
+            self._stop.wait(max(0.0, start + self.interval - time.time()))
+        self._set(state="stopped", next_poll_at=None)
+
+    def stop(self):
+        """Finish in-flight analyses, start nothing new and leave the loop."""
+        if not self._stop.is_set():
+            self._set(state="stopping")
+            self._stop.set()
+
+
+def serve_status(watcher: Watcher, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """GET /health (200 or 503) and GET /status (JSON counters) on a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/health":
+                ok = watcher.healthy()
+                self._send(200 if ok else 503, {"status": "ok" if ok else "unhealthy",
+                                                "state": watcher.status()["state"]})
+            elif path == "/status":
+                self._send(200, watcher.status())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="watch-status", daemon=True).start()
+    return server
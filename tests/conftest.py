@@ -0,0 +1,74 @@
+"""Shared fixtures: the benchmarks' stub Claude CLI for the analyzer, with the analysis cache kept
+in memory, and their fake EDGAR with the fetcher and a scratch cache pointed at it."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from sec_scanner import cache, executor, fetcher, session
+from sec_scanner.cache_sqlite import SQLiteCache
+from sec_scanner.ratelimit import TokenBucket
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+from edgar_fixture import EdgarFixture  # noqa: E402
+
+# The benchmarks' Claude stand-in; each takeaway names the filing it scores
+STUB_CLAUDE = Path(__file__).parent.parent / "benchmarks" / "stub_claude.py"
+
+# Seed for the fake EDGAR's 10-Ks: the Items section selection wants, then
+# financial statements long enough that stopping a download early shows
+SEED_TEXT = "\n".join(
+    ["Item 1. Business", "We use artificial intelligence in our products."]
+    + ["Item 1A. Risk Factors", "Our AI models may not perform as expected."]
+    + ["Item 7. Management's Discussion and Analysis", "Revenue from AI services grew 40%."]
+    + ["Item 8. Financial Statements"] + [f"Note {n}: figures for segment {n}." for n in range(40_000)]
+)
+
+
+@pytest.fixture
+def stub_claude(monkeypatch):
+    executor.configure(cmd=[str(STUB_CLAUDE)], retries=0)
+    saved = {}
+    monkeypatch.setattr(cache, "get_analysis", lambda *args, **kwargs: None)
+    monkeypatch.setattr(cache, "save_analysis",
+                        lambda ticker, date, url, result, fingerprint=None: saved.__setitem__((ticker, date), result))
+    yield saved
+    executor.configure()
+
+
+@pytest.fixture
+def stub_cli(tmp_path, monkeypatch):
+    """The stub's path and the file it logs prompts to; STUB_* variables set by a test shape its replies."""
+    calls = tmp_path / "calls"
+    monkeypatch.setenv("STUB_CALLS", str(calls))
+    return str(STUB_CLAUDE), calls
+
+
+@pytest.fixture
+def stub_claude_cached(stub_cli, tmp_path, monkeypatch):
+    """The stub Claude with a scratch SQLite cache; yields the file it logs prompts to."""
+    path, calls = stub_cli
+    executor.configure(cmd=[path], retries=0)
+    monkeypatch.setattr(cache, "_backend", SQLiteCache(tmp_path / "cache.db"))
+    yield calls
+    executor.configure()
+
+
+@pytest.fixture
+def edgar(tmp_path, monkeypatch):
+    seeds = tmp_path / "seeds"
+    seeds.mkdir()
+    (seeds / "SEED_2025-02-26_00000000.txt").write_text(SEED_TEXT)
+    fixture = EdgarFixture(n_tickers=3, cache_dir=seeds)
+    url = fixture.start()
+    monkeypatch.setattr(fetcher, "SEC_URL", url)
+    monkeypatch.setattr(fetcher, "SEC_DATA_URL", url)
+    monkeypatch.setattr(fetcher, "COMPANY_TICKERS_URL", f"{url}/files/company_tickers.json")
+    monkeypatch.setattr(fetcher, "TICKER_INDEX_PATH", tmp_path / "ticker_index.json")
+    monkeypatch.setattr(fetcher, "_ticker_index", None)
+    monkeypatch.setattr(fetcher, "_limiter", TokenBucket(rate=1e6, burst=1000, state_path=None))
+    monkeypatch.setattr(session, "VALIDATOR_DIR", tmp_path / "http")
+    monkeypatch.setattr(cache, "_backend", SQLiteCache(tmp_path / "cache.db"))
+    yield fixture
+    fixture.stop()
@@ -0,0 +1,47 @@
+"""Batched analysis against a stub Claude whose answers name the filing they score."""
+
+from sec_scanner import analyzer
+
+
+def _filing(ticker: str, date: str) -> dict:
+    return {"ticker": ticker, "company": f"{ticker} Corp", "date": date,
+            "url": f"https://example.test/{ticker}/{date}.htm", "text": f"{ticker} annual report for {date}"}
+
+
+def test_batch_keeps_filings_of_one_ticker_apart(stub_claude):
+    filings = [_filing("NVDA", "2024-02-21"), _filing("NVDA", "2025-02-26"), _filing("MSFT", "2023-07-27")]
+    results = analyzer.analyze_batch(filings)
+
+    assert [r["date"] for r in results] == ["2024-02-21", "2025-02-26", "2023-07-27"]
+    assert [r["takeaway"] for r in results] == [
+        "Deterministic stub analysis of NVDA 2024-02-21.",
+        "Deterministic stub analysis of NVDA 2025-02-26.",
+        "Deterministic stub analysis of MSFT 2023-07-27.",
+    ]
+    assert stub_claude[("NVDA", "2024-02-21")] is results[0]
+    assert stub_claude[("NVDA", "2025-02-26")] is results[1]
+
+
+def test_batch_prompt_is_built_from_rubric():
+    assert analyzer.RUBRIC in analyzer.BATCH_PROMPT_TEMPLATE
+    # Only the single-filing prompt asks for one bare object
+    assert analyzer.SINGLE_OUTPUT in analyzer.PROMPT_TEMPLATE
+    assert analyzer.SINGLE_OUTPUT not in analyzer.BATCH_PROMPT_TEMPLATE
+    assert "Output ONLY the JSON object" not in analyzer.BATCH_PROMPT_TEMPLATE
+
+
+def test_fingerprint_changes_with_every_input(stub_claude, monkeypatch):
+    filing = _filing("NVDA", "2025-02-26")
+    base = analyzer.analysis_fingerprint(filing)
+    assert analyzer.analysis_fingerprint(dict(filing)) == base
+
+    assert analyzer.analysis_fingerprint({**filing, "text": filing["text"] + "."}) != base
+    assert analyzer.analysis_fingerprint(filing, analyzer.PROMPT_TEMPLATE + "\nBe brief.") != base
+    assert analyzer.analysis_fingerprint(filing, analyzer.BATCH_PROMPT_TEMPLATE) != base
+    with monkeypatch.context() as m:
+        m.setattr(analyzer, "_PROJECT_CONTEXT", analyzer._PROJECT_CONTEXT + "\nNew thesis.")
+        assert analyzer.analysis_fingerprint(filing) != base
+    with monkeypatch.context() as m:
+        m.setattr(analyzer.get_executor(), "version", lambda: "batch-stub 2.0")
+        assert analyzer.analysis_fingerprint(filing) != base
+    assert analyzer.analysis_fingerprint(filing) == base
@@ -0,0 +1,42 @@
+"""--backfill with batching: several years of one ticker in a single Claude call."""
+
+from argparse import Namespace
+from functools import partial
+
+from sec_scanner import analyzer, cli, fetcher, history, reporter
+
+
+def test_backfill_batch_saves_each_filing_with_its_own_result(stub_claude, tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "DB_PATH", tmp_path / "scan_history.db")
+    listed = [
+        {"url": "https://example.test/NVDA/2025.htm", "date": "2025-02-26", "accession": "0001-25-1", "form": "10-K"},
+        {"url": "https://example.test/NVDA/2024.htm", "date": "2024-02-21", "accession": "0001-24-1", "form": "10-K"},
+    ]
+    monkeypatch.setattr(fetcher, "get_cik", lambda ticker: "1045810")
+    monkeypatch.setattr(fetcher, "list_10k_filings", lambda cik, since: listed)
+    monkeypatch.setattr(reporter, "report_from_history", lambda *args, **kwargs: 1)
+
+    def fetch(ticker, latest):
+        url, filing_date = latest
+        return {"ticker": ticker, "company": "NVIDIA", "date": filing_date, "url": url,
+                "text": f"{ticker} annual report for {filing_date}"}
+
+    calls = []
+
+    def analyze_batch(filings):
+        calls.append(len(filings))
+        return analyzer.analyze_batch(filings)
+
+    args = Namespace(backfill=2, fetch_workers=1, analyze_workers=1, chunked=False, batch_size=2,
+                     batch_chars=None, output=str(tmp_path / "report.html"), data_json=None)
+    cli.backfill_command(["NVDA"], fetch, partial(analyzer.analyze_filing), analyze_batch, None, args)
+
+    assert calls == [2]
+    rows = history.get_connection().execute(
+        "SELECT filing_date, scanned_at, takeaway, scores_json FROM scan_history ORDER BY filing_date").fetchall()
+    assert [(r["filing_date"], r["scanned_at"], r["takeaway"]) for r in rows] == [
+        ("2024-02-21", "2024-02-21", "Deterministic stub analysis of NVDA 2024-02-21."),
+        ("2025-02-26", "2025-02-26", "Deterministic stub analysis of NVDA 2025-02-26."),
+    ]
+    assert stub_claude[("NVDA", "2024-02-21")]["takeaway"] == "Deterministic stub analysis of NVDA 2024-02-21."
+    assert stub_claude[("NVDA", "2025-02-26")]["takeaway"] == "Deterministic stub analysis of NVDA 2025-02-26."
@@ -0,0 +1,42 @@
+"""Bulk index: submissions.zip and form.idx give each ticker the same 10-K document."""
+
+from sec_scanner import bulk, fetcher
+
+
+def _expected(edgar, url: str) -> dict:
+    index = {}
+    for ticker, company in edgar.companies.items():
+        ten_k = [f for f in company["filings"] if f["form"] == "10-K"][-1]
+        index[ticker] = [str(company["cik"]), company["name"],
+                         f"{url}/Archives/edgar/data/{company['cik']}/{ten_k['accession'].replace('-', '')}/"
+                         f"{ten_k['doc']}", ten_k["date"]]
+    return index
+
+
+def test_both_ingest_formats_point_at_the_primary_document(edgar, tmp_path):
+    expected = _expected(edgar, fetcher.SEC_URL)
+    edgar.write_submissions_zip(tmp_path / "submissions.zip")
+    edgar.write_form_idx(tmp_path / "form.idx")
+
+    assert bulk.ingest_submissions_zip(tmp_path / "submissions.zip") == expected
+    assert bulk.ingest_form_idx([tmp_path / "form.idx"]) == expected
+
+    # Without filing index pages, the 10-K is found in the submission text file's headers,
+    # read no further than those
+    edgar.index_pages = False
+    served = edgar.bytes_served
+    assert bulk.ingest_form_idx([tmp_path / "form.idx"]) == expected
+    company = edgar.companies["BENCH0001"]
+    assert edgar.bytes_served - served < len(edgar.document(company, company["filings"][-1]))
+
+
+def test_form_idx_keeps_the_submission_text_when_no_document_is_found(edgar, tmp_path, monkeypatch):
+    edgar.write_form_idx(tmp_path / "form.idx")
+    edgar.index_pages = False
+    monkeypatch.setattr(edgar, "submission_text", lambda company, filing: "<SEC-DOCUMENT>\n</SEC-DOCUMENT>\n")
+
+    index = bulk.ingest_form_idx([tmp_path / "form.idx"])
+
+    company = edgar.companies["BENCH0001"]
+    ten_k = [f for f in company["filings"] if f["form"] == "10-K"][-1]
+    assert index["BENCH0001"][2] == f"{fetcher.SEC_URL}/Archives/edgar/data/{company['cik']}/{ten_k['accession']}.txt"
@@ -0,0 +1,116 @@
+"""Cache backends: moving from the loose-file layout to SQLite, and eviction."""
+
+import os
+import sqlite3
+import time
+
+from sec_scanner import cache
+from sec_scanner.cache import FileCache
+from sec_scanner.cache_sqlite import SQLiteCache, url_hash
+
+URL = "https://www.sec.gov/Archives/edgar/data/1045810/000104581025000023/nvda-20250126.htm"
+
+
+def test_sqlite_cache_imports_the_file_layout(tmp_path):
+    files = FileCache(tmp_path)
+    files.save_filing("NVDA", "2025-02-26", URL, "Item 1. Business\nWe build AI accelerators.")
+    files.save_filing("NVDA", "2025-02-26", URL + "?start", "Item 1. Business", partial=True)
+    files.save_analysis("NVDA", "2025-02-26", URL, {"score": 70}, fingerprint="0123456789abcdef")
+    (tmp_path / "NVDA_2024-02-21_00000000.txt").write_bytes(b"\xff\xfe not utf-8")
+
+    db = SQLiteCache(tmp_path / "cache.db")
+    assert db.import_directory(tmp_path) == {"filings": 1, "analyses": 2, "skipped": 1}
+
+    assert db.get_filing("NVDA", "2025-02-26", URL) == "Item 1. Business\nWe build AI accelerators."
+    assert db.get_filing("NVDA", "2025-02-26", URL + "?start", min_chars=1) is None  # partial text stays behind
+    assert db.get_analysis("NVDA", "2025-02-26", URL, "0123456789abcdef") == {"score": 70}
+    assert db.get_analysis("NVDA", "2025-02-26", URL) == {"score": 70}
+    assert db.stats()["cached_filings"] == 1
+
+    # Importing again adds nothing
+    assert db.import_directory(tmp_path) == {"filings": 0, "analyses": 0, "skipped": 1}
+
+
+def test_upgrade_keeps_rows_from_the_first_sqlite_schema(tmp_path):
+    path = tmp_path / "cache.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE blobs (hash TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL,
+                            stored_bytes INTEGER NOT NULL);
+        CREATE TABLE filings (ticker TEXT NOT NULL, filing_date TEXT NOT NULL, url_hash TEXT NOT NULL,
+                              url TEXT, hash TEXT NOT NULL, created_at REAL NOT NULL,
+                              PRIMARY KEY (ticker, filing_date, url_hash));
+        CREATE TABLE analyses (id INTEGER PRIMARY KEY AUTOINCREMENT, ticker TEXT NOT NULL,
+                               filing_date TEXT NOT NULL, url_hash TEXT NOT NULL, url TEXT,
+                               result_json TEXT NOT NULL, created_at REAL NOT NULL,
+                               UNIQUE (ticker, filing_date, url_hash));
+    """)
+    conn.execute("INSERT INTO analyses (ticker, filing_date, url_hash, url, result_json, created_at) "
+                 "VALUES ('NVDA', '2025-02-26', ?, ?, '{\"score\": 70}', 1.0)", (url_hash(URL), URL))
+    conn.commit()
+    conn.close()
+
+    db = SQLiteCache(path)
+    assert not db.created
+    assert db.get_analysis("NVDA", "2025-02-26", URL) == {"score": 70}
+    # Fingerprinted results now sit beside the old one instead of replacing it
+    db.save_analysis("NVDA", "2025-02-26", URL, {"score": 80}, fingerprint="0123456789abcdef")
+    assert db.get_analysis("NVDA", "2025-02-26", URL, "") == {"score": 70}
+    assert db.get_analysis("NVDA", "2025-02-26", URL) == {"score": 80}
+    db.save_filing("NVDA", "2025-02-26", URL, "text", partial=True)
+    assert db.get_filing("NVDA", "2025-02-26", URL, min_chars=4) == "text"
+
+
+DAY = 86400
+
+
+def _texts():
+    # Same size each, and incompressible enough that eviction is by count
+    return {date: os.urandom(20_000).hex() for date in ("2022-02-25", "2023-02-24", "2024-02-21")}
+
+
+def test_sqlite_gc_evicts_stale_then_least_recently_used(tmp_path):
+    db = SQLiteCache(tmp_path / "cache.db")
+    for date, text in _texts().items():
+        db.save_filing("NVDA", date, URL, text)
+    db.save_analysis("NVDA", "2022-02-25", URL, {"score": 50})
+    db.save_analysis("NVDA", "2024-02-21", URL, {"score": 70})
+    conn = db._conn()
+    now = time.time()
+    # 2022 untouched for over a year; 2023 used before 2024, until the read below
+    for date, last_access in (("2022-02-25", now - 500 * DAY), ("2023-02-24", now - 3 * DAY),
+                              ("2024-02-21", now - 2 * DAY)):
+        conn.execute("UPDATE filings SET last_access = ? WHERE filing_date = ?", (last_access, date))
+    conn.execute("UPDATE analyses SET created_at = ? WHERE filing_date = '2022-02-25'", (now - 4 * 365 * DAY,))
+    db.get_filing("NVDA", "2023-02-24", URL)  # now the most recently used
+    one_blob = db.stats()["stored_bytes"] // 3
+
+    evicted = db.gc(max_bytes=one_blob + one_blob // 2, max_age_days=400, analysis_max_age_days=3 * 365)
+
+    assert (evicted["filings"], evicted["analyses"]) == (2, 1)
+    assert db.get_filing("NVDA", "2023-02-24", URL) is not None
+    assert db.get_filing("NVDA", "2024-02-21", URL) is None
+    assert db.get_analysis("NVDA", "2022-02-25", URL) is None
+    assert db.get_analysis("NVDA", "2024-02-21", URL) == {"score": 70}
+
+
+def test_file_gc_evicts_stale_then_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "RAW_DIR", tmp_path / "raw")
+    monkeypatch.setattr(cache, "CHUNKS_DIR", tmp_path / "chunks")
+    files = FileCache(tmp_path)
+    now = time.time()
+    for (date, text), age in zip(_texts().items(), (500, 3, 2)):
+        files.save_filing("NVDA", date, URL, text)
+        path = tmp_path / f"NVDA_{date}_{url_hash(URL)}.txt"
+        os.utime(path, (now - age * DAY, now - age * DAY))
+    files.save_analysis("NVDA", "2022-02-25", URL, {"score": 50})
+    old = tmp_path / f"NVDA_2022-02-25_{url_hash(URL)}_analysis.json"
+    os.utime(old, (now - 4 * 365 * DAY, now - 4 * 365 * DAY))
+    files.get_filing("NVDA", "2023-02-24", URL)  # now the most recently used
+
+    evicted = files.gc(max_bytes=60_000, max_age_days=400, analysis_max_age_days=3 * 365)
+
+    assert (evicted["filings"], evicted["analyses"]) == (2, 1)
+    assert files.get_filing("NVDA", "2023-02-24", URL) is not None
+    assert files.get_filing("NVDA", "2024-02-21", URL) is None
+    assert not old.exists()
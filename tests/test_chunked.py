@@ -0,0 +1,54 @@
+"""Chunked (map-reduce) analysis reuses only cached results it made itself."""
+
+import json
+
+from sec_scanner import analyzer, cache, chunked
+
+URL = "https://www.sec.gov/Archives/edgar/data/1045810/000104581025000023/nvda-20250126.htm"
+
+
+def _filing() -> dict:
+    full_text = "\n".join(["Item 1. Business", "We sell GPUs for AI inference."]
+                          + [f"Paragraph {n} about supply chains." for n in range(200)])
+    return {"ticker": "NVDA", "company": "NVIDIA", "date": "2025-02-26", "url": URL,
+            "text": full_text[:200], "full_text": full_text}
+
+
+def _prompts(calls) -> list[str]:
+    return [json.loads(line) for line in calls.read_text().splitlines()] if calls.exists() else []
+
+
+def test_chunked_runs_map_reduce_over_an_earlier_single_analysis(stub_claude_cached):
+    filing = _filing()
+    cache.save_analysis("NVDA", filing["date"], URL, {"score": 10, "takeaway": "single"},
+                        fingerprint=analyzer.analysis_fingerprint(filing))
+
+    result = chunked.analyze_chunked(filing)
+
+    assert result["mode"] == "chunked"
+    assert result["takeaway"] == "Deterministic stub analysis of NVDA 2025-02-26."
+    assert any("\nEXCERPT:\n" in p for p in _prompts(stub_claude_cached))
+
+
+def test_stale_chunked_result_is_reused_without_reanalyze_if_stale(stub_claude_cached, monkeypatch):
+    filing = _filing()
+    first = chunked.analyze_chunked(filing)
+    calls = len(_prompts(stub_claude_cached))
+    # A newer single analysis does not count, and the edited prompt makes the chunked one stale
+    cache.save_analysis("NVDA", filing["date"], URL, {"score": 10, "takeaway": "single"},
+                        fingerprint=analyzer.analysis_fingerprint(filing))
+    monkeypatch.setattr(chunked, "REDUCE_PROMPT_TEMPLATE", chunked.REDUCE_PROMPT_TEMPLATE + "\n")
+
+    assert chunked.analyze_chunked(filing) == first
+    assert len(_prompts(stub_claude_cached)) == calls
+    assert chunked.analyze_chunked(filing, reanalyze_if_stale=True)["mode"] == "chunked"
+    assert len(_prompts(stub_claude_cached)) == calls + 1  # reduce only; chunk evidence is cached
+
+
+def test_single_analysis_does_not_reuse_a_chunked_result(stub_claude_cached):
+    filing = _filing()
+    chunked.analyze_chunked(filing)
+
+    result = analyzer.analyze_filing(filing)
+    assert "mode" not in result
+    assert "\nFILING TEXT:\n" in _prompts(stub_claude_cached)[-1]
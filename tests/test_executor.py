@@ -0,0 +1,116 @@
+"""ClaudeExecutor against the benchmarks' stub Claude: timeouts, retries, cancellation."""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from sec_scanner.executor import ClaudeExecutor
+
+
+def _calls(calls) -> list[str]:
+    return [json.loads(line) for line in calls.read_text().splitlines()] if calls.exists() else []
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed child we never reaped shows up as a zombie
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != "Z"
+    except OSError:
+        return True
+
+
+def _wait_for(path, seconds: float = 5.0):
+    deadline = time.time() + seconds
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.02)
+    assert path.exists()
+
+
+def test_run_returns_stdout(stub_cli):
+    path, calls = stub_cli
+    ex = ClaudeExecutor(cmd=[path], retries=0)
+    assert json.loads(ex.run("hello"))["takeaway"] == "Deterministic stub analysis."
+    assert _calls(calls) == ["hello"]
+
+
+def test_retries_after_nonzero_exit(stub_cli, monkeypatch):
+    path, calls = stub_cli
+    monkeypatch.setenv("STUB_FAIL_ONCE", "1")
+    ex = ClaudeExecutor(cmd=[path], retries=1, backoff=0.01)
+    assert ex.run("hello") is not None
+    assert _calls(calls) == ["hello", "hello"]
+
+
+def test_gives_up_after_retries(stub_cli, monkeypatch):
+    path, calls = stub_cli
+    monkeypatch.setenv("STUB_FAILURE_RATE", "1")
+    ex = ClaudeExecutor(cmd=[path], retries=2, backoff=0.01)
+    assert ex.run("hello") is None
+    assert len(_calls(calls)) == 3
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_timeout_kills_process_group(stub_cli, monkeypatch):
+    path, calls = stub_cli
+    monkeypatch.setenv("STUB_HANG", "60")
+    ex = ClaudeExecutor(cmd=[path], retries=0, timeout=1)
+    start = time.time()
+    assert ex.run("hang") is None
+    assert time.time() - start < 10
+    child = int((calls.parent / "calls.child").read_text())
+    deadline = time.time() + 5
+    while _alive(child) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
+
+
+def test_timeout_is_retried(stub_cli, monkeypatch):
+    path, calls = stub_cli
+    monkeypatch.setenv("STUB_HANG", "60")
+    ex = ClaudeExecutor(cmd=[path], retries=1, timeout=0.5, backoff=0.01)
+    assert ex.run("hang") is None
+    assert _calls(calls) == ["hang", "hang"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_cancel_kills_running_and_fails_queued(stub_cli, monkeypatch):
+    path, calls = stub_cli
+    monkeypatch.setenv("STUB_HANG", "60")
+    ex = ClaudeExecutor(cmd=[path], max_concurrency=1, retries=3, timeout=60)
+    running = ex.submit("hang")
+    queued = ex.submit("never")
+    _wait_for(calls.parent / "calls.child")
+    start = time.time()
+    ex.cancel()
+    assert running.result(timeout=10) is None
+    assert time.time() - start < 10
+    assert queued.cancelled() or queued.result(timeout=10) is None
+    assert "never" not in _calls(calls)
+    child = int((calls.parent / "calls.child").read_text())
+    deadline = time.time() + 5
+    while _alive(child) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
+    assert ex.run("after") is None
+
+
+def test_version_runs_once_under_concurrency(stub_cli, monkeypatch):
+    path, calls = stub_cli
+    monkeypatch.setenv("STUB_LATENCY", "0.2")  # a slow --version, so the threads overlap
+    ex = ClaudeExecutor(cmd=[path])
+    versions = []
+    threads = [threading.Thread(target=lambda: versions.append(ex.version())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert versions == [f"{path} stub-claude 1.0"] * 8
+    assert (calls.parent / "calls.version").read_text().splitlines() == ["stub-claude 1.0"]
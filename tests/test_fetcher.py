@@ -0,0 +1,45 @@
+"""Filing downloads against the fake EDGAR: stopping early, and what the filing cache keeps."""
+
+from sec_scanner import cache, fetcher
+
+
+def _latest(edgar, ticker):
+    company = edgar.companies[ticker]
+    filing = company["filings"][-1]
+    url = f"{fetcher.SEC_URL}/Archives/edgar/data/{company['cik']}/{filing['accession'].replace('-', '')}/{filing['doc']}"
+    return url, filing["date"]
+
+
+def test_download_is_closed_once_enough_text_exists(edgar):
+    url, _ = _latest(edgar, "BENCH0001")
+    size = len(edgar.document(edgar.companies["BENCH0001"], edgar.companies["BENCH0001"]["filings"][-1]))
+
+    text = fetcher.download_and_clean(url, max_chars=5000)
+    assert len(text) == 5000
+    assert edgar.bytes_served < size / 4
+
+
+def test_fetch_without_whole_filing_stops_at_the_selection_headroom(edgar):
+    filing = fetcher.fetch_filing("BENCH0001", char_budget=2000, latest=_latest(edgar, "BENCH0001"))
+
+    assert len(filing["full_text"]) == 2000 * fetcher.SELECTION_HEADROOM
+    assert "Revenue from AI services grew 40%." in filing["text"]
+    url, date = _latest(edgar, "BENCH0001")
+    assert cache.get_filing("BENCH0001", date, url) is None  # not a whole filing
+    assert cache.get_filing("BENCH0001", date, url, min_chars=16000) == filing["full_text"]
+
+
+def test_whole_filing_is_downloaded_again_after_a_partial_one(edgar):
+    latest = _latest(edgar, "BENCH0001")
+    fetcher.fetch_filing("BENCH0001", char_budget=2000, latest=latest)
+    served = edgar.bytes_served
+
+    whole = fetcher.fetch_filing("BENCH0001", char_budget=2000, latest=latest, whole_filing=True)
+    assert whole["full_text"].endswith("Note 39999: figures for segment 39999.")
+    assert edgar.bytes_served > served
+
+    # The whole text now serves both kinds of request from the cache
+    served = edgar.bytes_served
+    again = fetcher.fetch_filing("BENCH0001", char_budget=2000, latest=latest)
+    assert again["full_text"] == whole["full_text"]
+    assert edgar.bytes_served == served
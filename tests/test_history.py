@@ -0,0 +1,38 @@
+"""Scan history: batched writes and trends for a whole watchlist."""
+
+from sec_scanner import history
+
+
+def _result(ticker: str, score: int) -> dict:
+    return {"ticker": ticker, "company": ticker, "score": score, "verdict": "Mixed Signals", "date": "2025-02-26"}
+
+
+def test_writer_batches_and_reports_each_committed_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "DB_PATH", tmp_path / "scan_history.db")
+    saved = []
+
+    def on_saved(batch):
+        # Called only once the batch is in the database
+        count = history.get_connection().execute("SELECT COUNT(*) FROM scan_history").fetchone()[0]
+        saved.append(([r["ticker"] for r in batch], count))
+
+    with history.HistoryWriter(batch_size=2, on_saved=on_saved) as writer:
+        for ticker in ("AAA", "BBB", "CCC"):
+            writer.add(_result(ticker, 50))
+        assert saved == [(["AAA", "BBB"], 2)]
+    assert saved == [(["AAA", "BBB"], 2), (["CCC"], 3)]
+
+
+def test_trend_with_matches_the_trend_after_saving(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "DB_PATH", tmp_path / "scan_history.db")
+    scores = {"NEW": [], "ONE": [50], "UP": [40, 50], "DOWN": [80, 70, 60], "FLAT": [20, 50, 52]}
+    history.save_results([_result(t, s) for t, series in scores.items() for s in series])
+    latest = {"NEW": 40, "ONE": 60, "UP": 47, "DOWN": 62, "FLAT": 53}
+
+    trends = history.get_trends(list(scores))
+    expected = {t: history.trend_with(trends[t], score) for t, score in latest.items()}
+    history.save_results([_result(t, score) for t, score in latest.items()])
+
+    assert expected == {t: history.get_trend(t) for t in scores}
+    assert expected == {"NEW": "new", "ONE": "improving", "UP": "improving", "DOWN": "declining",
+                        "FLAT": "stable"}
@@ -0,0 +1,62 @@
+"""Streaming filing cleaner, including filings with unbalanced markup."""
+
+from sec_scanner import htmltext
+from sec_scanner.htmltext import html_to_text
+
+
+def test_skips_scripts_styles_and_xbrl():
+    html = ("<html><head><style>.x{}</style><script>var a = 1;</script></head><body>"
+            '<div style="display:none"><ix:header><ix:hidden>hidden fact</ix:hidden></ix:header></div>'
+            "<p>Revenue was <ix:nonFraction name='r'>10</ix:nonFraction> billion.</p>"
+            "<p>__________________</p><p>Next</p></body></html>")
+    assert html_to_text(html) == "Revenue was\nbillion.\n\nNext"  # the rule leaves a blank line
+
+
+def test_unclosed_xbrl_tag_ends_with_its_parent():
+    html = ("<body><div style='display:none'><ix:header><ix:hidden>fact</ix:hidden></div>"
+            "<table><tr><td><ix:nonNumeric name='x'>tagged</td><td>Cell two</td></tr></table>"
+            "<p>Item 1. Business</p><p>We build AI accelerators.</p></body>")
+    assert html_to_text(html) == "Cell two\nItem 1. Business\nWe build AI accelerators."
+
+
+def test_unclosed_script_ends_with_its_parent():
+    html = ("<html><head><title>10-K</title><script>var facts = {};</head>"
+            "<body><p>Item 1. Business</p><p>We build AI accelerators.</p></body></html>")
+    assert html_to_text(html) == "10-K\nItem 1. Business\nWe build AI accelerators."
+
+
+def test_unclosed_script_ends_at_next_block():
+    html = "<script>var facts = {};<div>Item 1. Business</div>"
+    assert html_to_text(html) == "Item 1. Business"
+
+
+def test_long_unclosed_script_recovers_while_streaming(monkeypatch):
+    monkeypatch.setattr(htmltext, "MAX_RAW_TEXT", 100)
+    html = "<body><div><script>" + "x = 1;\n" * 50 + "</div>" + "<p>Paragraph text.</p>" * 200 + "</body>"
+    out = html_to_text(html, max_chars=200, chunk_size=64)
+    assert out.startswith("Paragraph text.\nParagraph text.")
+    assert len(out) == 200
+
+
+def test_script_with_markup_in_strings_is_still_skipped():
+    html = "<div><script>a = '</div><p>not text</p>';</script>Visible</div>"
+    assert html_to_text(html) == "Visible"
+
+
+def test_long_unclosed_script_recovers_at_next_block_while_streaming(monkeypatch):
+    monkeypatch.setattr(htmltext, "MAX_RAW_TEXT", 100)
+    html = "<script>" + "x = 1;\n" * 50 + "<p>Paragraph text.</p>" * 200
+    out = html_to_text(html, max_chars=100, chunk_size=64)
+    assert out.startswith("Paragraph text.\nParagraph text.")
+    assert len(out) == 100
+
+
+def test_unclosed_script_with_nowhere_to_end_drops_the_rest():
+    assert html_to_text("<p>Intro</p><script>var a = '<b>bold</b>';") == "Intro"
+
+
+def test_recovery_is_skipped_without_parser_internals():
+    parser = htmltext.TextExtractor()
+    parser.feed("<p>Intro</p><script>var facts = {};<div>Item 1. Business</div>")
+    del parser.cdata_elem  # as if HTMLParser had renamed it
+    assert parser._end_raw_text() is False
@@ -0,0 +1,54 @@
+"""Incremental analysis reuses full analyses of the same inputs, and stale results only of its own."""
+
+import json
+
+from sec_scanner import analyzer, cache, incremental
+
+URL = "https://www.sec.gov/Archives/edgar/data/1045810/000104581025000023/nvda-20250126.htm"
+PREVIOUS_URL = "https://www.sec.gov/Archives/edgar/data/1045810/000104581024000029/nvda-20240128.htm"
+
+
+def _setup() -> dict:
+    previous = "Item 1. Business\nWe sell GPUs for AI training."
+    cache.save_filing("NVDA", "2024-02-21", PREVIOUS_URL, previous)
+    cache.save_analysis("NVDA", "2024-02-21", PREVIOUS_URL, {"score": 60, "verdict": "Mixed Signals"})
+    text = previous + "\nWe now sell GPUs for AI inference too."
+    return {"ticker": "NVDA", "company": "NVIDIA", "date": "2025-02-26", "url": URL,
+            "text": text, "full_text": text}
+
+
+def _prompts(calls) -> list[str]:
+    return [json.loads(line) for line in calls.read_text().splitlines()] if calls.exists() else []
+
+
+def test_incremental_runs_over_an_earlier_chunked_analysis(stub_claude_cached):
+    filing = _setup()
+    cache.save_analysis("NVDA", filing["date"], URL, {"score": 10, "mode": "chunked"},
+                        fingerprint="0123456789abcdef")
+
+    result = incremental.analyze_incremental(filing)
+
+    assert result["mode"] == "incremental"
+    assert result["changes"] == ["Stub change summary"]
+    assert "NEW OR CHANGED AI-RELATED PASSAGES" in _prompts(stub_claude_cached)[-1]
+
+
+def test_full_analysis_of_the_same_inputs_is_reused(stub_claude_cached):
+    filing = _setup()
+    full = analyzer.analyze_filing(filing)
+    calls = len(_prompts(stub_claude_cached))
+
+    assert incremental.analyze_incremental(filing) == full
+    assert len(_prompts(stub_claude_cached)) == calls
+
+
+def test_stale_incremental_result_is_reused_without_reanalyze_if_stale(stub_claude_cached, monkeypatch):
+    filing = _setup()
+    first = incremental.analyze_incremental(filing)
+    calls = len(_prompts(stub_claude_cached))
+    monkeypatch.setattr(incremental, "DELTA_PROMPT_TEMPLATE", incremental.DELTA_PROMPT_TEMPLATE + "\n")
+
+    assert incremental.analyze_incremental(filing) == first
+    assert len(_prompts(stub_claude_cached)) == calls
+    assert incremental.analyze_incremental(filing, reanalyze_if_stale=True)["mode"] == "incremental"
+    assert len(_prompts(stub_claude_cached)) == calls + 1
@@ -0,0 +1,65 @@
+"""Run journal: per-ticker stages survive an interruption, and --resume only redoes what is unfinished."""
+
+from sec_scanner import cli, history
+from sec_scanner.journal import Journal, latest_run_id
+
+
+def _result(ticker: str, score: int) -> dict:
+    return {"ticker": ticker, "company": ticker, "date": "2025-02-26", "url": f"https://example.test/{ticker}.htm",
+            "score": score, "verdict": "Mixed Signals", "scores": {}, "findings": [], "flags": [],
+            "takeaway": "Earlier run."}
+
+
+def _interrupted_run(path) -> str:
+    journal = Journal.start(["AAA", "BBB", "CCC", "DDD", "EEE"], ["AAA", "BBB", "CCC", "DDD", "EEE"], path)
+    journal.fetched("AAA", _result("AAA", 70))
+    journal.analyzed("AAA", _result("AAA", 70))
+    journal.saved("AAA")
+    journal.analyzed("BBB", _result("BBB", 45))
+    journal.fetched("CCC", {"company": "Ccc Corp", "date": "2025-03-01", "url": "https://example.test/CCC.htm",
+                            "text": "not journaled"})
+    journal.failed("DDD", "fetch", "HTTP 503")
+    journal.finish("interrupted")
+    return journal.run_id
+
+
+def test_resume_returns_each_ticker_where_it_stopped(tmp_path):
+    path = tmp_path / "scan_journal.db"
+    run_id = _interrupted_run(path)
+
+    assert latest_run_id(path) == run_id
+    assert Journal.resume("no-such-run", path) is None
+    journal, jobs = Journal.resume(run_id, path)
+    journal.finish()
+
+    assert [(j["ticker"], j["stage"]) for j in jobs] == [
+        ("AAA", "saved"), ("BBB", "analyzed"), ("CCC", "fetched"), ("DDD", "failed"), ("EEE", "pending")]
+    assert jobs[1]["result"]["score"] == 45
+    assert jobs[2]["filing"] == {"company": "Ccc Corp", "date": "2025-03-01", "url": "https://example.test/CCC.htm"}
+    assert jobs[3]["error"] == "fetch: HTTP 503"
+
+
+def test_resume_skips_completed_stages(stub_claude, stub_cli, tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "DB_PATH", tmp_path / "scan_history.db")
+    monkeypatch.setattr(cli, "log_to_worklog", lambda *args: None)
+    run_id = _interrupted_run(tmp_path / "scan_journal.db")
+    fetched = {}
+
+    def fetch_filing(ticker, latest=None, company=None, **kwargs):
+        fetched[ticker] = latest
+        date = latest[1] if latest else "2025-02-26"
+        return {"ticker": ticker, "company": company or ticker, "date": date,
+                "url": f"https://example.test/{ticker}.htm", "text": "We use artificial intelligence."}
+
+    monkeypatch.setattr(cli, "fetch_filing", fetch_filing)
+    cli.main(["--resume", run_id, "--no-gc", "--claude-cmd", stub_cli[0],
+              "--output", str(tmp_path / "report.html")])
+
+    # Saved and analyzed tickers are not fetched again; a fetched one goes straight to its filing
+    assert fetched == {"CCC": ("https://example.test/CCC.htm", "2025-03-01"), "DDD": None, "EEE": None}
+    assert set(stub_claude) == {("CCC", "2025-03-01"), ("DDD", "2025-02-26"), ("EEE", "2025-02-26")}
+    rows = history.get_connection().execute("SELECT ticker, score FROM scan_history ORDER BY ticker").fetchall()
+    assert [r["ticker"] for r in rows] == ["BBB", "CCC", "DDD", "EEE"]
+    assert rows[0]["score"] == 45
+    _, jobs = Journal.resume(run_id)
+    assert [j["stage"] for j in jobs] == ["saved"] * 5
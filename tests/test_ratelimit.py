@@ -0,0 +1,77 @@
+"""Token bucket shared through its state file, and Retry-After handling on EDGAR pushback."""
+
+import time
+from email.utils import formatdate
+
+import requests
+
+from sec_scanner import fetcher, ratelimit
+from sec_scanner.ratelimit import TokenBucket, retry_after_seconds
+
+
+def test_buckets_sharing_a_state_file_draw_from_one_bucket(tmp_path):
+    state = tmp_path / "ratelimit.state"
+    first = TokenBucket(rate=20, burst=2, state_path=state)
+    second = TokenBucket(rate=20, burst=2, state_path=state)
+
+    assert first._try_take() == 0
+    assert first._try_take() == 0
+    assert second._try_take() > 0  # the burst is spent for every sharer
+
+    time.sleep(0.06)  # one token refills at 20/s
+    assert second._try_take() == 0
+    assert first._try_take() > 0
+
+
+def test_refill_is_capped_at_the_burst(tmp_path):
+    bucket = TokenBucket(rate=1000, burst=2, state_path=tmp_path / "ratelimit.state")
+    time.sleep(0.05)  # long enough for 50 tokens without the cap
+    assert [bucket._try_take() == 0 for _ in range(3)] == [True, True, False]
+
+
+def test_penalize_blocks_every_sharer(tmp_path):
+    state = tmp_path / "ratelimit.state"
+    first = TokenBucket(rate=1000, burst=5, state_path=state)
+    second = TokenBucket(rate=1000, burst=5, state_path=state)
+
+    first.penalize(5)
+    assert 4 < second._try_take() <= 5
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds("3") == 3
+    assert retry_after_seconds("-1") == 0
+    assert retry_after_seconds(None) is None
+    assert retry_after_seconds("soon") is None
+    assert 55 < retry_after_seconds(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert retry_after_seconds(formatdate(time.time() - 60, usegmt=True)) == 0
+
+
+def _response(status: int, headers: dict | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp._content = b"{}"
+    return resp
+
+
+class _FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def get(self, url, **kwargs):
+        return self.responses.pop(0)
+
+
+def test_get_waits_out_retry_after_then_retries(monkeypatch):
+    limiter = TokenBucket(rate=1000, burst=5, state_path=None)
+    penalties = []
+    monkeypatch.setattr(limiter, "penalize", penalties.append)
+    monkeypatch.setattr(fetcher, "_limiter", limiter)
+    monkeypatch.setattr(ratelimit.random, "uniform", lambda a, b: 1.0)
+    fake = _FakeSession([_response(429, {"Retry-After": "7"}), _response(503), _response(200)])
+    monkeypatch.setattr(fetcher.session, "get_session", lambda: fake)
+
+    assert fetcher._get("https://www.sec.gov/x").status_code == 200
+    # Retry-After plus a little jitter, then plain exponential backoff for the bare 503
+    assert penalties == [7 + 1.0, 2.0]
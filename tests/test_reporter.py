@@ -0,0 +1,122 @@
+"""HTML report: template slots filled in one pass, data inline or in a JSON sidecar, and
+reports from history redone only when their inputs change."""
+
+import json
+import os
+import re
+
+from sec_scanner import reporter
+
+
+def _result(ticker: str, score: int, takeaway: str = "Plain takeaway.") -> dict:
+    return {"ticker": ticker, "company": f"{ticker} Inc", "score": score, "verdict": "Mixed Signals",
+            "date": "2025-02-26", "scores": {"SPECIFICITY": 5}, "findings": ["A finding"], "flags": [],
+            "takeaway": takeaway, "disclosure_style": "standard"}
+
+
+RESULTS = [_result("LOW", 30, "Mostly buzzwords."), _result("TOP", 80, "Ships </script> in production."),
+           _result("MID", 50)]
+
+
+def _stat(html: str, label: str) -> str:
+    return re.search(rf'<span class="stat-label">{label}</span>\s*<span class="stat-value \w+">(\d+)</span>',
+                     html)[1]
+
+
+def test_compile_template_finds_every_slot_once(tmp_path):
+    template = tmp_path / "template.html"
+    template.write_text(open(reporter.find_template()).read())
+
+    parts = reporter.compile_template(str(template))
+
+    assert sorted(p[0] for p in parts if isinstance(p, tuple)) == sorted(reporter.SLOTS)
+    assert "".join(p if isinstance(p, str) else p[1] for p in parts) == template.read_text()
+    assert reporter.compile_template(str(template)) is parts
+    # An edited template is compiled again
+    template.write_text(template.read_text().replace("Companies Scanned", "Companies Seen"))
+    os.utime(template, ns=(0, 0))
+    assert reporter.compile_template(str(template)) is not parts
+
+
+def test_report_fills_the_slots_and_inlines_the_data(tmp_path):
+    output = tmp_path / "report.html"
+
+    reporter.generate_report(RESULTS, str(output))
+
+    html = output.read_text()
+    assert (_stat(html, "Companies Scanned"), _stat(html, "Genuine Adopters"), _stat(html, "AI Washing Caught"),
+            _stat(html, "Top Score")) == ("3", "1", "1", "80")
+    assert "// 10-K Filing Analysis — 3 Companies —" in html
+    assert "<strong>TOP — Top Scorer (80/100).</strong>" in html
+    assert "const dataUrl = null;" in html
+    inline = html.split("const data = ", 1)[1].split(";\nconst dataUrl", 1)[0]
+    assert "</script>" not in inline
+    assert [e["ticker"] for e in json.loads(inline.replace("<\\/", "</"))] == ["TOP", "MID", "LOW"]
+
+
+def test_data_json_sidecar_replaces_the_inline_data(tmp_path):
+    output = tmp_path / "report.html"
+    data = tmp_path / "data" / "report.json"
+    data.parent.mkdir()
+
+    reporter.generate_report(RESULTS, str(output), data_path=str(data))
+
+    html = output.read_text()
+    assert 'const data = null;\nconst dataUrl = "data/report.json";' in html
+    assert "Mostly buzzwords." not in html.split("const data = ", 1)[1]
+    entries = json.loads(data.read_text().replace("<\\/", "</"))
+    assert [e["ticker"] for e in entries] == ["TOP", "MID", "LOW"]
+    assert entries[0] == {k: RESULTS[1][k] for k in reporter.FIELDS} | {"disclosure_style": "standard"}
+    assert not list(tmp_path.glob("**/*.tmp"))
+
+
+# ── Reports from stored history ───────────────────────────────────────────────
+
+def _rendered(output) -> bool:
+    """Whether the report was rewritten since it was last marked."""
+    rewritten = output.stat().st_mtime_ns != 0
+    os.utime(output, ns=(0, 0))
+    return rewritten
+
+
+def test_report_from_history_skips_when_its_inputs_are_unchanged(tmp_path, monkeypatch):
+    from sec_scanner import cache, history
+    from sec_scanner.cache_sqlite import SQLiteCache
+
+    monkeypatch.setattr(history, "DB_PATH", tmp_path / "scan_history.db")
+    monkeypatch.setattr(cache, "_backend", SQLiteCache(tmp_path / "cache.db"))
+    history.save_results([_result("TOP", 80), _result("LOW", 30)])
+    cache.save_analysis("TOP", "2025-02-26", "https://example.test/TOP.htm", {"findings": ["Cached finding"]})
+    template = tmp_path / "template.html"
+    template.write_text(open(reporter.find_template()).read())
+    output = tmp_path / "report.html"
+
+    def render(**kwargs):
+        return reporter.report_from_history(str(output), template_path=str(template), **kwargs)
+
+    assert render() == 2
+    assert "Cached finding" in output.read_text()
+    assert (tmp_path / "report.html.inputs").exists()
+    _rendered(output)
+
+    assert render() is None
+    assert not _rendered(output)
+
+    history.save_result(_result("MID", 50))
+    assert render() == 3 and _rendered(output)
+    cache.save_analysis("MID", "2025-02-26", "https://example.test/MID.htm", {"findings": []})
+    assert render() == 3 and _rendered(output)
+    os.utime(template, ns=(1, 1))
+    assert render() == 3 and _rendered(output)
+    assert render(min_score=40) == 2 and _rendered(output)
+    assert render(min_score=40) is None
+    assert render(min_score=40, force=True) == 2 and _rendered(output)
+    output.unlink()
+    assert render(min_score=40) == 2
+    _rendered(output)
+
+    # A report with a sidecar is redone if the sidecar goes missing
+    data = tmp_path / "report.json"
+    assert render(data_path=str(data)) == 3 and _rendered(output)
+    data.unlink()
+    assert render(data_path=str(data)) == 3 and data.exists()
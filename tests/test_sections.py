@@ -0,0 +1,28 @@
+"""Item splitting and prompt-text selection."""
+
+from sec_scanner.sections import extract_relevant, split_items
+
+
+def _filing() -> str:
+    toc = "Item 1. Business\nItem 1A. Risk Factors\nItem 7. Management's Discussion"
+    business = "\n".join(f"Overview paragraph {n} about our stores." for n in range(40))
+    risks = "\n".join(f"Risk paragraph {n}: competition is intense." for n in range(200))
+    mdna = "\n".join(f"MD&A paragraph {n}: revenue grew." for n in range(200))
+    return (f"Cover page\n{toc}\nItem 1. Business\n{business}\nItem 1A. Risk Factors\n{risks}\n"
+            f"Item 7. Management's Discussion\n{mdna}")
+
+
+def test_split_items_keeps_filing_order():
+    assert list(split_items(_filing())) == ["cover", "1", "1A", "7"]
+
+
+def test_items_are_emitted_in_filing_order():
+    out = extract_relevant(_filing(), char_budget=4000, items=("7", "1"))
+    assert out.index("=== Item 1. Business ===") < out.index("=== Item 7.")
+    assert "Risk paragraph" not in out
+
+
+def test_business_overview_leads_whatever_the_items_order():
+    out = extract_relevant(_filing(), char_budget=4000, items=("7", "1"))
+    assert "Overview paragraph 0 " in out
+    assert "Overview paragraph 20 " in out
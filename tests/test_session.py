@@ -0,0 +1,38 @@
+"""Conditional requests: validators are stored with the body and a 304 serves it back."""
+
+import requests
+
+from sec_scanner import session
+
+URL = "https://data.sec.gov/submissions/CIK0001045810.json"
+
+
+def _response(status: int, body: str = "", headers: dict | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp._content = body.encode()
+    resp.encoding = "utf-8"
+    return resp
+
+
+def test_not_modified_returns_the_stored_body(tmp_path, monkeypatch):
+    monkeypatch.setattr(session, "VALIDATOR_DIR", tmp_path / "http")
+    assert session.conditional_headers(URL) == {}
+
+    body = session.resolve_conditional(URL, _response(200, '{"cik": 1}', {"ETag": '"v1"'}))
+    assert body == '{"cik": 1}'
+    assert session.conditional_headers(URL) == {"If-None-Match": '"v1"'}
+
+    assert session.resolve_conditional(URL, _response(304)) == '{"cik": 1}'
+
+
+def test_not_modified_without_a_stored_copy_returns_none(tmp_path, monkeypatch):
+    monkeypatch.setattr(session, "VALIDATOR_DIR", tmp_path / "http")
+    assert session.resolve_conditional(URL, _response(304)) is None
+
+
+def test_response_without_validators_is_not_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(session, "VALIDATOR_DIR", tmp_path / "http")
+    assert session.resolve_conditional(URL, _response(200, "{}")) == "{}"
+    assert session.conditional_headers(URL) == {}
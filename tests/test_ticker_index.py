@@ -0,0 +1,57 @@
+"""Ticker index: served from disk while fresh, refreshed from EDGAR once TICKER_INDEX_TTL passes."""
+
+import json
+import time
+
+import pytest
+
+from sec_scanner import fetcher
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetcher, "TICKER_INDEX_PATH", tmp_path / "ticker_index.json")
+    monkeypatch.setattr(fetcher, "_ticker_index", None)
+    monkeypatch.setattr(fetcher, "_ticker_index_loaded_at", 0.0)
+    calls = []
+
+    def get_json(url):
+        calls.append(url)
+        return {"0": {"cik_str": 1045810, "ticker": "NVDA", "title": "NVIDIA CORP"},
+                "1": {"cik_str": 1067983, "ticker": "BRK-B", "title": "BERKSHIRE HATHAWAY INC"}}
+
+    monkeypatch.setattr(fetcher, "_get_json", get_json)
+    return calls
+
+
+def _store(path, fetched_at):
+    path.write_text(json.dumps({"fetched_at": fetched_at, "tickers": {"MSFT": ["789019", "MICROSOFT CORP"]}}))
+
+
+def test_fresh_index_file_is_used_without_a_download(downloads):
+    _store(fetcher.TICKER_INDEX_PATH, time.time() - 60)
+    assert fetcher.get_cik("MSFT") == "789019"
+    assert downloads == []
+
+
+def test_stale_index_file_is_refreshed(downloads):
+    _store(fetcher.TICKER_INDEX_PATH, time.time() - fetcher.TICKER_INDEX_TTL - 1)
+    assert fetcher.get_ticker_index()["NVDA"] == ("1045810", "NVIDIA CORP")
+    assert downloads == [fetcher.COMPANY_TICKERS_URL]
+    stored = json.loads(fetcher.TICKER_INDEX_PATH.read_text())
+    assert stored["tickers"]["BRK-B"] == ["1067983", "BERKSHIRE HATHAWAY INC"]
+
+
+def test_in_memory_index_expires_after_the_ttl(downloads):
+    fetcher.get_ticker_index()
+    fetcher.get_ticker_index()
+    assert len(downloads) == 1
+
+    fetcher._ticker_index_loaded_at -= fetcher.TICKER_INDEX_TTL
+    fetcher.TICKER_INDEX_PATH.unlink()
+    fetcher.get_ticker_index()
+    assert len(downloads) == 2
+
+
+def test_dotted_share_class_matches_the_dashed_listing(downloads):
+    assert fetcher.get_cik("brk.b") == "1067983"
@@ -0,0 +1,127 @@
+"""Watch mode against the fake EDGAR: polling, retries and the status server."""
+
+import json
+import urllib.error
+import urllib.request
+
+from sec_scanner import analyzer, fetcher, history
+from sec_scanner.watch import Watcher, serve_status
+
+
+def _watcher(edgar, tmp_path, monkeypatch, analyze=analyzer.analyze_filing, tickers=None, **kwargs) -> Watcher:
+    monkeypatch.setattr(history, "DB_PATH", tmp_path / "scan_history.db")
+    return Watcher(tickers or edgar.tickers, fetcher.fetch_filing, analyze, str(tmp_path / "report.html"),
+                   fetch_workers=1, analyze_workers=1, **kwargs)
+
+
+def test_poll_analyzes_each_new_10k_once(stub_claude, edgar, tmp_path, monkeypatch):
+    watcher = _watcher(edgar, tmp_path, monkeypatch)
+
+    watcher.run(once=True)  # nothing in history yet, so every latest 10-K is new
+
+    status = watcher.status()
+    assert (status["state"], status["polls"], status["analyzed"]) == ("stopped", 1, 3)
+    assert status["last_new"] == edgar.tickers
+    assert status["report_refreshed_at"] is not None
+    assert {r["ticker"] for r in history.latest_results()} == set(edgar.tickers)
+
+    # Unchanged submissions are answered 304; a new 10-Q changes them but is not a 10-K
+    assert watcher.poll() == {}
+    assert watcher.status()["not_modified"] == 3
+    edgar.publish("BENCH0001", form="10-Q")
+    assert watcher.poll() == {}
+    assert watcher.status()["not_modified"] == 5
+
+    filing = edgar.publish("BENCH0002")
+    new = watcher.poll()
+    assert list(new) == ["BENCH0002"]
+    assert new["BENCH0002"][1] == filing["date"]
+    assert new["BENCH0002"][0].endswith(f"/{filing['accession'].replace('-', '')}/{filing['doc']}")
+    watcher.process(new)
+    assert watcher.status()["analyzed"] == 4
+    assert ("BENCH0002", filing["date"]) in stub_claude
+
+
+def test_history_and_baseline_count_as_already_analyzed(stub_claude, edgar, tmp_path, monkeypatch):
+    _watcher(edgar, tmp_path, monkeypatch).run(once=True)
+    assert _watcher(edgar, tmp_path, monkeypatch).poll() == {}
+
+    tmp_path = tmp_path / "fresh"
+    tmp_path.mkdir()
+    assert _watcher(edgar, tmp_path, monkeypatch, baseline=True).poll() == {}
+
+
+def test_failed_analysis_is_retried_next_poll(stub_claude, edgar, tmp_path, monkeypatch):
+    attempts = []
+
+    def analyze(filing):
+        attempts.append(filing["ticker"])
+        return analyzer.analyze_filing(filing) if len(attempts) > 1 else None
+
+    watcher = _watcher(edgar, tmp_path, monkeypatch, analyze=analyze, tickers=["BENCH0001"])
+    watcher.process(watcher.poll())
+
+    assert watcher.status()["failed"] == 1
+    assert watcher._state["BENCH0001"]["accession"] == "" and watcher._state["BENCH0001"]["etag"] is None
+    new = watcher.poll()  # a full request, not a 304 that would hide the filing
+    assert list(new) == ["BENCH0001"]
+    assert watcher.status()["not_modified"] == 0
+    watcher.process(new)
+    assert attempts == ["BENCH0001", "BENCH0001"]
+    assert watcher.status()["analyzed"] == 1
+    assert watcher.poll() == {}
+
+
+def test_unresolved_tickers_are_retried_each_poll(stub_claude, edgar, tmp_path, monkeypatch):
+    get_cik = fetcher.get_cik
+    down = {"BENCH0002"}
+
+    def flaky_get_cik(ticker):
+        if ticker in down:
+            raise ConnectionError("EDGAR unreachable")
+        return get_cik(ticker)
+
+    monkeypatch.setattr(fetcher, "get_cik", flaky_get_cik)
+    watcher = _watcher(edgar, tmp_path, monkeypatch, tickers=["BENCH0001", "BENCH0002", "NOPE"], baseline=True)
+
+    assert watcher.poll() == {}
+    status = watcher.status()
+    assert (status["watching"], status["errors"], status["last_error"]) == (1, 1, "BENCH0002: EDGAR unreachable")
+
+    down.clear()
+    filing = edgar.publish("BENCH0002")
+    assert watcher.poll() == {}  # first look at BENCH0002; the baseline covers what is there
+    assert (watcher.status()["watching"], watcher.status()["errors"]) == (2, 1)
+    assert sorted(watcher._state) == ["BENCH0001", "BENCH0002"]
+    assert watcher._state["BENCH0002"]["accession"] == filing["accession"]
+
+
+def _get(url: str) -> tuple[int, dict]:
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_status_server_and_stop(stub_claude, edgar, tmp_path, monkeypatch):
+    watcher = _watcher(edgar, tmp_path, monkeypatch)
+    server = serve_status(watcher, 0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        assert _get(f"{base}/health") == (200, {"status": "ok", "state": "starting"})
+        watcher.poll()
+        code, status = _get(f"{base}/status")
+        assert code == 200
+        assert (status["tickers"], status["watching"], status["interval"]) == (3, 3, watcher.interval)
+
+        watcher.stop()
+        watcher._set_state("idle")  # the loop catching up must not hide the stop
+        assert _get(f"{base}/health") == (503, {"status": "unhealthy", "state": "stopping"})
+        assert watcher.poll() == {}  # no new requests once stopping
+        watcher.run()
+        assert watcher.status()["state"] == "stopped"
+        assert _get(f"{base}/nope")[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()